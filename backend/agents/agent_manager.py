@@ -24,19 +24,36 @@ from config import config
 from utils.conversation_memory import conversation_memory
 from utils.conversational_tts import conversational_tts
 from utils.feature_request_logger import feature_logger
+from utils.frecency_store import frecency_store
 from agents.multi_task_orchestrator import MultiTaskOrchestrator
+from agents.command_planner import CommandPlanner
+from utils.pre_router import AGENT_LABELS, PreRouter
+from utils.intent_matcher import IntentMatches, build_routing_matcher
+from utils.llm_cache import llm_cache
+from utils.semantic_cache import semantic_cache
 
 class AgentManagerState(TypedDict):
     """State for the agent manager workflow"""
     user_input: str
     original_input: str  # Store original before enhancement
     enhanced_input: str  # AI-enhanced version
+    route_confidence: float  # Pre-router confidence that no enhancement is needed
+    needs_enhancement: bool
+    cached_route: bool  # resolved from the semantic command cache
     detected_intent: str
     agent_name: str
+    slots: Dict[str, Any]  # agent parameters pre-parsed by the planner
     agent_response: Dict[str, Any]
     final_response: str
     error: Optional[str]
 
+class MultiAgentRequest(BaseModel):
+    """File + WhatsApp workflow parameters"""
+    workflow_type: str  # file_to_whatsapp, search_and_share, open_and_inform, whatsapp_only
+    file_query: str = ""
+    recipient: str = ""
+    message: str = ""
+
 class AgentManager:
     """
     Multi-Agent Coordinator (MCP) that routes commands to appropriate agents
@@ -49,7 +66,8 @@ class AgentManager:
             groq_api_key=config.GROQ_API_KEY,
             model_name=config.GROQ_MODEL,
             temperature=config.AGENT_TEMPERATURE,
-            max_tokens=config.MAX_RESPONSE_TOKENS
+            max_tokens=config.MAX_RESPONSE_TOKENS,
+            cache=llm_cache
         )
         
         # Register available agents
@@ -68,15 +86,97 @@ class AgentManager:
             "system_control": system_control_agent
         }
         
+        # Routing keyword lists and rules, compiled once
+        self.intent_matcher = build_routing_matcher()
+        
         # Initialize multi-task orchestrator
         self.orchestrator = MultiTaskOrchestrator(self)
         
+        # Decides which commands need the AI enhancement pass
+        self.pre_router = PreRouter(self.intent_matcher)
+        
+        # Optional single-call planner: cleaned command, agent and slots at once
+        slot_models = {name: agent.slot_model for name, agent in self.agents.items()
+                       if getattr(agent, "slot_model", None)}
+        slot_models["multi_agent"] = MultiAgentRequest
+        self.planner = CommandPlanner(self.llm, slot_models) if config.PLANNER_ENABLED else None
+        
         # Build MCP workflow
         self.workflow = self._build_workflow()
     
     def _build_workflow(self) -> StateGraph:
         """Build the MCP workflow for agent coordination"""
         
+        def pre_route_node(state: AgentManagerState) -> AgentManagerState:
+            """
+            Deterministic pre-routing: clear commands skip the AI enhancement
+            LLM call and go straight to intent detection, and commands seen
+            before (or rephrasings of them) go straight to their agent
+            """
+            user_input = state['user_input']
+            state['original_input'] = user_input
+            state['enhanced_input'] = user_input
+            
+            matches = self.intent_matcher.match(user_input)
+            
+            # A rephrasing of a command resolved before reuses that resolution,
+            # unless the command names another agent ("email" where the cached
+            # one said "whatsapp"); only an identical command reuses the stored
+            # wording, as dropped filler words and names may differ
+            if config.SEMANTIC_CACHE_ENABLED:
+                cached = semantic_cache.lookup(user_input)
+                if cached and not self._cache_agrees(cached.agent_name, matches):
+                    print(f"\n[DEBUG] Semantic cache: ignoring {cached.agent_name} for '{user_input}' (other intent words)")
+                    cached = None
+                if cached:
+                    if cached.identical:
+                        state['user_input'] = cached.command
+                        state['enhanced_input'] = cached.command
+                    state['detected_intent'] = cached.agent_name
+                    state['agent_name'] = cached.agent_name
+                    state['slots'] = cached.slots
+                    state['route_confidence'] = cached.similarity
+                    state['needs_enhancement'] = False
+                    state['cached_route'] = True
+                    print(f"\n[DEBUG] Semantic cache: '{user_input}' -> {cached.agent_name} "
+                          f"({'exact' if cached.exact else f'similar, {cached.similarity:.2f}'}, "
+                          f"{'with' if cached.slots else 'no'} slots)")
+                    return state
+            
+            if not config.PRE_ROUTER_ENABLED:
+                state['route_confidence'] = 0.0
+                state['needs_enhancement'] = True
+                return state
+            
+            decision = self.pre_router.route(user_input, matches)
+            state['route_confidence'] = decision.confidence
+            state['needs_enhancement'] = decision.needs_enhancement
+            
+            print(f"\n[DEBUG] Pre-router: confidence {decision.confidence:.2f}, intents {decision.intents}")
+            if decision.needs_enhancement:
+                print(f"[DEBUG] Pre-router: needs AI enhancement ({', '.join(decision.reasons) or 'low confidence'})")
+            else:
+                print(f"[DEBUG] Pre-router: skipping AI enhancement")
+            return state
+        
+        def plan_node(state: AgentManagerState) -> AgentManagerState:
+            """
+            Planner mode: one structured LLM call returns the cleaned command,
+            the agent and its slots, replacing AI enhancement, intent detection
+            and the agent's own parse. Falls back to enhancement if it fails.
+            """
+            plan = self.planner.plan(state['user_input'])
+            if plan is None or not (plan.agent_name in self.agents or plan.agent_name in ("multi_task", "multi_agent")):
+                return state
+            
+            state['user_input'] = plan.command
+            state['enhanced_input'] = plan.command
+            state['detected_intent'] = plan.agent_name
+            state['agent_name'] = plan.agent_name
+            state['slots'] = plan.slots
+            print(f"\n[DEBUG] Planner: '{plan.command}' -> {plan.agent_name} {plan.slots}")
+            return state
+        
         def ai_enhancement_node(state: AgentManagerState) -> AgentManagerState:
             """
             UNIVERSAL AI ENHANCEMENT LAYER
@@ -179,72 +279,57 @@ IMPORTANT:
                 
                 user_input = state['user_input']
                 
+                # Every routing keyword and rule, found in one pass
+                matches = self.intent_matcher.match(user_input)
+                
                 # Check for multi-task workflows FIRST (highest priority)
-                if self.orchestrator.detect_multi_task(user_input):
+                if self.orchestrator.detect_multi_task(user_input, matches):
                     state['detected_intent'] = "multi_task"
                     state['agent_name'] = "multi_task"
                     print(f"[DEBUG] Multi-task workflow detected")
                     return state
-                user_input_lower = user_input.lower()
                 
                 print(f"\n[DEBUG] Intent Detection:")
                 print(f"[DEBUG] User input: '{user_input}'")
                 
                 # Check conversational input first
-                is_conversational = conversation_agent.is_conversational_input(user_input)
+                is_conversational = conversation_agent.is_conversational_input(user_input, matches)
                 print(f"[DEBUG] Is conversational: {is_conversational}")
                 
-                # Enhanced keyword detection with NLP patterns
-                file_keywords = ["find", "search", "open", "file", "document", "folder", "pdf", "doc", "excel", "photo", "video", "music", "ownership", "report", "presentation"]
-                whatsapp_keywords = ["whatsapp", "message", "send to", "text", "tell", "let know", "inform", "send whatsapp", "whatsapp to", "message to", "share"]
-                email_keywords = ["email", "send email", "compose email", "draft email", "mail to"]
-                calendar_keywords = ["calendar", "schedule", "meeting", "appointment", "event", "remind me at"]
-                phone_keywords = ["call", "phone", "dial", "ring", "make a call"]
-                payment_keywords = ["pay", "payment", "send money", "transfer", "paypal", "googlepay", "paytm", "phonepe"]
-                app_keywords = ["open", "launch", "start", "run", "chrome", "browser", "notepad", "calculator"]
-                search_keywords = ["google", "search for", "look up", "find on google", "youtube", "browse"]
-                task_keywords = ["task", "todo", "remind me", "reminder", "add task", "create task", "list tasks"]
-                screenshot_keywords = ["screenshot", "capture screen", "screen capture", "take screenshot", "capture", "take a screenshot"]
-                system_control_keywords = ["volume", "mute", "unmute", "lock", "shutdown", "restart", "reboot", "sleep", "hibernate", "louder", "quieter", "volume up", "volume down", "increase volume", "decrease volume", "lock screen", "shut down", "turn off", "brightness", "brightness up", "brightness down", "brighter", "dimmer", "battery", "battery status", "battery level", "time", "what time", "current time", "what's the time"]
-                
-                # Detect file intent with better distinction
-                file_keywords = ["find", "search", "open", "ownership", "folder", "photo", "video", "pdf", "doc", "docx", "excel", "presentation", "report"]
-                
                 # Questions about capabilities (should go to conversation)
-                capability_questions = ["can you", "are you able", "do you", "what can", "how do", "tell me about", "what is", "explain", "why", "how"]
-                general_questions = ["what", "how", "why", "when", "where", "who", "?"]
-                is_capability_question = any(phrase in user_input_lower for phrase in capability_questions)
-                is_general_question = any(word in user_input_lower for word in general_questions) and not any(op_word in user_input_lower for op_word in ["find", "search", "open", "send"])
+                is_capability_question = matches.has("capability_question")
+                is_general_question = matches.has("general_question") and not matches.has("operation_word")
                 
                 # Actual file operations (should go to filesearch)
-                file_operation_keywords = ["find", "search", "open", "locate", "show me"]
-                has_file_operation = any(keyword in user_input_lower for keyword in file_operation_keywords) and not is_capability_question
+                has_file_operation = matches.has("file_operation") and not is_capability_question
                 
                 # Multi-agent detection (file + communication)
-                has_whatsapp_intent = any(keyword in user_input_lower for keyword in whatsapp_keywords)
-                has_email_intent = any(keyword in user_input_lower for keyword in email_keywords)
-                has_calendar_intent = any(keyword in user_input_lower for keyword in calendar_keywords)
-                has_phone_intent = any(keyword in user_input_lower for keyword in phone_keywords)
-                has_payment_intent = any(keyword in user_input_lower for keyword in payment_keywords)
-                has_app_intent = any(keyword in user_input_lower for keyword in app_keywords)
-                has_search_intent = any(keyword in user_input_lower for keyword in search_keywords)
-                has_task_intent = any(keyword in user_input_lower for keyword in task_keywords)
-                has_screenshot_intent = any(keyword in user_input_lower for keyword in screenshot_keywords)
-                has_system_control_intent = any(keyword in user_input_lower for keyword in system_control_keywords)
-                
-                # Special handling for multi-agent patterns
-                multi_agent_patterns = ["send * to", "share * with", "find * and send", "send the * file"]
-                is_multi_agent_command = any("send" in user_input_lower and keyword in user_input_lower for keyword in file_keywords)
+                has_whatsapp_intent = matches.has("whatsapp")
+                has_email_intent = matches.has("email")
+                has_calendar_intent = matches.has("calendar")
+                has_phone_intent = matches.has("phone")
+                has_payment_intent = matches.has("payment")
+                has_app_intent = matches.has("app")
+                has_search_intent = matches.has("websearch")
+                has_task_intent = matches.has("task")
+                has_screenshot_intent = matches.has("screenshot")
+                has_system_control_intent = matches.has("system_control")
+                
+                # Email wins over WhatsApp when it has the stronger keywords
+                # ("send email to jay telling him..." also hits "tell")
+                prefers_email = has_email_intent and matches.score("email") > matches.score("whatsapp")
+                
+                # Special handling for multi-agent patterns ("send the * file")
+                is_multi_agent_command = matches.has("send") and matches.has("file")
                 
                 # Special handling for WhatsApp patterns
-                whatsapp_patterns = ["send whatsapp", "whatsapp to", "message to", "text to"]
-                is_whatsapp_command = any(pattern in user_input_lower for pattern in whatsapp_patterns)
+                is_whatsapp_command = matches.has("whatsapp_command")
                 
                 print(f"[DEBUG] Is capability question: {is_capability_question}")
                 print(f"[DEBUG] Is general question: {is_general_question}")
                 print(f"[DEBUG] Has file operation: {has_file_operation}")
                 print(f"[DEBUG] Has WhatsApp intent: {has_whatsapp_intent}")
-                print(f"[DEBUG] Has Email intent: {has_email_intent}")
+                print(f"[DEBUG] Has Email intent: {has_email_intent} (score {matches.score('email')} vs WhatsApp {matches.score('whatsapp')})")
                 print(f"[DEBUG] Has Calendar intent: {has_calendar_intent}")
                 print(f"[DEBUG] Has Phone intent: {has_phone_intent}")
                 print(f"[DEBUG] Has Payment intent: {has_payment_intent}")
@@ -293,7 +378,7 @@ IMPORTANT:
                     return state
                 
                 # Email commands
-                elif has_email_intent and not has_whatsapp_intent:
+                elif prefers_email:
                     state['detected_intent'] = "email"
                     state['agent_name'] = "email"
                     print(f"[DEBUG] Routed to: email")
@@ -465,6 +550,7 @@ IMPORTANT:
             try:
                 agent_name = state.get('agent_name')
                 user_input = state['user_input']
+                slots = state.get('slots') or None
                 
                 # Handle multi-task workflows
                 if agent_name == "multi_task":
@@ -473,24 +559,24 @@ IMPORTANT:
                 
                 # Handle old multi-agent workflows (deprecated, use multi_task instead)
                 elif agent_name == "multi_agent":
-                    state['agent_response'] = self._handle_multi_agent_workflow(user_input)
+                    state['agent_response'] = self._handle_multi_agent_workflow(user_input, slots)
                     return state
                 
                 # Route to specific agents
                 if agent_name == "conversation":
                     state['agent_response'] = self.agents["conversation"].process_conversation(user_input)
                 elif agent_name == "whatsapp":
-                    state['agent_response'] = self.agents["whatsapp"].process_command(user_input)
+                    state['agent_response'] = self.agents["whatsapp"].process_command(user_input, slots)
                 elif agent_name == "filesearch":
-                    state['agent_response'] = self.agents["filesearch"].process_command(user_input)
+                    state['agent_response'] = self.agents["filesearch"].process_command(user_input, slots)
                 elif agent_name == "email":
-                    state['agent_response'] = self.agents["email"].process_command(user_input)
+                    state['agent_response'] = self.agents["email"].process_command(user_input, slots)
                 elif agent_name == "calendar":
-                    state['agent_response'] = self.agents["calendar"].process_command(user_input)
+                    state['agent_response'] = self.agents["calendar"].process_command(user_input, slots)
                 elif agent_name == "phone":
-                    state['agent_response'] = self.agents["phone"].process_command(user_input)
+                    state['agent_response'] = self.agents["phone"].process_command(user_input, slots)
                 elif agent_name == "payment":
-                    state['agent_response'] = self.agents["payment"].process_command(user_input)
+                    state['agent_response'] = self.agents["payment"].process_command(user_input, slots)
                 elif agent_name == "app_launcher":
                     state['agent_response'] = self.agents["app_launcher"].process_command(user_input)
                 elif agent_name == "websearch":
@@ -556,14 +642,29 @@ IMPORTANT:
         # Build the workflow graph
         workflow = StateGraph(AgentManagerState)
         
-        # Add nodes (AI Enhancement is now the FIRST step)
+        # Add nodes (pre-routing decides whether AI enhancement runs)
+        workflow.add_node("pre_route", pre_route_node)
+        workflow.add_node("plan", plan_node)
         workflow.add_node("ai_enhance", ai_enhancement_node)  # NEW: Universal AI enhancement
         workflow.add_node("detect_intent", intent_detection_node)
         workflow.add_node("route_to_agent", route_to_agent_node)
         workflow.add_node("generate_response", generate_response_node)
         
-        # Add edges (AI Enhancement → Intent Detection → Route → Response)
-        workflow.set_entry_point("ai_enhance")  # Start with AI enhancement
+        # Add edges (Pre-route → [Plan | AI Enhancement → Intent Detection] → Route → Response)
+        workflow.set_entry_point("pre_route")
+        
+        def should_enhance(state: AgentManagerState) -> str:
+            if state.get('cached_route'):
+                return "route_to_agent"
+            if not state.get('needs_enhancement', True):
+                return "detect_intent"
+            return "plan" if self.planner else "ai_enhance"
+        
+        def after_plan(state: AgentManagerState) -> str:
+            return "route_to_agent" if state.get('agent_name') else "ai_enhance"
+        
+        workflow.add_conditional_edges("pre_route", should_enhance)
+        workflow.add_conditional_edges("plan", after_plan)
         workflow.add_edge("ai_enhance", "detect_intent")  # Then detect intent
         workflow.add_edge("detect_intent", "route_to_agent")
         workflow.add_edge("route_to_agent", "generate_response")
@@ -571,7 +672,18 @@ IMPORTANT:
         
         return workflow.compile()
     
-    def _handle_multi_agent_workflow(self, user_input: str) -> Dict[str, Any]:
+    def _cache_agrees(self, agent_name: str, matches: IntentMatches) -> bool:
+        """True if a cached agent fits the agents whose trigger words the command contains"""
+        if agent_name not in self.agents and agent_name != "multi_agent":
+            return False
+        intents = {AGENT_LABELS[label] for label in matches.labels() if label in AGENT_LABELS}
+        if not intents:
+            return True
+        if agent_name == "multi_agent":
+            return {"filesearch", "whatsapp"} <= intents
+        return agent_name in intents
+    
+    def _handle_multi_agent_workflow(self, user_input: str, slots: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Handle complex workflows requiring multiple agents"""
         try:
             # For simple WhatsApp messages without file operations, route directly to WhatsApp agent
@@ -588,69 +700,12 @@ IMPORTANT:
                 whatsapp_result = self.agents["whatsapp"].process_command(user_input)
                 return whatsapp_result
             
-            # First, try to parse the multi-agent intent
-            system_prompt = """Analyze this command to determine the multi-agent workflow needed:
-            
-            WORKFLOW TYPES:
-            1. file_to_whatsapp: Find/prepare file and send via WhatsApp
-            2. search_and_share: Search for files and prepare for sharing
-            3. open_and_inform: Open file and notify someone
-            4. whatsapp_only: Simple WhatsApp message without files
-            
-            Extract:
-            - workflow_type: [file_to_whatsapp/search_and_share/open_and_inform/whatsapp_only]
-            - file_query: [file name/pattern to find] (empty if no file)
-            - recipient: [person to send to] (NEVER extract 'to', 'for', or prepositions)
-            - message: [optional message content]
-            
-            IMPORTANT: For recipient extraction, identify the actual person's name:
-            - "send WhatsApp message to Jay lion is coming" -> recipient: "Jay", message: "lion is coming"
-            - "send report.pdf to boss" -> recipient: "boss", file: "report.pdf"
-            - "message mom about dinner" -> recipient: "mom", message: "about dinner"
-            
-            NEVER extract prepositions (to, for, with, about) as recipient names.
-            
-            Examples:
-            - "Send report.pdf to boss on WhatsApp" -> file_to_whatsapp, report.pdf, boss
-            - "Find my photos and share with mom" -> search_and_share, photos, mom
-            - "Send WhatsApp message to Jay lion is coming" -> whatsapp_only, (empty), Jay, lion is coming
-            
-            Return format:
-            WORKFLOW: [type]
-            FILE: [query]
-            RECIPIENT: [name]
-            MESSAGE: [content or empty]
-            """
-            
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=user_input)
-            ]
-            
-            response = self.llm.invoke(messages)
-            response_text = response.content.strip()
-            
-            print(f"[DEBUG] LLM parsing response: {response_text}")
-            
-            # Parse workflow parameters
-            workflow_type = ""
-            file_query = ""
-            recipient = ""
-            message = ""
-            
-            for line in response_text.split('\n'):
-                if line.startswith("WORKFLOW:"):
-                    workflow_type = line.replace("WORKFLOW:", "").strip()
-                elif line.startswith("FILE:"):
-                    file_query = line.replace("FILE:", "").strip()
-                elif line.startswith("RECIPIENT:"):
-                    recipient = line.replace("RECIPIENT:", "").strip()
-                    # Additional validation to prevent extracting prepositions
-                    if recipient.lower() in ["to", "for", "with", "about", "from", "the", "a", "an"]:
-                        print(f"[DEBUG] Ignoring invalid recipient: {recipient}")
-                        recipient = ""
-                elif line.startswith("MESSAGE:"):
-                    message = line.replace("MESSAGE:", "").strip()
+            # First, try to parse the multi-agent intent (unless the planner already did)
+            params = slots or self._parse_multi_agent_command(user_input)
+            workflow_type = params.get('workflow_type', '')
+            file_query = params.get('file_query', '')
+            recipient = params.get('recipient', '')
+            message = params.get('message', '')
             
             print(f"[DEBUG] Parsed - Workflow: {workflow_type}, File: {file_query}, Recipient: {recipient}, Message: {message}")
             
@@ -677,6 +732,78 @@ IMPORTANT:
                 "error": str(e)
             }
     
+    def _parse_multi_agent_command(self, user_input: str) -> Dict[str, str]:
+        """Ask the LLM for the workflow type, file query, recipient and message"""
+        system_prompt = """Analyze this command to determine the multi-agent workflow needed:
+        
+        WORKFLOW TYPES:
+        1. file_to_whatsapp: Find/prepare file and send via WhatsApp
+        2. search_and_share: Search for files and prepare for sharing
+        3. open_and_inform: Open file and notify someone
+        4. whatsapp_only: Simple WhatsApp message without files
+        
+        Extract:
+        - workflow_type: [file_to_whatsapp/search_and_share/open_and_inform/whatsapp_only]
+        - file_query: [file name/pattern to find] (empty if no file)
+        - recipient: [person to send to] (NEVER extract 'to', 'for', or prepositions)
+        - message: [optional message content]
+        
+        IMPORTANT: For recipient extraction, identify the actual person's name:
+        - "send WhatsApp message to Jay lion is coming" -> recipient: "Jay", message: "lion is coming"
+        - "send report.pdf to boss" -> recipient: "boss", file: "report.pdf"
+        - "message mom about dinner" -> recipient: "mom", message: "about dinner"
+        
+        NEVER extract prepositions (to, for, with, about) as recipient names.
+        
+        Examples:
+        - "Send report.pdf to boss on WhatsApp" -> file_to_whatsapp, report.pdf, boss
+        - "Find my photos and share with mom" -> search_and_share, photos, mom
+        - "Send WhatsApp message to Jay lion is coming" -> whatsapp_only, (empty), Jay, lion is coming
+        
+        Return format:
+        WORKFLOW: [type]
+        FILE: [query]
+        RECIPIENT: [name]
+        MESSAGE: [content or empty]
+        """
+        
+        messages = [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=user_input)
+        ]
+        
+        response = self.llm.invoke(messages)
+        response_text = response.content.strip()
+        
+        print(f"[DEBUG] LLM parsing response: {response_text}")
+        
+        # Parse workflow parameters
+        workflow_type = ""
+        file_query = ""
+        recipient = ""
+        message = ""
+        
+        for line in response_text.split('\n'):
+            if line.startswith("WORKFLOW:"):
+                workflow_type = line.replace("WORKFLOW:", "").strip()
+            elif line.startswith("FILE:"):
+                file_query = line.replace("FILE:", "").strip()
+            elif line.startswith("RECIPIENT:"):
+                recipient = line.replace("RECIPIENT:", "").strip()
+                # Additional validation to prevent extracting prepositions
+                if recipient.lower() in ["to", "for", "with", "about", "from", "the", "a", "an"]:
+                    print(f"[DEBUG] Ignoring invalid recipient: {recipient}")
+                    recipient = ""
+            elif line.startswith("MESSAGE:"):
+                message = line.replace("MESSAGE:", "").strip()
+        
+        return {
+            "workflow_type": workflow_type,
+            "file_query": file_query,
+            "recipient": recipient,
+            "message": message
+        }
+    
     def _execute_generic_multi_agent_workflow(self, user_input: str) -> Dict[str, Any]:
         """Execute generic multi-agent workflow when pattern isn't clear"""
         try:
@@ -799,6 +926,8 @@ IMPORTANT:
             whatsapp_result = self.agents["whatsapp"].process_command(whatsapp_command)
             
             if whatsapp_result.get("success"):
+                # A file sent on to someone counts as a use of that file
+                frecency_store.record(file_path, "share")
                 return {
                     "success": True,
                     "message": f"✅ Great! I found '{file_name}' and prepared WhatsApp message for {recipient}!\n\n📁 File: {file_name} ({file_size_mb:.1f}MB)\n💬 {whatsapp_result['message']}",
@@ -873,8 +1002,12 @@ IMPORTANT:
                 'user_input': user_input.strip(),
                 'original_input': '',  # Will be set by AI enhancement
                 'enhanced_input': '',  # Will be set by AI enhancement
+                'route_confidence': 0.0,
+                'needs_enhancement': True,
+                'cached_route': False,
                 'detected_intent': '',
                 'agent_name': '',
+                'slots': {},
                 'agent_response': {},
                 'final_response': '',
                 'error': None
@@ -886,6 +1019,11 @@ IMPORTANT:
             # Ensure all required fields exist in response
             agent_response = result.get('agent_response', {})
             
+            # Remember successful resolutions for rephrasings of this command
+            if config.SEMANTIC_CACHE_ENABLED and not result.get('error') and agent_response.get('success'):
+                semantic_cache.store(result.get('original_input') or user_input, result.get('agent_name', ''),
+                                     result.get('user_input', user_input), result.get('slots'))
+            
             # Log enhancement if it happened
             if result.get('original_input') != result.get('enhanced_input'):
                 print(f"[DEBUG] ✨ AI Enhancement applied:")
@@ -908,7 +1046,11 @@ IMPORTANT:
                 # AI enhancement tracking
                 "original_input": result.get('original_input', user_input),
                 "enhanced_input": result.get('enhanced_input', user_input),
-                "was_enhanced": result.get('original_input') != result.get('enhanced_input')
+                "was_enhanced": result.get('original_input') != result.get('enhanced_input'),
+                "route_confidence": result.get('route_confidence', 0.0),
+                "skipped_enhancement": not result.get('needs_enhancement', True),
+                "cached_route": result.get('cached_route', False),
+                "slots": result.get('slots', {})
             }
             
         except Exception as e:
@@ -15,6 +15,7 @@ from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph, END
 from pydantic import BaseModel, Field
 from config import config
+from utils.llm_cache import llm_cache
 
 class AppLaunchRequest(BaseModel):
     """Application launch request structure"""
@@ -181,7 +182,8 @@ class AppLauncherAgent:
             groq_api_key=config.GROQ_API_KEY,
             model_name=config.GROQ_MODEL,
             temperature=config.AGENT_TEMPERATURE,
-            max_tokens=config.MAX_RESPONSE_TOKENS
+            max_tokens=config.MAX_RESPONSE_TOKENS,
+            cache=llm_cache
         )
         
         # Initialize tools
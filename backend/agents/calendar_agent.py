@@ -16,6 +16,7 @@ from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph, END
 from pydantic import BaseModel, Field
 from config import config
+from utils.llm_cache import llm_cache
 
 class CalendarEvent(BaseModel):
     """Calendar event structure"""
@@ -137,13 +138,17 @@ class CalendarTool(BaseTool):
 class CalendarAgent:
     """LangGraph-powered Calendar Agent"""
     
+    # Slots the command planner may pre-parse for process_command
+    slot_model = CalendarEvent
+    
     def __init__(self):
         # Initialize LLM
         self.llm = ChatGroq(
             groq_api_key=config.GROQ_API_KEY,
             model_name=config.GROQ_MODEL,
             temperature=config.AGENT_TEMPERATURE,
-            max_tokens=config.MAX_RESPONSE_TOKENS
+            max_tokens=config.MAX_RESPONSE_TOKENS,
+            cache=llm_cache
         )
         
         # Initialize tools
@@ -159,6 +164,10 @@ class CalendarAgent:
         def parse_command_node(state: AgentState) -> AgentState:
             """Parse user command to extract event details"""
             try:
+                # Slots pre-parsed by the command planner replace the LLM parse
+                if state['parsed_command']:
+                    return state
+                
                 user_input = state['user_input']
                 
                 # Use LLM to extract event components
@@ -273,12 +282,12 @@ class CalendarAgent:
         # Default to "today"
         return "today"
     
-    def process_command(self, user_input: str) -> Dict[str, Any]:
+    def process_command(self, user_input: str, slots: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Process calendar command and return result"""
         try:
             initial_state = {
                 "user_input": user_input,
-                "parsed_command": {},
+                "parsed_command": dict(slots or {}),
                 "calendar_url": "",
                 "response_message": "",
                 "error": None
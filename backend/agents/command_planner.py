@@ -0,0 +1,129 @@
+"""
+Structured Command Planner for AI Task Automation Assistant
+One LLM call that cleans up a command, picks the agent and extracts that
+agent's slots, replacing the separate enhancement, intent detection and
+per-agent parsing calls
+"""
+
+import json
+from typing import Dict, Any, Optional, NamedTuple, Type
+from langchain.schema import HumanMessage, SystemMessage
+from pydantic import BaseModel, Field, ValidationError
+
+# What each agent handles, for the planner prompt
+AGENT_DESCRIPTIONS: Dict[str, str] = {
+    "whatsapp": "WhatsApp messages (\"tell mom I'm coming\", \"message Jay hello\")",
+    "email": "compose and send email",
+    "calendar": "schedule meetings and events",
+    "phone": "phone calls",
+    "payment": "payments via PayPal, Google Pay, Paytm or PhonePe",
+    "app_launcher": "open applications (\"open chrome\", \"launch calculator\")",
+    "websearch": "web and YouTube searches",
+    "task": "tasks, to-dos and reminders",
+    "filesearch": "find, open or share one file on this computer",
+    "screenshot": "take screenshots",
+    "system_control": "volume, brightness, lock, shutdown, battery, time",
+    "conversation": "greetings, small talk, help and questions",
+    "multi_agent": "find a file AND send it to someone",
+    "multi_task": "several separate actions in sequence (\"take a screenshot and email it\")",
+}
+
+
+def _type_name(annotation) -> str:
+    return annotation.__name__ if isinstance(annotation, type) else str(annotation).replace("typing.", "")
+
+
+class CommandPlan(BaseModel):
+    """Structured planner output"""
+    command: str = Field(description="The command rewritten clearly, keeping every name, number and detail")
+    agent: str = Field(description="Agent that should handle the command")
+    slots: Dict[str, Any] = Field(default_factory=dict, description="Parameters for that agent")
+
+
+class Plan(NamedTuple):
+    """A validated plan"""
+    command: str
+    agent_name: str
+    slots: Dict[str, Any]   # empty when the agent has no slot model or the slots did not validate
+
+
+class CommandPlanner:
+    """
+    Single-call structured planner
+
+    The prompt lists every agent, and for agents that accept pre-parsed
+    slots (a ``slot_model``), the fields of that model. The reply is
+    requested in JSON mode and validated: an unknown agent fails the plan,
+    slots that do not fit the agent's model are dropped so the agent
+    parses the command itself.
+    """
+
+    def __init__(self, llm, slot_models: Dict[str, Type[BaseModel]]):
+        """
+        Initialize planner
+
+        Args:
+            llm: Chat model used for planning
+            slot_models: Agent name -> pydantic model of its slots
+        """
+        self.slot_models = slot_models
+        self.structured_llm = llm.with_structured_output(CommandPlan, method="json_mode")
+        self.system_prompt = self._build_prompt()
+
+    def _build_prompt(self) -> str:
+        agent_lines = []
+        for name, description in AGENT_DESCRIPTIONS.items():
+            agent_lines.append(f"- {name}: {description}")
+            model = self.slot_models.get(name)
+            if model is not None:
+                fields = ", ".join(
+                    f"{field}: {_type_name(info.annotation)}" + ("" if info.is_required() else " (optional)")
+                    for field, info in model.model_fields.items()
+                )
+                agent_lines.append(f"  slots: {fields}")
+
+        return f"""You are the command planner of Vaani, a voice assistant.
+Commands come from speech recognition and may be casual, abbreviated or contain typos.
+
+For the user's command:
+1. Rewrite it as one clear command (fix typos, join email addresses split by speech
+   recognition such as "7819 Vijay sharma@gmail.com" -> "7819Vijaysharma@gmail.com",
+   expand shorthand such as "msg" -> "send WhatsApp message"). Preserve the intent exactly.
+2. Pick the agent that should handle it.
+3. If the agent lists slots, fill them from the command. Leave slots empty otherwise.
+
+AGENTS:
+{chr(10).join(agent_lines)}
+
+Reply with ONLY a JSON object:
+{{"command": "...", "agent": "...", "slots": {{...}}}}"""
+
+    def plan(self, user_input: str) -> Optional[Plan]:
+        """Plan a command, or None if the planner failed and the normal route should run"""
+        try:
+            result = self.structured_llm.invoke([
+                SystemMessage(content=self.system_prompt),
+                HumanMessage(content=user_input)
+            ])
+        except Exception as e:
+            print(f"[DEBUG] Planner failed: {str(e)}")
+            return None
+
+        agent_name = result.agent.strip().lower()
+        if agent_name not in AGENT_DESCRIPTIONS:
+            print(f"[DEBUG] Planner chose unknown agent '{agent_name}'")
+            return None
+
+        command = result.command.strip()
+        if len(command) < 3 or len(command) > len(user_input) * 3:
+            command = user_input
+
+        slots: Dict[str, Any] = {}
+        model = self.slot_models.get(agent_name)
+        if model is not None and result.slots:
+            try:
+                slots = model(**result.slots).model_dump()
+            except ValidationError as e:
+                print(f"[DEBUG] Planner slots for {agent_name} rejected: {json.dumps(result.slots)} ({e.error_count()} errors)")
+
+        return Plan(command, agent_name, slots)
@@ -3,7 +3,6 @@ Conversational Agent for AI Task Automation Assistant (Vaani)
 Provides natural, friendly interactions with personality and context awareness
 """
 
-import re
 from typing import Dict, List, Any, Optional, TypedDict
 from langchain.schema import BaseMessage, HumanMessage, SystemMessage
 from langchain_groq import ChatGroq
@@ -13,6 +12,7 @@ from datetime import datetime
 from config import config
 from utils.conversation_memory import conversation_memory
 from utils.conversational_tts import conversational_tts
+from utils.intent_matcher import IntentMatches, build_routing_matcher
 
 class ConversationState(TypedDict):
     """State for the conversation agent workflow"""
@@ -35,6 +35,9 @@ class ConversationAgent:
             max_tokens=config.MAX_RESPONSE_TOKENS
         )
         
+        # Built on first standalone is_conversational_input call
+        self._intent_matcher = None
+        
         # Build LangGraph workflow
         self.workflow = self._build_workflow()
         
@@ -367,33 +370,23 @@ class ConversationAgent:
                 "error": str(e)
             }
     
-    def is_conversational_input(self, user_input: str) -> bool:
-        """Determine if input is conversational rather than a task command"""
-        user_input_lower = user_input.lower()
+    def is_conversational_input(self, user_input: str, matches: Optional[IntentMatches] = None) -> bool:
+        """
+        Determine if input is conversational rather than a task command
         
-        # First check if it's a WhatsApp or task command - these should NOT be conversational
-        task_patterns = [
-            r'\b(send|message|text|whatsapp)\s+\w+\s+to\b',  # "send/message/text X to Y"
-            r'\b(send whatsapp|whatsapp to|message to|text to)\b',  # WhatsApp specific patterns
-            r'\b(find|search|open|locate)\s+\w+',  # File operations
-            r'\b(share|send)\s+\w+\s+(via|on|through)\s+whatsapp\b',  # Sharing patterns
-        ]
+        matches are the routing matcher's hits for user_input, if already
+        computed (AgentManager passes them in)
+        """
+        if matches is None:
+            if self._intent_matcher is None:
+                self._intent_matcher = build_routing_matcher()
+            matches = self._intent_matcher.match(user_input)
         
-        # If it matches task patterns, it's NOT conversational
-        if any(re.search(pattern, user_input_lower) for pattern in task_patterns):
+        # WhatsApp or task commands are NOT conversational
+        if matches.has("task_command"):
             return False
         
-        # Now check for conversational patterns
-        conversational_patterns = [
-            r'^\s*(hi|hello|hey|good morning|good afternoon|good evening)\s*$',  # Pure greetings
-            r'^\s*(how are you|what\'s up|how\'s it going)\s*\??\s*$',  # Status questions
-            r'^\s*(who are you|what can you do|help|what are your capabilities)\s*\??\s*$',  # Help/intro
-            r'^\s*(thank you|thanks|appreciate)\s*$',  # Gratitude
-            r'^\s*(bye|goodbye|see you|exit|quit)\s*$',  # Farewells
-            r'^\s*vaani\s*$',  # Just saying the name
-        ]
-        
-        return any(re.search(pattern, user_input_lower) for pattern in conversational_patterns)
+        return matches.has("conversational")
     
     def get_conversation_summary(self) -> str:
         """Get a summary of the current conversation session"""
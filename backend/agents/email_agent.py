@@ -15,6 +15,7 @@ from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph, END
 from pydantic import BaseModel, Field
 from config import config
+from utils.llm_cache import llm_cache
 
 class EmailMessage(BaseModel):
     """Email message structure"""
@@ -22,6 +23,7 @@ class EmailMessage(BaseModel):
     subject: str = ""
     body: str = ""
     cc: Optional[str] = None
+    use_ai: bool = False  # have the LLM write the body
 
 class AgentState(TypedDict):
     """State for the Email agent workflow"""
@@ -74,13 +76,17 @@ class EmailComposerTool(BaseTool):
 class EmailAgent:
     """LangGraph-powered Email Agent"""
     
+    # Slots the command planner may pre-parse for process_command
+    slot_model = EmailMessage
+    
     def __init__(self):
         # Initialize LLM
         self.llm = ChatGroq(
             groq_api_key=config.GROQ_API_KEY,
             model_name=config.GROQ_MODEL,
             temperature=config.AGENT_TEMPERATURE,
-            max_tokens=config.MAX_RESPONSE_TOKENS
+            max_tokens=config.MAX_RESPONSE_TOKENS,
+            cache=llm_cache
         )
         
         # Initialize tools
@@ -96,6 +102,10 @@ class EmailAgent:
         def parse_command_node(state: AgentState) -> AgentState:
             """Parse user command to extract email details"""
             try:
+                # Slots pre-parsed by the command planner replace the LLM parse
+                if state['parsed_command']:
+                    return state
+                
                 user_input = state['user_input']
                 
                 # Use LLM to extract email components
@@ -292,12 +302,12 @@ class EmailAgent:
         # Fallback: use entire text if no specific pattern
         return text
     
-    def process_command(self, user_input: str) -> Dict[str, Any]:
+    def process_command(self, user_input: str, slots: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Process email command and return result"""
         try:
             initial_state = {
                 "user_input": user_input,
-                "parsed_command": {},
+                "parsed_command": dict(slots or {}),
                 "email_url": "",
                 "response_message": "",
                 "error": None
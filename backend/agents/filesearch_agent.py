@@ -4,12 +4,16 @@ Comprehensive file search, open, and management with cross-platform support
 """
 
 import os
+import re
+import heapq
+import time
 import platform
 import subprocess
 import glob
 import mimetypes
+import numpy as np
 from pathlib import Path
-from typing import Dict, List, Any, Optional, TypedDict, Tuple
+from typing import Dict, List, Any, Optional, TypedDict, Tuple, Callable
 from langchain.tools import BaseTool
 from langchain.schema import BaseMessage, HumanMessage, SystemMessage
 from langchain_groq import ChatGroq
@@ -18,6 +22,16 @@ from pydantic import BaseModel, Field
 import urllib.parse
 from datetime import datetime
 from config import config
+from utils.file_index import file_index
+from utils.content_index import content_index
+from utils.query_cache import QueryCache
+from utils.fuzzy_index import filename_token_index
+from utils.frecency_store import frecency_store
+from utils.batch_scorer import (
+    FuzzyScorer, as_names, contains, contains_any, count_contains, endswith_any, typo_credit
+)
+from utils.file_crawler import FileEntry, file_crawler
+from utils.llm_cache import llm_cache
 
 class FileSearchState(TypedDict):
     """State for the FileSearch agent workflow"""
@@ -26,9 +40,17 @@ class FileSearchState(TypedDict):
     search_results: List[Dict[str, Any]]
     selected_file: Optional[Dict[str, Any]]
     action_type: str  # search, open, share
+    search_exhaustive: bool
     response_message: str
     error: Optional[str]
 
+class FileOperation(BaseModel):
+    """File operation structure"""
+    operation: str  # search, open, share
+    query: str
+    recipient: str = ""
+    context: str = ""
+
 class FileInfo(BaseModel):
     """File information structure"""
     name: str
@@ -39,6 +61,41 @@ class FileInfo(BaseModel):
     mime_type: str
     is_accessible: bool
 
+# Score added for a file whose contents contain every query word
+CONTENT_MATCH_WEIGHT = 5.0
+
+# Largest score added for files the user keeps opening or sharing;
+# a file with frecency f gets FRECENCY_WEIGHT * f / (f + 1)
+FRECENCY_WEIGHT = 0.5
+
+# Candidates scored together in one vectorized call
+SCORE_BATCH_SIZE = 2048
+
+# Words that do not narrow a type-only query ("show my pdf files")
+EXTENSION_QUERY_FILLER = {'my', 'all', 'the', 'me', 'show', 'find', 'list', 'file', 'files', 'recent', 'latest', 'new', 'newest'}
+
+# Results of a live crawl that listed more directories than this are not
+# cached, as validating them would cost about as much as searching again
+MAX_CACHED_CRAWL_DIRECTORIES = 2000
+
+# Shared by every FileSearchTool so repeated queries across agents hit it
+search_cache = QueryCache(config.FILE_SEARCH_CACHE_SIZE, config.FILE_SEARCH_CACHE_TTL)
+
+class SearchCandidate:
+    """Lightweight match record kept while ranking; full metadata comes later"""
+    __slots__ = ("name", "path", "score", "mtime", "location", "entry")
+    
+    def __init__(self, entry: FileEntry, score: float, location: str):
+        self.name = entry.name
+        self.path = entry.path
+        self.score = score
+        self.mtime = entry.mtime
+        self.location = location
+        self.entry = entry
+    
+    def rank_key(self) -> Tuple[float, float]:
+        return (self.score, self.mtime)
+
 class FileSearchTool(BaseTool):
     """Advanced file search tool with fuzzy matching"""
     name: str = "file_search"
@@ -49,6 +106,22 @@ class FileSearchTool(BaseTool):
         # Initialize search locations without using Pydantic fields
         object.__setattr__(self, 'search_locations', self._get_search_locations())
     
+    def start_indexing(self):
+        """
+        Build/refresh the persistent indexes in the background and watch
+        the search locations
+        
+        Called from the server's startup event rather than on import: under
+        the spawn start method every process pool worker re-imports the app
+        modules, and each would otherwise start its own crawl, watcher and
+        pool. Until it runs, searches crawl the locations live.
+        """
+        if config.FILE_INDEX_ENABLED:
+            file_index.ensure_indexed(self.search_locations)
+            if config.CONTENT_INDEX_ENABLED:
+                content_index.start(file_index)
+            filename_token_index.start(file_index)
+    
     def _get_search_locations(self) -> List[str]:
         """Get platform-specific search locations - expanded to cover all common directories"""
         system = platform.system().lower()
@@ -128,45 +201,53 @@ class FileSearchTool(BaseTool):
         # Filter to existing directories
         return [loc for loc in locations if os.path.exists(loc)]
     
-    def _fuzzy_match(self, query: str, filename: str) -> float:
-        """Calculate fuzzy match score between query and filename"""
-        query_lower = query.lower()
-        filename_lower = filename.lower()
-        
-        # Exact match
-        if query_lower == filename_lower:
-            return 1.0
-        
-        # Contains match
-        if query_lower in filename_lower:
-            return 0.8
-        
-        # Word boundary match
-        query_words = query_lower.split()
-        filename_words = filename_lower.replace('.', ' ').replace('_', ' ').replace('-', ' ').split()
-        
-        matching_words = sum(1 for word in query_words if any(word in fw for fw in filename_words))
-        if matching_words > 0:
-            return 0.6 * (matching_words / len(query_words))
-        
-        # Character overlap
-        common_chars = set(query_lower) & set(filename_lower)
-        if len(common_chars) > len(query_lower) * 0.5:
-            return 0.3
-        
-        return 0.0
+    def _typo_corrections(self, words: List[str]) -> Dict[str, List[Tuple[int, str]]]:
+        """
+        For query words that appear in no indexed filename, the closest
+        filename tokens by edit distance (e.g. a misheard "quartly" ->
+        "quarterly"), at most three per word
+        """
+        corrections = {}
+        for word in words:
+            matches = filename_token_index.closest(word)
+            if matches and matches[0][0] > 0:
+                corrections[word] = matches[:3]
+        if corrections:
+            print(f"[DEBUG] FileSearch: Typo corrections: {corrections}")
+        return corrections
     
-    def _get_file_info(self, file_path: str) -> FileInfo:
-        """Get comprehensive file information"""
+    def _iter_indexed_files(self, location: str, substrings: Optional[List[str]] = None,
+                            extensions: Optional[List[str]] = None, limit: int = 10):
+        """
+        Yield a FileEntry for each file under an indexed search location.
+        With extensions, only the newest limit files of those types are
+        read from the index's extension buckets; with substrings, only
+        names containing one of them.
+        """
+        records = None
+        if extensions:
+            records = file_index.recent_by_extension(location, extensions, limit)
+        elif substrings:
+            records = file_index.find(location, substrings)
+        if records is None:
+            records = file_index.files(location)
+        yield from records
+    
+    def _get_file_info(self, file_path: str, entry: Optional[FileEntry] = None) -> FileInfo:
+        """Get comprehensive file information, reusing crawler stat data when available"""
         try:
-            stat = os.stat(file_path)
+            if entry is not None:
+                size, mtime = entry.size, entry.mtime
+            else:
+                stat = os.stat(file_path)
+                size, mtime = stat.st_size, stat.st_mtime
             mime_type, _ = mimetypes.guess_type(file_path)
             
             return FileInfo(
                 name=os.path.basename(file_path),
                 path=file_path,
-                size=stat.st_size,
-                modified=datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                size=size,
+                modified=datetime.fromtimestamp(mtime).isoformat(),
                 file_type=os.path.splitext(file_path)[1].lower(),
                 mime_type=mime_type or 'unknown',
                 is_accessible=os.access(file_path, os.R_OK)
@@ -182,13 +263,215 @@ class FileSearchTool(BaseTool):
                 is_accessible=False
             )
     
+    def _select_top_results(self, substrings: List[str], score_fn, max_results: int, deadline: float,
+                            on_match: Optional[Callable[[SearchCandidate], None]] = None,
+                            content_query: Optional[str] = None,
+                            content_extensions: Optional[List[str]] = None,
+                            extensions: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Stream candidates from every location and keep the global top-k.
+        Candidates are scored from the filename alone, in batches:
+        score_fn takes an array of lowercased names and returns an array
+        of scores. File metadata is only fetched for the files that make
+        it into the final results.
+        
+        Files the user has opened or shared before get a frecency bonus
+        on top of their match score.
+        
+        Indexed locations are read first (they answer instantly), then the
+        remaining locations are crawled breadth-first until the deadline.
+        on_match is called whenever a candidate enters the current top-k.
+        
+        With extensions (a type-only query), indexed locations contribute
+        just their newest max_results files of those types.
+        
+        With a content_query, documents whose indexed text contains the
+        query words get a bonus, and are returned even if their name does
+        not match.
+        """
+        indexed = [
+            location for location in self.search_locations
+            if config.FILE_INDEX_ENABLED and file_index.is_indexed(location)
+        ]
+        pending = [location for location in self.search_locations if location not in indexed]
+        progress = {"exhaustive": True}
+        seen = set()
+        skipped = []
+        
+        # path -> (entry, fraction of query words found), from the content index only
+        content_matches = {}
+        if content_query and config.CONTENT_INDEX_ENABLED:
+            for entry, fraction in content_index.search(content_query, self.search_locations):
+                if not content_extensions or entry.extension in content_extensions:
+                    content_matches[entry.path] = (entry, fraction)
+            print(f"[DEBUG] FileSearch: {len(content_matches)} documents mention '{content_query}'")
+        
+        frecency = frecency_store.scores()
+        
+        def score(batch: List[Tuple[FileEntry, str]]) -> List[SearchCandidate]:
+            fresh = []
+            for entry, location in batch:
+                if entry.path not in seen:
+                    seen.add(entry.path)
+                    fresh.append((entry, location))
+            if not fresh:
+                return []
+            
+            scores = score_fn(as_names([entry.name.lower() for entry, _ in fresh]))
+            if content_matches:
+                for i, (entry, _) in enumerate(fresh):
+                    content_match = content_matches.get(entry.path)
+                    if content_match is not None:
+                        scores[i] += CONTENT_MATCH_WEIGHT * content_match[1]
+            if frecency:
+                for i, (entry, _) in enumerate(fresh):
+                    used = frecency.get(entry.path)
+                    if used and scores[i] > 0:
+                        scores[i] += FRECENCY_WEIGHT * used / (used + 1)
+            
+            matches = []
+            for i, (entry, location) in enumerate(fresh):
+                if scores[i] > 0:
+                    matches.append(SearchCandidate(entry, float(scores[i]), location))
+                else:
+                    # Only scored matches count as seen, so a later location may still offer the file
+                    seen.discard(entry.path)
+            return matches
+        
+        def batches(pairs):
+            batch = []
+            for pair in pairs:
+                batch.append(pair)
+                if len(batch) >= SCORE_BATCH_SIZE:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        
+        def candidates():
+            for location in indexed:
+                if time.monotonic() >= deadline:
+                    skipped.append(location)
+                    continue
+                location_matches = 0
+                try:
+                    records = self._iter_indexed_files(location, substrings, extensions, max_results)
+                    for batch in batches((entry, location) for entry in records):
+                        for candidate in score(batch):
+                            location_matches += 1
+                            yield candidate
+                    print(f"[DEBUG] FileSearch: Found {location_matches} matches in {os.path.basename(location)}")
+                except Exception as e:
+                    print(f"[DEBUG] FileSearch: Error searching {location}: {str(e)}")
+                    continue
+            
+            if pending:
+                print(f"[DEBUG] FileSearch: Crawling {len(pending)} unindexed locations in parallel")
+                try:
+                    crawled = file_crawler.iter_breadth_first(pending, deadline=deadline, progress=progress)
+                    for batch in batches((entry, entry.root) for entry in crawled):
+                        yield from score(batch)
+                except Exception as e:
+                    print(f"[DEBUG] FileSearch: Error crawling locations: {str(e)}")
+                    progress["exhaustive"] = False
+            
+            # Documents that matched on content but not on name
+            for path, (entry, fraction) in content_matches.items():
+                if path not in seen:
+                    seen.add(path)
+                    yield SearchCandidate(entry, CONTENT_MATCH_WEIGHT * fraction, entry.root)
+        
+        # Bounded min-heap of the best max_results: match score first, then most recent
+        heap = []
+        for sequence, candidate in enumerate(candidates()):
+            item = (candidate.rank_key(), -sequence, candidate)
+            if len(heap) < max_results:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+            else:
+                continue
+            if on_match is not None:
+                on_match(candidate)
+        top = [item[2] for item in sorted(heap, key=lambda item: item[:2], reverse=True)]
+        
+        # Full metadata (mime type, access check) only for the returned files
+        final_results = []
+        for candidate in top:
+            file_info = self._get_file_info(candidate.path, candidate.entry)
+            final_results.append({
+                "file_info": file_info.dict(),
+                "match_score": candidate.score,
+                "location": candidate.location,
+                "mod_time": candidate.mtime
+            })
+        
+        exhaustive = progress["exhaustive"] and not skipped
+        
+        print(f"[DEBUG] FileSearch: Final results: {len(final_results)} of {len(seen)} matching files (exhaustive: {exhaustive})")
+        for result in final_results:
+            mod_date = datetime.fromtimestamp(result['mod_time']).strftime('%Y-%m-%d %H:%M') if result.get('mod_time') else 'Unknown'
+            print(f"[DEBUG] FileSearch: - {result['file_info']['name']} (score: {result['match_score']}, modified: {mod_date})")
+            print(f"[DEBUG] FileSearch:   Location: {result['location']}")
+        
+        return {
+            "results": final_results,
+            "exhaustive": exhaustive,
+            "crawled_directories": progress.get("directories", [])
+        }
+    
     def _run(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
+        """Search for files matching the query and return the best matches"""
+        return self.search(query, max_results)["results"]
+    
+    def search(self, query: str, max_results: int = 10, time_budget: Optional[float] = None,
+               on_match: Optional[Callable[[SearchCandidate], None]] = None) -> Dict[str, Any]:
+        """
+        Search for files matching the query, answering repeats from the cache.
+        
+        A cached result is reused while the search locations, the
+        directories holding the results, every directory a live crawl of an
+        unindexed location listed and the file/content indexes are
+        unchanged and no file has been opened or shared since. Only
+        exhaustive results are cached, and only when the crawl listed at
+        most MAX_CACHED_CRAWL_DIRECTORIES directories; streaming searches
+        (on_match) and custom time budgets always run.
+        """
+        if on_match is not None or time_budget is not None:
+            outcome = self._search(query, max_results, time_budget, on_match)
+            outcome.pop("crawled_directories", None)
+            return outcome
+        
+        key = (" ".join(query.lower().split()), max_results, tuple(self.search_locations))
+        version = (file_index.generation, content_index.generation, frecency_store.generation)
+        cached = search_cache.get(key, version)
+        if cached is not None:
+            print(f"[DEBUG] FileSearch: Cache hit for '{query.strip()}'")
+            return cached
+        
+        outcome = self._search(query, max_results)
+        crawled = outcome.pop("crawled_directories", [])
+        if outcome["exhaustive"] and len(crawled) <= MAX_CACHED_CRAWL_DIRECTORIES:
+            # A new file anywhere in a crawled tree changes its directory's mtime
+            directories = list(self.search_locations) + crawled
+            directories.extend(os.path.dirname(result["file_info"]["path"]) for result in outcome["results"])
+            search_cache.put(key, outcome, directories, version)
+        return outcome
+    
+    def _search(self, query: str, max_results: int = 10, time_budget: Optional[float] = None,
+                on_match: Optional[Callable[[SearchCandidate], None]] = None) -> Dict[str, Any]:
         """
         Search for files matching the query.
         Enhanced to intelligently detect file extensions from natural language.
+        
+        Locations are searched at any depth until the time budget runs out;
+        the best matches found so far are returned along with whether the
+        search was exhaustive. on_match (called from the searching thread)
+        receives each candidate as it enters the running top results.
         """
-        results = []
         query_clean = query.strip()
+        budget = config.FILE_SEARCH_TIME_BUDGET if time_budget is None else time_budget
+        deadline = time.monotonic() + budget
         
         print(f"[DEBUG] FileSearch: Raw query: '{query_clean}'")
         
@@ -200,81 +483,32 @@ class FileSearchTool(BaseTool):
                 print(f"[DEBUG] FileSearch: Detected explicit extension in query")
                 print(f"[DEBUG] FileSearch: Will search in {len(self.search_locations)} locations")
                 
-                max_depth = 3  # Limit search depth to prevent hanging
+                if not filename_parts[0].strip():
+                    # Just an extension, e.g. ".pdf"
+                    return self._search_extensions(['.' + filename_parts[1]], max_results, deadline, on_match)
                 
-                for location in self.search_locations:
-                    print(f"[DEBUG] FileSearch: Searching in {location}")
-                    location_matches = 0
-                    
-                    try:
-                        # Use os.walk instead of glob for better performance and control
-                        for root, dirs, files in os.walk(location):
-                            # Limit depth
-                            depth = root[len(location):].count(os.sep)
-                            if depth >= max_depth:
-                                dirs[:] = []  # Don't recurse deeper
-                                continue
-                            
-                            # Search in current directory
-                            for filename in files:
-                                if query_clean.lower() in filename.lower():
-                                    file_path = os.path.join(root, filename)
-                                    
-                                    try:
-                                        if os.path.isfile(file_path):
-                                            file_info = self._get_file_info(file_path)
-                                            match_score = self._fuzzy_match(query_clean.lower(), file_info.name.lower())
-                                            
-                                            if match_score > 0:
-                                                location_matches += 1
-                                                print(f"[DEBUG] FileSearch: Match found: {file_info.name} (score: {match_score}) in {os.path.basename(location)}")
-                                                results.append({
-                                                    "file_info": file_info.dict(),
-                                                    "match_score": match_score,
-                                                    "location": location
-                                                })
-                                                
-                                                # Limit results per location to speed up
-                                                if location_matches >= 5:
-                                                    break
-                                    except Exception as e:
-                                        print(f"[DEBUG] FileSearch: Error accessing file {filename}: {str(e)}")
-                                        continue
-                            
-                            if location_matches >= 5:
-                                break
-                        
-                        print(f"[DEBUG] FileSearch: Found {location_matches} matches in {os.path.basename(location)}")
-                        
-                    except Exception as e:
-                        print(f"[DEBUG] FileSearch: Error searching {location}: {str(e)}")
-                        continue
-                
-                # Remove duplicates and sort
-                unique_results = {}
-                for result in results:
-                    file_path = result["file_info"]["path"]
-                    if file_path not in unique_results or result["match_score"] > unique_results[file_path]["match_score"]:
-                        unique_results[file_path] = result
-                
-                # Add modification time for sorting
-                for result in unique_results.values():
-                    try:
-                        file_path = result["file_info"]["path"]
-                        mod_time = os.path.getmtime(file_path)
-                        result["mod_time"] = mod_time
-                    except:
-                        result["mod_time"] = 0
-                
-                # Sort by match score first, then by recency
-                sorted_results = sorted(
-                    unique_results.values(), 
-                    key=lambda x: (x["match_score"], x["mod_time"]), 
-                    reverse=True
-                )
-                
-                print(f"[DEBUG] FileSearch: Found {len(sorted_results)} unique files across all locations")
-                return sorted_results[:max_results]
+                query_lower = query_clean.lower()
+                suffix = '.' + filename_parts[1].lower()
+                stem_words = [w for w in re.findall(r'[a-z0-9]+', filename_parts[0].lower()) if len(w) > 1]
+                corrections = self._typo_corrections(stem_words)
+                
+                fuzzy = FuzzyScorer(query_lower)
+                exact_words = [w for w in stem_words if w not in corrections]
+                
+                def score_explicit(names):
+                    in_query = contains(names, query_lower)
+                    scores = np.where(in_query, fuzzy(names), 0.0)
+                    if corrections:
+                        # Every word present as typed or as a corrected token
+                        typo_score = typo_credit(names, corrections)
+                        exact = count_contains(names, exact_words)
+                        corrected = (~in_query & endswith_any(names, [suffix]) & (typo_score > 0)
+                                     & (exact == len(exact_words)))
+                        scores = np.where(corrected, 0.5 * (exact + typo_score) / len(stem_words), scores)
+                    return scores
+                
+                substrings = [query_clean] + [token for matches in corrections.values() for _, token in matches]
+                return self._select_top_results(substrings, score_explicit, max_results, deadline, on_match)
         
         # Split query into keywords for better matching
         keywords = [kw.lower() for kw in query_clean.split() if len(kw) > 1]
@@ -283,7 +517,7 @@ class FileSearchTool(BaseTool):
         
         if not query_clean:
             print(f"[DEBUG] FileSearch: Empty query, returning no results")
-            return []
+            return {"results": [], "exhaustive": True}
         
         # File extension detection - map natural language to extensions
         extension_map = {
@@ -330,145 +564,83 @@ class FileSearchTool(BaseTool):
         print(f"[DEBUG] FileSearch: Filename keywords: {filename_keywords}")
         print(f"[DEBUG] FileSearch: Detected extensions: {detected_extensions}")
         
-        # Search in all locations
-        for location in self.search_locations:
-            print(f"[DEBUG] FileSearch: Searching in {location}")
-            try:
-                patterns = []
-                
-                if detected_extensions and filename_keywords:
-                    # We have both filename and extension: search for "keyword.ext"
-                    print(f"[DEBUG] FileSearch: Building patterns for filename + extension")
-                    for ext in detected_extensions:
-                        for keyword in filename_keywords:
-                            # Try different pattern combinations
-                            patterns.extend([
-                                f"*{keyword}*{ext}",  # apple.pdf, my_apple_file.pdf
-                                f"{keyword}*{ext}",   # apple.pdf, apple_report.pdf
-                                f"*{keyword}{ext}"    # myapple.pdf
-                            ])
-                
-                elif detected_extensions and not filename_keywords:
-                    # Only extension specified: search all files with that extension
-                    print(f"[DEBUG] FileSearch: Building patterns for extension only")
-                    for ext in detected_extensions:
-                        patterns.append(f"*{ext}")
-                
-                elif filename_keywords and not detected_extensions:
-                    # No extension detected, search by keywords only
-                    print(f"[DEBUG] FileSearch: Building patterns for filename only")
-                    for keyword in filename_keywords:
-                        patterns.extend([
-                            f"*{keyword}*",
-                            f"*{keyword}*.*",
-                            f"{keyword}*"
-                        ])
-                
-                else:
-                    # Fallback: use full query
-                    print(f"[DEBUG] FileSearch: Using fallback patterns")
+        if detected_extensions and all(kw in EXTENSION_QUERY_FILLER for kw in filename_keywords):
+            # Only a file type was asked for: newest files of that type
+            return self._search_extensions(detected_extensions, max_results, deadline, on_match)
+        
+        patterns = []
+        
+        if detected_extensions and filename_keywords:
+            # We have both filename and extension: search for "keyword.ext"
+            print(f"[DEBUG] FileSearch: Building patterns for filename + extension")
+            for ext in detected_extensions:
+                for keyword in filename_keywords:
+                    # Try different pattern combinations
                     patterns.extend([
-                        f"*{query_clean}*",
-                        f"*{query_clean}*.*"
+                        f"*{keyword}*{ext}",  # apple.pdf, my_apple_file.pdf
+                        f"{keyword}*{ext}",   # apple.pdf, apple_report.pdf
+                        f"*{keyword}{ext}"    # myapple.pdf
                     ])
-                
-                # Remove duplicate patterns
-                patterns = list(set(patterns))
-                
-                # Use os.walk for faster, controlled search
-                max_depth = 3
-                location_matches = 0
-                
-                try:
-                    for root, dirs, files in os.walk(location):
-                        # Limit depth
-                        depth = root[len(location):].count(os.sep)
-                        if depth >= max_depth:
-                            dirs[:] = []
-                            continue
-                        
-                        # Search files in current directory
-                        for filename in files:
-                            filename_lower = filename.lower()
-                            
-                            # Check if any pattern matches
-                            match_found = False
-                            for pattern in patterns:
-                                # Simple pattern matching without glob
-                                pattern_clean = pattern.replace('*', '').replace('?', '')
-                                if pattern_clean.lower() in filename_lower:
-                                    match_found = True
-                                    break
-                            
-                            if match_found:
-                                file_path = os.path.join(root, filename)
-                                try:
-                                    if os.path.isfile(file_path):
-                                        file_info = self._get_file_info(file_path)
-                                        
-                                        # Score by keyword matches
-                                        keyword_score = sum(1 for kw in filename_keywords if kw in filename_lower)
-                                        match_score = self._fuzzy_match(query_clean, file_info.name) + (keyword_score * 10)
-                                        
-                                        if match_score > 0:
-                                            location_matches += 1
-                                            print(f"[DEBUG] FileSearch: Match found: {file_info.name} (score: {match_score}, keywords: {keyword_score})")
-                                            results.append({
-                                                "file_info": file_info.dict(),
-                                                "match_score": match_score,
-                                                "location": location
-                                            })
-                                            
-                                            if location_matches >= 5:
-                                                break
-                                except Exception as e:
-                                    continue
-                        
-                        if location_matches >= 5:
-                            break
-                    
-                    print(f"[DEBUG] FileSearch: Found {location_matches} matches in {os.path.basename(location)}")
-                    
-                except Exception as e:
-                    print(f"[DEBUG] FileSearch: Error searching {location}: {str(e)}")
-                    continue
-                        
-            except Exception as e:
-                print(f"[DEBUG] FileSearch: Location error for {location}: {str(e)}")
-                continue
         
-        # Remove duplicates
-        unique_results = {}
-        for result in results:
-            file_path = result["file_info"]["path"]
-            if file_path not in unique_results or result["match_score"] > unique_results[file_path]["match_score"]:
-                unique_results[file_path] = result
+        elif filename_keywords and not detected_extensions:
+            # No extension detected, search by keywords only
+            print(f"[DEBUG] FileSearch: Building patterns for filename only")
+            for keyword in filename_keywords:
+                patterns.extend([
+                    f"*{keyword}*",
+                    f"*{keyword}*.*",
+                    f"{keyword}*"
+                ])
         
-        # Add modification time to results for recency sorting
-        for result in unique_results.values():
-            try:
-                file_path = result["file_info"]["path"]
-                mod_time = os.path.getmtime(file_path)
-                result["mod_time"] = mod_time
-            except:
-                result["mod_time"] = 0
-        
-        # Sort by match score first, then by recency (modification time)
-        # This ensures best matches appear first, but recent files are prioritized within same score
-        sorted_results = sorted(
-            unique_results.values(), 
-            key=lambda x: (x["match_score"], x["mod_time"]), 
-            reverse=True
+        else:
+            # Fallback: use full query
+            print(f"[DEBUG] FileSearch: Using fallback patterns")
+            patterns.extend([
+                f"*{query_clean}*",
+                f"*{query_clean}*.*"
+            ])
+        
+        # Remove duplicate patterns; simple substring matching without glob
+        patterns = list(set(patterns))
+        substrings = [pattern.replace('*', '').replace('?', '') for pattern in patterns]
+        substrings_lower = [substring.lower() for substring in substrings]
+        
+        # Misheard keywords also match their closest indexed filename tokens
+        corrections = self._typo_corrections(filename_keywords)
+        suffixes = tuple(detected_extensions)
+        substrings += [token for matches in corrections.values() for _, token in matches]
+        
+        fuzzy = FuzzyScorer(query_clean)
+        
+        def score_keywords(names):
+            typo_score = np.zeros(len(names))
+            if corrections:
+                typo_score = typo_credit(names, corrections)
+                if suffixes:
+                    typo_score = np.where(endswith_any(names, suffixes), typo_score, 0.0)
+            matched = contains_any(names, substrings_lower) | (typo_score > 0)
+            # Score by keyword matches
+            keyword_score = count_contains(names, filename_keywords) + typo_score
+            return np.where(matched, fuzzy(names) + keyword_score * 10, 0.0)
+        
+        return self._select_top_results(
+            substrings, score_keywords, max_results, deadline, on_match,
+            content_query=" ".join(filename_keywords),
+            content_extensions=detected_extensions
         )
-        final_results = sorted_results[:max_results]
+
+    def _search_extensions(self, extensions: List[str], max_results: int, deadline: float,
+                           on_match: Optional[Callable[[SearchCandidate], None]] = None) -> Dict[str, Any]:
+        """Most recently modified files with any of the extensions"""
+        extensions = sorted({ext.lower() for ext in extensions})
+        suffixes = tuple(extensions)
+        print(f"[DEBUG] FileSearch: Extension-only query for {extensions}")
         
-        print(f"[DEBUG] FileSearch: Final results: {len(final_results)} files")
-        for result in final_results:
-            mod_date = datetime.fromtimestamp(result['mod_time']).strftime('%Y-%m-%d %H:%M') if result.get('mod_time') else 'Unknown'
-            print(f"[DEBUG] FileSearch: - {result['file_info']['name']} (score: {result['match_score']}, modified: {mod_date})")
-            print(f"[DEBUG] FileSearch:   Location: {result['location']}")
+        def score_extension(names):
+            return endswith_any(names, suffixes).astype(float)
         
-        return final_results
+        return self._select_top_results(extensions, score_extension, max_results, deadline, on_match,
+                                        extensions=extensions)
 
 class FileOpenTool(BaseTool):
     """Cross-platform file opening tool"""
@@ -501,6 +673,8 @@ class FileOpenTool(BaseTool):
             else:  # Linux and others
                 subprocess.run(["xdg-open", file_path], check=True)
             
+            frecency_store.record(file_path, "open")
+            
             return {
                 "success": True,
                 "message": f"Successfully opened: {os.path.basename(file_path)}",
@@ -549,6 +723,8 @@ class FileShareTool(BaseTool):
             if recipient:
                 sharing_message += f"\n👤 For: {recipient}"
             
+            frecency_store.record(file_path, "share")
+            
             return {
                 "success": True,
                 "message": f"File prepared for sharing: {file_name}",
@@ -569,13 +745,17 @@ class FileShareTool(BaseTool):
 class FileSearchAgent:
     """LangGraph-powered FileSearch Agent"""
     
+    # Slots the command planner may pre-parse for process_command
+    slot_model = FileOperation
+    
     def __init__(self):
         # Initialize LLM
         self.llm = ChatGroq(
             groq_api_key=config.GROQ_API_KEY,
             model_name=config.GROQ_MODEL,
             temperature=config.AGENT_TEMPERATURE,
-            max_tokens=config.MAX_RESPONSE_TOKENS
+            max_tokens=config.MAX_RESPONSE_TOKENS,
+            cache=llm_cache
         )
         
         # Initialize tools
@@ -597,6 +777,11 @@ class FileSearchAgent:
                 if 'error' not in state:
                     state['error'] = None
                 
+                # Slots pre-parsed by the command planner replace the LLM parse
+                if state['parsed_command']:
+                    state['action_type'] = state['parsed_command'].get('operation', 'search')
+                    return state
+                
                 system_prompt = """You are a file operation parser. Extract the following from user input:
                 
                 OPERATIONS:
@@ -706,12 +891,16 @@ class FileSearchAgent:
                 recipient = state.get('parsed_command', {}).get('recipient', '')
                 
                 if operation == 'search':
-                    # Search for files
-                    results = self.search_tool._run(query, max_results=10)
+                    # Search for files (time-bounded; may return partial results)
+                    search = self.search_tool.search(query, max_results=10)
+                    results = search['results']
                     state['search_results'] = results
+                    state['search_exhaustive'] = search['exhaustive']
                     
                     if not results:
                         state['response_message'] = f"❌ No files found matching '{query}'. Try a different search term."
+                        if not search['exhaustive']:
+                            state['response_message'] += " (Search stopped at the time limit before covering every folder.)"
                     else:
                         # Format search results with location and recency info
                         result_text = f"🔍 Found {len(results)} file(s) matching '{query}':\n\n"
@@ -751,6 +940,9 @@ class FileSearchAgent:
                         if len(results) > 5:
                             result_text += f"... and {len(results) - 5} more files\n"
                         
+                        if not search['exhaustive']:
+                            result_text += "⏱️ Search time limit reached - these are the best matches found so far.\n"
+                        
                         result_text += "💡 Say 'Open [filename]' to open a specific file!"
                         state['response_message'] = result_text
                 
@@ -840,16 +1032,17 @@ class FileSearchAgent:
         
         return workflow.compile()
     
-    def process_command(self, user_input: str) -> Dict[str, Any]:
+    def process_command(self, user_input: str, slots: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Process file command using LangGraph workflow"""
         try:
             # Initialize state
             initial_state: FileSearchState = {
                 'user_input': user_input,
-                'parsed_command': {},
+                'parsed_command': dict(slots or {}),
                 'search_results': [],
                 'selected_file': None,
                 'action_type': '',
+                'search_exhaustive': True,
                 'response_message': '',
                 'error': None
             }
@@ -862,6 +1055,7 @@ class FileSearchAgent:
                 "message": result.get('response_message', ''),
                 "action_type": result.get('action_type', ''),
                 "search_results": result.get('search_results', []),
+                "search_exhaustive": result.get('search_exhaustive', True),
                 "selected_file": result.get('selected_file'),
                 "parsed_command": result.get('parsed_command', {}),
                 "error": result.get('error')
@@ -879,4 +1073,4 @@ class FileSearchAgent:
             }
 
 # Global agent instance
-filesearch_agent = FileSearchAgent()
\ No newline at end of file
+filesearch_agent = FileSearchAgent()
@@ -9,6 +9,9 @@ from langchain.schema import HumanMessage, SystemMessage
 from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph, END
 from config import config
+from utils.frecency_store import frecency_store
+from utils.intent_matcher import IntentMatches, MULTI_TASK_PREFIX
+from utils.llm_cache import llm_cache
 
 class WorkflowState(TypedDict):
     """State for multi-task workflow"""
@@ -36,59 +39,30 @@ class MultiTaskOrchestrator:
             groq_api_key=config.GROQ_API_KEY,
             model_name=config.GROQ_MODEL,
             temperature=config.AGENT_TEMPERATURE,
-            max_tokens=config.MAX_RESPONSE_TOKENS
+            max_tokens=config.MAX_RESPONSE_TOKENS,
+            cache=llm_cache
         )
     
-    def detect_multi_task(self, user_input: str) -> bool:
+    def detect_multi_task(self, user_input: str, matches: Optional[IntentMatches] = None) -> bool:
         """
         Detect if input requires multiple agents
         
         Args:
             user_input: User command
+            matches: Intent matches for user_input, if already computed
         
         Returns:
             bool: True if multi-task detected
         """
-        user_input_lower = user_input.lower()
+        if matches is None:
+            matches = self.agent_manager.intent_matcher.match(user_input)
         
         # Patterns indicating multi-task workflows
-        multi_task_patterns = [
-            # File + Communication
-            r"(find|search|open|get).*(?:file|document|pdf|photo).*(?:send|share|email|whatsapp)",
-            r"(send|share|email|whatsapp).*(file|document|pdf|photo)",
-            
-            # Screenshot + Communication
-            r"(take|capture).*screenshot.*(?:send|share|email|whatsapp)",
-            r"screenshot.*(?:and|then).*(?:send|share|email)",
-            
-            # Sequential actions with "and then" or "and"
-            r".*\s+and\s+(then\s+)?(?:send|email|call|message|whatsapp)",
-            
-            # Multiple actions explicitly stated
-            r"(first|then|after that|next)",
-        ]
-        
-        # Check patterns
-        for pattern in multi_task_patterns:
-            if re.search(pattern, user_input_lower):
-                return True
-        
-        # Check for multiple agent keywords
-        agent_keywords = {
-            "filesearch": ["find", "search", "file", "document", "pdf", "photo"],
-            "whatsapp": ["whatsapp", "message", "send message"],
-            "email": ["email", "send email", "mail"],
-            "screenshot": ["screenshot", "capture screen", "take screenshot"],
-            "phone": ["call", "phone", "dial"],
-        }
-        
-        detected_agents = []
-        for agent, keywords in agent_keywords.items():
-            if any(keyword in user_input_lower for keyword in keywords):
-                detected_agents.append(agent)
+        if matches.has("multi_task"):
+            return True
         
         # If 2+ agents detected, it's multi-task
-        return len(detected_agents) >= 2
+        return len(matches.labels(MULTI_TASK_PREFIX)) >= 2
     
     def parse_workflow(self, user_input: str) -> List[Dict[str, Any]]:
         """
@@ -213,6 +187,18 @@ Rules:
             print(f"[ERROR] AI workflow parsing failed: {e}")
             return []
     
+    @staticmethod
+    def _result_file_path(result: Dict[str, Any]) -> str:
+        """Path of the file a filesearch task settled on (selected file, else best match)"""
+        if result.get('file_path'):
+            return result['file_path']
+        if result.get('selected_file'):
+            return result['selected_file'].get('path', '')
+        search_results = result.get('search_results') or []
+        if search_results:
+            return search_results[0].get('file_info', {}).get('path', '')
+        return ''
+    
     def execute_workflow(self, user_input: str) -> Dict[str, Any]:
         """
         Execute multi-task workflow
@@ -272,10 +258,14 @@ Rules:
                         extract_key = task['extract']
                         # Simple extraction - would need better logic
                         if 'file_path' in extract_key and result.get('success'):
-                            shared_data[extract_key] = result.get('file_path', '')
+                            shared_data[extract_key] = self._result_file_path(result)
                         elif 'screenshot_path' in extract_key and result.get('success'):
                             shared_data[extract_key] = result.get('path', '')
                     
+                    # A file sent on to someone counts as a use of that file
+                    if task.get('use_previous') == 'file_path' and result.get('success') and shared_data.get('file_path'):
+                        frecency_store.record(shared_data['file_path'], "share")
+                    
                     # If task failed, stop workflow
                     if not result.get('success'):
                         return {
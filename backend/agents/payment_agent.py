@@ -15,6 +15,7 @@ from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph, END
 from pydantic import BaseModel, Field
 from config import config
+from utils.llm_cache import llm_cache
 
 class PaymentRequest(BaseModel):
     """Payment request structure"""
@@ -104,13 +105,17 @@ class PaymentTool(BaseTool):
 class PaymentAgent:
     """LangGraph-powered Payment Agent"""
     
+    # Slots the command planner may pre-parse for process_command
+    slot_model = PaymentRequest
+    
     def __init__(self):
         # Initialize LLM
         self.llm = ChatGroq(
             groq_api_key=config.GROQ_API_KEY,
             model_name=config.GROQ_MODEL,
             temperature=config.AGENT_TEMPERATURE,
-            max_tokens=config.MAX_RESPONSE_TOKENS
+            max_tokens=config.MAX_RESPONSE_TOKENS,
+            cache=llm_cache
         )
         
         # Initialize tools
@@ -126,6 +131,10 @@ class PaymentAgent:
         def parse_command_node(state: AgentState) -> AgentState:
             """Parse user command to extract payment details"""
             try:
+                # Slots pre-parsed by the command planner replace the LLM parse
+                if state['parsed_command']:
+                    return state
+                
                 user_input = state['user_input']
                 
                 # Use LLM to extract payment components
@@ -279,12 +288,12 @@ class PaymentAgent:
         
         return 'paypal'  # Default
     
-    def process_command(self, user_input: str) -> Dict[str, Any]:
+    def process_command(self, user_input: str, slots: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Process payment command and return result"""
         try:
             initial_state = {
                 "user_input": user_input,
-                "parsed_command": {},
+                "parsed_command": dict(slots or {}),
                 "payment_url": "",
                 "response_message": "",
                 "error": None
@@ -15,6 +15,7 @@ from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph, END
 from pydantic import BaseModel, Field
 from config import config
+from utils.llm_cache import llm_cache
 
 class PhoneCall(BaseModel):
     """Phone call structure"""
@@ -93,13 +94,17 @@ class PhoneDialerTool(BaseTool):
 class PhoneAgent:
     """LangGraph-powered Phone Agent"""
     
+    # Slots the command planner may pre-parse for process_command
+    slot_model = PhoneCall
+    
     def __init__(self):
         # Initialize LLM
         self.llm = ChatGroq(
             groq_api_key=config.GROQ_API_KEY,
             model_name=config.GROQ_MODEL,
             temperature=config.AGENT_TEMPERATURE,
-            max_tokens=config.MAX_RESPONSE_TOKENS
+            max_tokens=config.MAX_RESPONSE_TOKENS,
+            cache=llm_cache
         )
         
         # Initialize tools
@@ -116,6 +121,10 @@ class PhoneAgent:
         def parse_command_node(state: AgentState) -> AgentState:
             """Parse user command to extract contact/phone info"""
             try:
+                # Slots pre-parsed by the command planner replace the regex parse
+                if state['parsed_command']:
+                    return state
+                
                 user_input = state['user_input']
                 
                 # Extract contact name or phone number
@@ -240,12 +249,12 @@ class PhoneAgent:
             return re.sub(r'[^\d+]', '', match.group(0))
         return ""
     
-    def process_command(self, user_input: str) -> Dict[str, Any]:
+    def process_command(self, user_input: str, slots: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Process phone command and return result"""
         try:
             initial_state = {
                 "user_input": user_input,
-                "parsed_command": {},
+                "parsed_command": dict(slots or {}),
                 "contact_info": {},
                 "call_url": "",
                 "response_message": "",
@@ -13,6 +13,7 @@ from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph, END
 from pydantic import BaseModel
 from config import config
+from utils.llm_cache import llm_cache
 
 # Try to import PIL - if not available, fallback to subprocess methods
 try:
@@ -179,7 +180,8 @@ class ScreenshotAgent:
             groq_api_key=config.GROQ_API_KEY,
             model_name=config.GROQ_MODEL,
             temperature=config.AGENT_TEMPERATURE,
-            max_tokens=config.MAX_RESPONSE_TOKENS
+            max_tokens=config.MAX_RESPONSE_TOKENS,
+            cache=llm_cache
         )
         
         self.screenshot_tool = ScreenshotTool()
@@ -14,6 +14,7 @@ from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph, END
 from pydantic import BaseModel
 from config import config
+from utils.llm_cache import llm_cache
 
 # Try to import pycaw for Windows volume control
 try:
@@ -444,7 +445,8 @@ class SystemControlAgent:
             groq_api_key=config.GROQ_API_KEY,
             model_name=config.GROQ_MODEL,
             temperature=config.AGENT_TEMPERATURE,
-            max_tokens=config.MAX_RESPONSE_TOKENS
+            max_tokens=config.MAX_RESPONSE_TOKENS,
+            cache=llm_cache
         )
         
         self.system_tool = SystemControlTool()
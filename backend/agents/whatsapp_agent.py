@@ -13,6 +13,7 @@ from langgraph.graph import StateGraph, END
 # ToolExecutor not needed - using direct tool calls
 from pydantic import BaseModel, Field
 from config import config
+from utils.llm_cache import llm_cache
 
 class WhatsAppMessage(BaseModel):
     """WhatsApp message structure"""
@@ -73,13 +74,17 @@ class WhatsAppURLTool(BaseTool):
 class WhatsAppAgent:
     """LangGraph-powered WhatsApp Agent"""
     
+    # Slots the command planner may pre-parse for process_command
+    slot_model = WhatsAppMessage
+    
     def __init__(self):
         # Initialize LLM
         self.llm = ChatGroq(
             groq_api_key=config.GROQ_API_KEY,
             model_name=config.GROQ_MODEL,
             temperature=config.AGENT_TEMPERATURE,
-            max_tokens=config.MAX_RESPONSE_TOKENS
+            max_tokens=config.MAX_RESPONSE_TOKENS,
+            cache=llm_cache
         )
         
         # Initialize tools
@@ -101,6 +106,10 @@ class WhatsAppAgent:
                     state['parsed_command'] = {}
                 if 'error' not in state:
                     state['error'] = None
+                
+                # Slots pre-parsed by the command planner replace the parse
+                if state['parsed_command']:
+                    return state
                     
                 user_input = state['user_input'].strip()
                 
@@ -305,13 +314,13 @@ class WhatsAppAgent:
         
         return workflow.compile()
     
-    def process_command(self, user_input: str) -> Dict[str, Any]:
+    def process_command(self, user_input: str, slots: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Process WhatsApp command using LangGraph workflow"""
         try:
             # Initialize state with proper structure
             initial_state: AgentState = {
                 'user_input': user_input,
-                'parsed_command': {},
+                'parsed_command': dict(slots or {}),
                 'contact_info': {},
                 'whatsapp_url': '',
                 'response_message': '',
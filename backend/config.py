@@ -33,6 +33,18 @@ class Config:
     # Agent Configuration
     AGENT_TEMPERATURE: float = float(os.getenv("AGENT_TEMPERATURE", "0.1"))
     MAX_RESPONSE_TOKENS: int = int(os.getenv("MAX_RESPONSE_TOKENS", "1000"))
+    PRE_ROUTER_ENABLED: bool = os.getenv("PRE_ROUTER_ENABLED", "true").lower() == "true"
+    PRE_ROUTER_THRESHOLD: float = float(os.getenv("PRE_ROUTER_THRESHOLD", "0.75"))  # below this, AI enhancement runs
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_DIR: str = os.getenv("LLM_CACHE_DIR", "llm_cache")
+    LLM_CACHE_MEMORY_ENTRIES: int = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256"))
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))  # on disk
+    LLM_CACHE_TTL: float = float(os.getenv("LLM_CACHE_TTL", "604800"))  # seconds
+    PLANNER_ENABLED: bool = os.getenv("PLANNER_ENABLED", "false").lower() == "true"
+    SEMANTIC_CACHE_ENABLED: bool = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+    SEMANTIC_CACHE_FILE: str = os.getenv("SEMANTIC_CACHE_FILE", "semantic_cache.json")
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.75"))  # cosine similarity
+    SEMANTIC_CACHE_MAX_ENTRIES: int = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "1000"))
     
     # MongoDB Configuration
     MONGODB_URL: str = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
@@ -71,6 +83,25 @@ class Config:
     # File Search Configuration
     SEARCH_DIRECTORIES: str = os.getenv("SEARCH_DIRECTORIES", "C:\\Users,C:\\Documents,C:\\Downloads")
     MAX_SEARCH_RESULTS: int = int(os.getenv("MAX_SEARCH_RESULTS", "10"))
+    FILE_INDEX_ENABLED: bool = os.getenv("FILE_INDEX_ENABLED", "true").lower() == "true"
+    FILE_INDEX_FILE: str = os.getenv("FILE_INDEX_FILE", "file_index.idx")
+    FILE_SEARCH_TIME_BUDGET: float = float(os.getenv("FILE_SEARCH_TIME_BUDGET", "8.0"))  # seconds per search
+    FILE_SEARCH_PRUNE_DEFAULTS: bool = os.getenv("FILE_SEARCH_PRUNE_DEFAULTS", "true").lower() == "true"
+    FILE_SEARCH_PRUNE: str = os.getenv("FILE_SEARCH_PRUNE", "")  # extra comma-separated prune patterns
+    FILE_SEARCH_PRUNE_FILE: str = os.getenv("FILE_SEARCH_PRUNE_FILE", ".searchignore")
+    FILE_SEARCH_CACHE_SIZE: int = int(os.getenv("FILE_SEARCH_CACHE_SIZE", "128"))
+    FILE_SEARCH_CACHE_TTL: float = float(os.getenv("FILE_SEARCH_CACHE_TTL", "300"))  # seconds
+    CONTENT_INDEX_ENABLED: bool = os.getenv("CONTENT_INDEX_ENABLED", "true").lower() == "true"
+    CONTENT_INDEX_FILE: str = os.getenv("CONTENT_INDEX_FILE", "content_index.json")
+    CONTENT_INDEX_WORKERS: int = int(os.getenv("CONTENT_INDEX_WORKERS", "2"))
+    FRECENCY_STORE_FILE: str = os.getenv("FRECENCY_STORE_FILE", "frecency.json")
+    FRECENCY_HALF_LIFE_DAYS: float = float(os.getenv("FRECENCY_HALF_LIFE_DAYS", "14"))
+    FRECENCY_MAX_ENTRIES: int = int(os.getenv("FRECENCY_MAX_ENTRIES", "2000"))
+    PREVIEW_CACHE_DIR: str = os.getenv("PREVIEW_CACHE_DIR", "preview_cache")
+    PREVIEW_CACHE_MAX_MB: int = int(os.getenv("PREVIEW_CACHE_MAX_MB", "200"))
+    PREVIEW_THUMBNAIL_SIZE: int = int(os.getenv("PREVIEW_THUMBNAIL_SIZE", "256"))  # pixels, longest side
+    PREVIEW_WORKERS: int = int(os.getenv("PREVIEW_WORKERS", "2"))
+    FILE_TOKEN_TTL: float = float(os.getenv("FILE_TOKEN_TTL", "900"))  # seconds a download link stays valid
     
     # Task Configuration
     TASK_STORAGE: str = os.getenv("TASK_STORAGE", "local")
@@ -4,9 +4,10 @@ Enhanced with Real Functionality: Voice Recognition, File Access, and Agent Coor
 """
 
 import os
+import re
+import fnmatch
 import logging
 import json
-import glob
 import platform
 import subprocess
 import asyncio
@@ -18,6 +19,8 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 import uvicorn
 
+from utils.file_crawler import file_crawler
+
 # JSON serialization helper function
 def json_serializable(obj):
     """Convert objects to JSON serializable format"""
@@ -149,36 +152,35 @@ class EnhancedFileManager:
                         f"{query}*.{file_type}"
                     ])
             
-            for location in self.search_locations:
-                try:
-                    for pattern in patterns:
-                        matches = glob.glob(os.path.join(location, '**', pattern), recursive=True)
-                        
-                        for match in matches[:10]:  # Limit to 10 per location
-                            if os.path.isfile(match):
-                                file_info = {
-                                    'name': os.path.basename(match),
-                                    'path': match,
-                                    'size': os.path.getsize(match),
-                                    'modified': datetime.fromtimestamp(os.path.getmtime(match)).isoformat(),
-                                    'extension': os.path.splitext(match)[1],
-                                    'location': os.path.dirname(match)
-                                }
-                                
-                                # Avoid duplicates
-                                if not any(r['path'] == file_info['path'] for r in results):
-                                    results.append(file_info)
-                except Exception as e:
-                    logger.warning(f"Search error in {location}: {e}")
-                    continue
+            # One compiled matcher tests every pattern in a single pass
+            matcher = re.compile('|'.join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns))
+            seen = set()
+            
+            try:
+                # Single concurrent traversal of all locations
+                for entry in file_crawler.iter_files(self.search_locations):
+                    if entry.path in seen or not matcher.match(entry.name.lower()):
+                        continue
+                    seen.add(entry.path)
+                    # mtime is captured once from the crawl and reused for sorting
+                    results.append((entry.mtime, {
+                        'name': entry.name,
+                        'path': entry.path,
+                        'size': entry.size,
+                        'modified': datetime.fromtimestamp(entry.mtime).isoformat(),
+                        'extension': os.path.splitext(entry.name)[1],
+                        'location': os.path.dirname(entry.path)
+                    }))
+            except Exception as e:
+                logger.warning(f"Search error: {e}")
             
             # Sort by relevance (name match first, then modified date)
             results.sort(key=lambda x: (
-                not query in x['name'].lower(),
-                -os.path.getmtime(x['path'])
+                not query in x[1]['name'].lower(),
+                -x[0]
             ))
             
-            return results[:15]  # Return top 15 results
+            return [file_info for _, file_info in results[:15]]  # Return top 15 results
             
         except Exception as e:
             logger.error(f"File search error: {e}")
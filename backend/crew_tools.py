@@ -4,7 +4,8 @@ Specialized tools for WhatsApp, File Management, and System Operations
 """
 
 import os
-import glob
+import re
+import fnmatch
 import platform
 import subprocess
 import mimetypes
@@ -14,6 +15,7 @@ from datetime import datetime
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 from typing import Type
+from utils.file_crawler import file_crawler
 
 class WhatsAppInputSchema(BaseModel):
     """Input schema for WhatsApp tool"""
@@ -128,26 +130,22 @@ class AdvancedFileSearchTool(BaseTool):
         results = []
         query_lower = query.lower()
         
-        for location in locations:
-            try:
-                patterns = [
-                    f"*{query}*",
-                    f"*{query}*.*",
-                    f"{query}*",
-                    f"*.{query}"
-                ]
-                
-                for pattern in patterns:
-                    search_pattern = os.path.join(location, '**', pattern)
-                    matches = glob.glob(search_pattern, recursive=True)
-                    
-                    for match in matches:
-                        if os.path.isfile(match):
-                            file_info = self._get_file_info(match)
-                            if self._fuzzy_match(query_lower, file_info['name'].lower()) > 0:
-                                results.append(file_info)
-            except Exception:
-                continue
+        patterns = [
+            f"*{query_lower}*",
+            f"*{query_lower}*.*",
+            f"{query_lower}*",
+            f"*.{query_lower}"
+        ]
+        matcher = re.compile('|'.join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns))
+        
+        try:
+            # One pruned traversal of all locations (skips .git, node_modules, caches, ...)
+            for entry in file_crawler.iter_files(locations):
+                name_lower = entry.name.lower()
+                if matcher.match(name_lower) and self._fuzzy_match(query_lower, name_lower) > 0:
+                    results.append(self._get_file_info(entry.path))
+        except Exception:
+            pass
         
         if not results:
             return f"❌ No files found matching '{query}'"
@@ -171,14 +169,12 @@ class AdvancedFileSearchTool(BaseTool):
         files = []
         query_lower = query.lower()
         
-        for location in locations:
-            try:
-                for root, dirs, filenames in os.walk(location):
-                    for filename in filenames:
-                        if self._fuzzy_match(query_lower, filename.lower()) > 0.7:
-                            files.append(os.path.join(root, filename))
-            except Exception:
-                continue
+        try:
+            for entry in file_crawler.iter_files(locations):
+                if self._fuzzy_match(query_lower, entry.name.lower()) > 0.7:
+                    files.append(entry.path)
+        except Exception:
+            pass
         
         if not files:
             return f"❌ File '{query}' not found"
@@ -5,18 +5,27 @@ Main server handling voice/text commands and agent coordination
 
 from fastapi import FastAPI, HTTPException, File, UploadFile, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Dict, Any, Optional, Set
+from typing import Dict, Any, List, Optional, Set
 import uvicorn
 import logging
 import json
 import asyncio
+import time
+import os
+import mimetypes
 from datetime import datetime
 
 from config import config
 from agents.agent_manager import agent_manager
+from agents.filesearch_agent import filesearch_agent
 from utils.enhanced_speech_processor import enhanced_speech_processor
+from utils.file_index import file_index
+from utils.content_index import content_index
+from utils.preview_service import preview_service
+from utils.file_tokens import file_tokens
+from utils.zip_stream import stream_zip, unique_arcnames
 
 # JSON serialization helper function
 def json_serializable(obj):
@@ -64,10 +73,20 @@ async def startup_event():
     if not config.validate_config():
         logger.warning("⚠️  Configuration validation failed. Some features may not work.")
     
+    # File, content and filename indexes (never started in pool workers, which re-import this module)
+    filesearch_agent.search_tool.start_indexing()
+    
     logger.info("✅ Vaani AI Assistant started successfully!")
     logger.info("🤖 Available agents: WhatsApp, FileSearch, Conversation")
     logger.info("🎯 Enhanced NLP and multi-agent workflows ready!")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Persist the file and content indexes and stop their watchers and workers"""
+    preview_service.stop()
+    content_index.stop()
+    file_index.stop()
+
 # Pydantic models for request/response
 class CommandRequest(BaseModel):
     """Request model for text commands"""
@@ -94,6 +113,30 @@ class TTSResponse(BaseModel):
     message: str
     timestamp: str
 
+class FileSuggestion(BaseModel):
+    """A filename suggestion for search-as-you-type"""
+    name: str
+    path: str
+    size: int
+    mod_time: float
+
+class FileSuggestResponse(BaseModel):
+    """Response model for filename suggestions"""
+    query: str
+    suggestions: List[FileSuggestion]
+    took_ms: float
+
+class FilePreviewResponse(BaseModel):
+    """Response model for a search result preview"""
+    path: str
+    name: str
+    kind: str  # image, pdf, document
+    snippet: str
+    thumbnail_url: Optional[str] = None
+    width: int = 0
+    height: int = 0
+    cached: bool
+
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str
@@ -162,6 +205,15 @@ async def process_command(request: CommandRequest):
         if agent_response is None:
             agent_response = {}
         
+        # Found files can be downloaded by token
+        file_results = agent_response.get("search_results", [])
+        for file_result in file_results:
+            _attach_download(file_result, file_result.get("file_info", {}).get("path"))
+        selected_file = agent_response.get("selected_file")
+        if selected_file:
+            _attach_download(selected_file, selected_file.get("path"))
+        bundle_url = _bundle_url(file_results)
+        
         # Enhanced response structure with safe access
         response = CommandResponse(
             success=result["success"],
@@ -175,10 +227,11 @@ async def process_command(request: CommandRequest):
                 "error": result.get("error"),
                 "workflow": result.get("workflow"),
                 "conversation_context": result.get("conversation_context"),
-                "file_results": agent_response.get("search_results", []),
-                "selected_file": agent_response.get("selected_file"),
+                "file_results": file_results,
+                "selected_file": selected_file,
                 "action_type": agent_response.get("action_type"),
-                "whatsapp_url": result.get("whatsapp_url") or agent_response.get("whatsapp_url")
+                "whatsapp_url": result.get("whatsapp_url") or agent_response.get("whatsapp_url"),
+                "bundle_url": bundle_url
             }
         )
         
@@ -349,6 +402,125 @@ async def get_config():
         logger.error(f"Error getting config: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/files/suggest", response_model=FileSuggestResponse)
+async def suggest_files(q: str = "", limit: int = 8):
+    """
+    Search-as-you-type filename suggestions from the sorted word starts in
+    the file index snapshot; no LLM is involved
+    """
+    start = time.perf_counter()
+    limit = max(1, min(limit, 50))
+    suggestions = [FileSuggestion(**item) for item in file_index.suggest(q, limit)]
+    return FileSuggestResponse(
+        query=q,
+        suggestions=suggestions,
+        took_ms=round((time.perf_counter() - start) * 1000, 3)
+    )
+
+@app.get("/files/preview", response_model=FilePreviewResponse)
+async def preview_file(token: str, size: Optional[int] = None):
+    """
+    Thumbnail and text snippet for an image or document search result,
+    given by its download token
+    
+    Rendered in a process pool on first request and cached on disk by
+    path and mtime; the thumbnail itself is fetched from thumbnail_url.
+    """
+    path = file_tokens.resolve(token)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired file token")
+    if size is not None:
+        size = max(32, min(size, 1024))
+    
+    try:
+        preview = await asyncio.to_thread(preview_service.get_preview, path, size)
+    except Exception as e:
+        logger.error(f"Error rendering preview: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if preview is None:
+        raise HTTPException(status_code=404, detail="No preview available for this file")
+    if preview.get("error"):
+        raise HTTPException(status_code=422, detail=preview["error"])
+    
+    return FilePreviewResponse(
+        path=path,
+        name=os.path.basename(path),
+        kind=preview["kind"],
+        snippet=preview["snippet"],
+        thumbnail_url=f"/files/preview/{preview['key']}.jpg" if preview["thumbnail"] else None,
+        width=preview["width"],
+        height=preview["height"],
+        cached=preview["cached"]
+    )
+
+@app.get("/files/preview/{key}.jpg")
+async def preview_thumbnail(key: str):
+    """Cached thumbnail; the key changes whenever the file does, so it is cacheable forever"""
+    thumbnail = preview_service.thumbnail_path(key)
+    if thumbnail is None:
+        raise HTTPException(status_code=404, detail="Thumbnail not found")
+    return FileResponse(thumbnail, media_type="image/jpeg",
+                        headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
+# Files one bundle may hold
+MAX_BUNDLE_FILES = 500
+
+@app.get("/files/bundle")
+async def download_bundle(tokens: str, name: str = "files"):
+    """
+    Stream a ZIP of several search results, given their download tokens
+    (comma-separated)
+    
+    The archive is built while it is sent: no temporary file, and memory
+    stays bounded by one chunk however large the bundle is.
+    """
+    token_list = [token for token in tokens.split(",") if token]
+    if not token_list:
+        raise HTTPException(status_code=400, detail="At least one file token is required")
+    if len(token_list) > MAX_BUNDLE_FILES:
+        raise HTTPException(status_code=400, detail=f"A bundle holds at most {MAX_BUNDLE_FILES} files")
+    
+    paths = []
+    for token in dict.fromkeys(token_list):
+        path = file_tokens.resolve(token)
+        if path is None:
+            raise HTTPException(status_code=404, detail="Unknown or expired file token")
+        paths.append(path)
+    
+    filename = "".join(c for c in name if c.isalnum() or c in " ._-").strip() or "files"
+    return StreamingResponse(
+        stream_zip(unique_arcnames(paths)),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}.zip"'}
+    )
+
+@app.get("/files/{token}")
+async def download_file(token: str, download: bool = False):
+    """
+    Stream a search result by its download token
+    
+    Range and If-Range requests are answered with 206 partial content, the
+    file is sent in fixed-size chunks rather than read into memory, and
+    servers that support the ASGI pathsend extension send it zero-copy.
+    """
+    path = file_tokens.resolve(token)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired file token")
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        raise HTTPException(status_code=404, detail="File no longer exists")
+    
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    return FileResponse(
+        path,
+        stat_result=stat_result,
+        media_type=media_type,
+        filename=os.path.basename(path),
+        content_disposition_type="attachment" if download else "inline"
+    )
+
 # WebSocket Manager for real-time communication
 class WebSocketManager:
     def __init__(self):
@@ -390,6 +562,121 @@ class WebSocketManager:
 # Initialize WebSocket manager
 ws_manager = WebSocketManager()
 
+def _attach_download(result: Dict[str, Any], path: Optional[str]):
+    """Add a short-lived download token and URL for path to a result dict"""
+    if path:
+        token = file_tokens.issue(path)
+        result["token"] = token
+        result["download_url"] = f"/files/{token}"
+
+def _bundle_url(results: List[Dict[str, Any]]) -> Optional[str]:
+    """ZIP download link for results that already carry tokens, when there are several"""
+    tokens = [result["token"] for result in results if result.get("token")]
+    if len(tokens) < 2:
+        return None
+    return "/files/bundle?tokens=" + ",".join(tokens)
+
+def _search_result_frame(search_id: str, file_info: Dict[str, Any], match_score: float,
+                         location: str, mod_time: Optional[float]) -> dict:
+    """
+    Shape one file match for the WebSocket client
+
+    Streamed matches may drop out of the running top results, so they
+    carry no download token; the ranked results in search_complete do.
+    """
+    data = {
+        "name": file_info.get("name"),
+        "path": file_info.get("path"),
+        "size": file_info.get("size"),
+        "mod_time": mod_time,
+        "match_score": match_score,
+        "location": location
+    }
+    return {
+        "type": "search_result",
+        "search_id": search_id,
+        "data": data,
+        "timestamp": datetime.now().isoformat()
+    }
+
+async def stream_file_search(websocket: WebSocket, message: dict):
+    """
+    Run a file search and push each match to the client as it is found,
+    followed by a final search_complete frame with the ranked results
+    """
+    query = message.get("query", "").strip()
+    search_id = message.get("search_id") or "search_" + datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+    error = None
+    try:
+        max_results = max(1, min(int(message.get("max_results", 10)), 50))
+    except (TypeError, ValueError):
+        error = "max_results must be a number"
+    if not query:
+        error = "Search query is required"
+
+    if error:
+        await ws_manager.send_message(websocket, {
+            "type": "error",
+            "search_id": search_id,
+            "message": error,
+            "timestamp": datetime.now().isoformat()
+        })
+        return
+
+    search_tool = filesearch_agent.search_tool
+    loop = asyncio.get_running_loop()
+    frames: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    def on_match(candidate):
+        # Called from the search thread; hand the frame to the event loop
+        frame = _search_result_frame(
+            search_id,
+            {"name": candidate.name, "path": candidate.path, "size": candidate.entry.size},
+            candidate.score,
+            candidate.location,
+            candidate.mtime
+        )
+        loop.call_soon_threadsafe(frames.put_nowait, frame)
+
+    def run_search():
+        try:
+            return search_tool.search(query, max_results=max_results, on_match=on_match)
+        finally:
+            loop.call_soon_threadsafe(frames.put_nowait, done)
+
+    search_task = asyncio.create_task(asyncio.to_thread(run_search))
+
+    while True:
+        frame = await frames.get()
+        if frame is done:
+            break
+        await ws_manager.send_message(websocket, frame)
+
+    try:
+        outcome = await search_task
+        results = outcome["results"]
+        for result in results:
+            _attach_download(result, result["file_info"]["path"])
+        complete = {
+            "success": True,
+            "results": results,
+            "exhaustive": outcome["exhaustive"],
+            "count": len(results),
+            "bundle_url": _bundle_url(results)
+        }
+    except Exception as e:
+        logger.error(f"❌ Streaming search failed: {e}")
+        complete = {"success": False, "error": str(e), "results": [], "count": 0}
+
+    await ws_manager.send_message(websocket, {
+        "type": "search_complete",
+        "search_id": search_id,
+        "data": complete,
+        "timestamp": datetime.now().isoformat()
+    })
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time communication"""
@@ -428,6 +715,10 @@ async def websocket_endpoint(websocket: WebSocket):
                             "results": result.details or {}
                         }
                     })
+            
+            elif message.get("type") == "search_files":
+                # Matches are pushed as search_result frames while the search runs
+                await stream_file_search(websocket, message)
     
     except WebSocketDisconnect:
         ws_manager.disconnect(websocket)
@@ -0,0 +1,119 @@
+"""
+Quick Test Script for the File Index
+Builds an index over a temporary folder and checks the compact snapshot,
+its trigram and word-prefix lookups, the change journal, filename
+suggestions and the search result cache
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+from utils.compact_index import CompactIndex
+from utils.file_index import FileIndex
+from utils.query_cache import QueryCache
+
+failures = 0
+
+
+def check(description: str, passed: bool):
+    global failures
+    print(f"{'✅' if passed else '❌'} {description}")
+    if not passed:
+        failures += 1
+
+
+def touch(path: str, mtime: float, content: str = ""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+    os.utime(path, (mtime, mtime))
+
+
+def names(entries) -> list:
+    return sorted(entry.name for entry in entries)
+
+
+work_dir = tempfile.mkdtemp()
+root = os.path.join(work_dir, "Documents")
+touch(os.path.join(root, "quarterly_summary.pdf"), 1000)
+touch(os.path.join(root, "Résumé.docx"), 1001)
+touch(os.path.join(root, "ab.txt"), 1002)
+for i in range(20):
+    touch(os.path.join(root, "reports", f"quarterly_report_{i}.pdf"), 2000 + i)
+index_file = os.path.join(work_dir, "file_index.idx")
+
+try:
+    print("--- Compact snapshot ---")
+    index = FileIndex(index_file, save_delay=0.1)
+    index.ensure_indexed([root], background=False)
+    check("snapshot written", os.path.exists(index_file) and index.snapshot_id is not None)
+    check("trigram lookup", names(index.find(root, ["summary"])) == ["quarterly_summary.pdf"])
+    check("trigram lookup is case-insensitive and utf-8 safe", names(index.find(root, ["RÉSUM"])) == ["Résumé.docx"])
+    check("short substrings scan the names", names(index.find(root, ["ab"])) == ["ab.txt"])
+    check("no trigram hit means no rows", index.find(root, ["zzz"]) == [])
+    check("unindexed root returns None", index.find(os.path.join(work_dir, "other"), ["a"]) is None)
+    newest = index.recent_by_extension(root, [".pdf"], 3)
+    check("newest files by extension", [entry.name for entry in newest] ==
+          ["quarterly_report_19.pdf", "quarterly_report_18.pdf", "quarterly_report_17.pdf"])
+
+    mapped = CompactIndex(index_file)
+    rows = list(mapped.find_substring(root, "report_1"))
+    check("find_substring maps trigram hits back to rows",
+          sorted(mapped.name(row) for row in rows) == sorted(
+              [f"quarterly_report_{i}.pdf" for i in [1] + list(range(10, 20))]))
+    check("word_prefix_rows matches word starts only",
+          [mapped.name(int(row)) for row in mapped.word_prefix_rows("sum")] == ["quarterly_summary.pdf"]
+          and len(mapped.word_prefix_rows("ummary")) == 0)
+    mapped.close()
+
+    print("\n--- Journal and overlay ---")
+    new_file = os.path.join(root, "zebra_notes.txt")
+    touch(new_file, 3000)
+    index.update_file(root, new_file)
+    deleted = os.path.join(root, "ab.txt")
+    os.remove(deleted)
+    index.remove_path(root, deleted)
+    check("overlay file is found", names(index.find(root, ["zebra"])) == ["zebra_notes.txt"])
+    check("removed file is hidden", index.find(root, ["ab"]) == [])
+    index.save()
+    check("journal written next to the snapshot", os.path.exists(index.journal_file))
+
+    reloaded = FileIndex(index_file)
+    check("journal replayed on load", names(reloaded.find(root, ["zebra"])) == ["zebra_notes.txt"]
+          and reloaded.find(root, ["ab"]) == [])
+
+    print("\n--- Filename suggestions ---")
+    check("overlay file is suggested", [s["name"] for s in index.suggest("zebra")] == ["zebra_notes.txt"])
+    check("newest first", [s["name"] for s in index.suggest("quarterly", 2)] ==
+          ["quarterly_report_19.pdf", "quarterly_report_18.pdf"])
+    check("word inside a name", [s["name"] for s in index.suggest("report_19")] == ["quarterly_report_19.pdf"])
+    check("older file behind many newer matches",
+          [s["name"] for s in index.suggest("quarterly_s")] == ["quarterly_summary.pdf"])
+    check("prefix longer than the sort key",
+          [s["name"] for s in index.suggest("quarterly_summary.p")] == ["quarterly_summary.pdf"])
+    check("multi-word query", [s["name"] for s in index.suggest("summary quarterly")] == ["quarterly_summary.pdf"])
+    check("removed file is not suggested", index.suggest("ab") == [])
+
+    print("\n--- Query cache ---")
+    cache = QueryCache(max_entries=2, ttl=60)
+    deep = os.path.join(root, "reports")
+    cache.put("q", {"results": [1]}, [root, deep], version=1)
+    check("hit while nothing changed", cache.get("q", version=1) == {"results": [1]})
+    check("miss when the version changes", cache.get("q", version=2) is None)
+    cache.put("q", {"results": [1]}, [root, deep], version=1)
+    time.sleep(0.01)
+    touch(os.path.join(deep, "new_report.pdf"), time.time())
+    check("miss when a watched directory changes", cache.get("q", version=1) is None)
+    cache.put("a", 1, [])
+    cache.put("b", 2, [])
+    cache.put("c", 3, [])
+    check("least recently used entry evicted", cache.get("a") is None and cache.get("c") == 3)
+
+    index.stop()
+    reloaded.stop()
+finally:
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+print(f"\n{'All checks passed' if not failures else f'{failures} check(s) failed'}")
@@ -0,0 +1,66 @@
+"""
+Quick Test Script for Intent Routing
+Checks that the compiled intent matcher and the pre-router recognise
+common commands, including inflected forms, without any LLM call
+"""
+
+from utils.intent_matcher import build_routing_matcher
+from utils.pre_router import PreRouter
+
+matcher = build_routing_matcher()
+pre_router = PreRouter(matcher)
+failures = 0
+
+
+def check(description: str, passed: bool):
+    global failures
+    print(f"{'✅' if passed else '❌'} {description}")
+    if not passed:
+        failures += 1
+
+
+# Commands that must reach an agent directly (no enhancement, no LLM routing)
+ROUTES = {
+    "take a screenshot": "screenshot",
+    "take screenshots": "screenshot",
+    "check my emails": "email",
+    "send emails to bob": "email",
+    "list my tasks": "task",
+    "show my reminders": "task",
+    "call jay": "phone",
+    "calling mom": "phone",
+    "called mom twice": "phone",
+    "emailed bob the invoice": "email",
+    "paying rent": "payment",
+    "volume up": "system_control",
+    "tell sarah i'm running late": "whatsapp",
+}
+
+print("--- Pre-router ---")
+for command, agent in ROUTES.items():
+    route = pre_router.route(command)
+    check(f"{command!r} -> {route.intents} (enhance={route.needs_enhancement})",
+          agent in route.intents and not route.needs_enhancement)
+
+# Commands that should go through the AI enhancement rewrite
+for command in ["send it to 7819 vijay sharma@gmail.com", "find that thing", "msg mom pls", "us here"]:
+    route = pre_router.route(command)
+    check(f"{command!r} needs enhancement ({', '.join(route.reasons)})", route.needs_enhancement)
+
+print("\n--- Intent matcher ---")
+matches = matcher.match("Send email to Jay")
+check("nested hits: 'send email' also reports 'send' and 'email'",
+      matches.has("send") and matches.has("email") and matches.score("email") == 3.0)
+check("email outweighs a passing WhatsApp word",
+      matcher.match("send email to jay telling him i'm late").score("email") >
+      matcher.match("send email to jay telling him i'm late").score("whatsapp"))
+check("-ed forms fold onto their keyword", matcher.match("shared it").has("whatsapp")
+      and matcher.match("texted dad").has("whatsapp"))
+check("whole words only: 'mailbox' is not 'mail'", not matcher.match("check the mailbox").has("multi_task:email"))
+check("short stems are not folded: 'us' is not shorthand 'u'", not matcher.match("us").has("shorthand"))
+check("rules: spoken email address", matcher.match("jay at the rate gmail dot com").has("spoken_email"))
+check("rules: pure greeting is conversational", matcher.match("hello").has("conversational"))
+check("rules: screenshot then email is multi-task",
+      matcher.match("take screenshot and email it to jay").has("multi_task"))
+
+print(f"\n{'All checks passed' if not failures else f'{failures} check(s) failed'}")
@@ -0,0 +1,94 @@
+"""
+Quick Test Script for the LLM Caches
+Checks the LLM response cache (memory and disk tiers, exact keys, TTL,
+eviction) and the semantic command cache (exact and near-duplicate hits)
+with a fake chat model, so no Groq call is made
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from utils.llm_cache import LLMResponseCache
+from utils.semantic_cache import SemanticCommandCache
+
+failures = 0
+
+
+def check(description: str, passed: bool):
+    global failures
+    print(f"{'✅' if passed else '❌'} {description}")
+    if not passed:
+        failures += 1
+
+
+def fake_model(cache: LLMResponseCache) -> FakeListChatModel:
+    # Same responses list for every model, so they share one llm_string
+    return FakeListChatModel(responses=[f"reply {i}" for i in range(100)], cache=cache)
+
+
+work_dir = tempfile.mkdtemp()
+system = SystemMessage(content="You parse commands")
+
+try:
+    print("--- LLM response cache ---")
+    cache_dir = os.path.join(work_dir, "llm_cache")
+    cache = LLMResponseCache(cache_dir=cache_dir, memory_entries=2, max_entries=5, ttl=60)
+    model = fake_model(cache)
+
+    first = model.invoke([system, HumanMessage(content="message Bob hello")]).content
+    again = model.invoke([system, HumanMessage(content="message Bob hello")]).content
+    check("repeat prompt answered from memory", first == again and cache.hits == 1)
+    other_case = model.invoke([system, HumanMessage(content="message bob hello")]).content
+    check("prompts differing in case do not share a reply", other_case != first)
+    other_system = model.invoke([SystemMessage(content="Other prompt"), HumanMessage(content="message Bob hello")]).content
+    check("system prompt is part of the key", other_system != first)
+
+    restarted = LLMResponseCache(cache_dir=cache_dir, memory_entries=2, max_entries=5, ttl=60)
+    from_disk = fake_model(restarted).invoke([system, HumanMessage(content="message Bob hello")]).content
+    check("reply survives a restart on disk", from_disk == first and restarted.disk_hits == 1)
+
+    for i in range(10):
+        model.invoke([system, HumanMessage(content=f"command {i}")])
+    disk_files = [name for name in os.listdir(cache_dir) if name.endswith(".json")]
+    check(f"disk tier stays bounded ({len(disk_files)} entries)", len(disk_files) <= 5)
+
+    expiring = LLMResponseCache(cache_dir=cache_dir, ttl=0.01)
+    time.sleep(0.05)
+    fake_model(expiring).invoke([system, HumanMessage(content="command 9")])
+    check("expired entries miss", expiring.hits == 0 and expiring.misses == 1)
+
+    print("\n--- Semantic command cache ---")
+    semantic = SemanticCommandCache(cache_file=os.path.join(work_dir, "semantic_cache.json"))
+    semantic.store("call my mom", "phone", "call mom", {"contact": "mom"})
+    semantic.store("send hello to jay on whatsapp", "whatsapp", "send hello to jay on whatsapp",
+                   {"contact": "jay", "message": "hello"})
+    semantic.store("tell sam i will call you now", "whatsapp", "Send WhatsApp to Sam: I will call you now",
+                   {"contact": "sam", "message": "I will call you now"})
+
+    exact = semantic.lookup("phone mom please")
+    check("filler and synonyms fold onto an exact hit",
+          exact is not None and exact.exact and not exact.identical and exact.slots == {"contact": "mom"})
+    identical = semantic.lookup("Call my  Mom")
+    check("only the identical command reuses the stored command", identical is not None and identical.identical)
+    dropped = semantic.lookup("tell sam i will call")
+    check("dropped filler words that occur in a slot drop the slots",
+          dropped is not None and dropped.exact and not dropped.identical and dropped.slots == {})
+    near = semantic.lookup("call mom back")
+    check("near duplicate reuses agent and slots",
+          near is not None and not near.exact and near.agent_name == "phone" and near.slots == {"contact": "mom"})
+    renamed = semantic.lookup("send hello to jai on whatsapp")
+    check("near duplicate with a different name drops the slots",
+          renamed is not None and renamed.agent_name == "whatsapp" and renamed.slots == {})
+    check("unrelated command misses", semantic.lookup("what is the weather like") is None)
+
+    reloaded = SemanticCommandCache(cache_file=os.path.join(work_dir, "semantic_cache.json"))
+    check("commands persist across restarts", reloaded.lookup("call my mom") is not None)
+finally:
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+print(f"\n{'All checks passed' if not failures else f'{failures} check(s) failed'}")
@@ -0,0 +1,498 @@
+"""
+Compact On-Disk File Index for AI Task Automation Assistant
+A read-only snapshot of the file index laid out as fixed-width columns so
+it can be memory-mapped and queried without loading it into Python objects
+
+Layout (native byte order, every section 8-byte aligned):
+
+    header          magic, version, byte order, snapshot id, row/root/string
+                    counts and the offset of each section
+    string table    interned root and directory paths (utf-8 blob + offsets)
+    root table      per root: string id, first row, row count, indexed_at
+    dir_id column   u32 per row, index into the string table
+    size column     u64 per row
+    mtime column    f64 per row
+    names           utf-8 basenames separated by NUL (+ offsets, one per row + 1)
+    lower names     lowercased basenames, same shape, used for substring search
+    extension table per root and extension: string ids, first slot, slot count
+    extension rows  u32 row numbers, each extension bucket newest first
+    trigram keys    sorted u32 keys, one per distinct byte trigram of a lower name
+    trigram offsets u64 per key + 1, start of its postings
+    trigram rows    u32 row numbers, each posting list ascending
+    word rows       u32 row per word start in a lower name, the name's own
+                    start included, ordered by the name bytes from there on
+    word offsets    u32 byte offset of each of those word starts in its name
+
+Rows are sorted by root and then by full path, so every root is one
+contiguous row range and every directory subtree is a contiguous range
+within it. Extension buckets list a root's rows of one extension ordered
+by mtime, so "most recent N files of a type" reads N slots. Trigram
+postings narrow a substring query to the rows containing its rarest
+trigram, so a lookup does not scan every name. Sorted word starts turn
+"names with a word starting with this prefix" into two binary searches.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Iterable, Iterator, Optional, Set, Tuple
+
+import numpy as np
+
+from utils.file_crawler import FileEntry
+
+MAGIC = b"VAANIIDX"
+FORMAT_VERSION = 4
+BYTE_ORDER = 1 if sys.byteorder == "little" else 2
+
+# magic, version, byte order, snapshot id, rows, roots, strings, trigrams, word starts,
+# 17 section offsets
+_HEADER = struct.Struct("=8sIIQQIIQQ17Q")
+_ROOT = struct.Struct("=IIIxxxxd")
+_EXTENSION = struct.Struct("=IIII")
+_SECTIONS = (
+    "string_offsets", "strings", "roots", "dir_ids", "sizes", "mtimes",
+    "name_offsets", "names", "lower_offsets", "lower_names", "extensions", "extension_rows",
+    "trigram_keys", "trigram_offsets", "trigram_rows", "word_rows", "word_offsets"
+)
+_SEPARATOR = b"\0"
+
+# Leading bytes of a word start that set its sort position; longer
+# prefixes are confirmed against the mapped name
+WORD_KEY_LENGTH = 16
+
+# 1 for bytes that continue a word (bytes >= 0x80 belong to utf-8 letters)
+_WORD_BYTES = bytes(1 if byte >= 0x80 or chr(byte).isalnum() else 0 for byte in range(256))
+
+
+class CompactIndexError(Exception):
+    """Raised when a snapshot file is missing, truncated or from another format version"""
+
+
+def _align(data: bytes) -> bytes:
+    return data + b"\0" * (-len(data) % 8)
+
+
+def _blob(strings: Iterable[str]) -> Tuple[bytes, array]:
+    """NUL-terminated utf-8 blob and the start offset of each string (+ end sentinel)"""
+    offsets = array("Q")
+    parts = []
+    position = 0
+    for string in strings:
+        data = string.encode("utf-8", "surrogateescape") + _SEPARATOR
+        offsets.append(position)
+        parts.append(data)
+        position += len(data)
+    offsets.append(position)
+    return b"".join(parts), offsets
+
+
+def trigram_keys(data: bytes) -> Set[int]:
+    """Distinct byte trigrams of a utf-8 string, each packed into an int"""
+    return {int.from_bytes(data[i:i + 3], "big") for i in range(len(data) - 2)}
+
+
+def word_starts(data: bytes) -> List[int]:
+    """Byte offsets where a word of a lowercased utf-8 name starts, 0 included"""
+    starts = [0]
+    for i in range(1, len(data)):
+        if _WORD_BYTES[data[i]] and not _WORD_BYTES[data[i - 1]]:
+            starts.append(i)
+    return starts
+
+
+def write_compact_index(path: str, roots: Dict[str, Tuple[float, Iterable[FileEntry]]]) -> int:
+    """
+    Write a snapshot atomically
+
+    Args:
+        path: Destination file
+        roots: root -> (indexed_at, entries under that root)
+
+    Returns:
+        The snapshot id stored in the header
+    """
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        string_id = string_ids.get(value)
+        if string_id is None:
+            string_id = string_ids[value] = len(strings)
+            strings.append(value)
+        return string_id
+
+    root_rows = bytearray()
+    extension_table = bytearray()
+    extension_rows = array("I")
+    dir_ids = array("I")
+    sizes = array("Q")
+    mtimes = array("d")
+    names: List[str] = []
+
+    for root, (indexed_at, entries) in roots.items():
+        first = len(dir_ids)
+        buckets: Dict[str, List[Tuple[float, int]]] = {}
+        for entry in sorted(entries, key=lambda e: e.path):
+            buckets.setdefault(entry.extension, []).append((entry.mtime, len(dir_ids)))
+            dir_ids.append(intern(os.path.dirname(entry.path)))
+            sizes.append(max(0, entry.size))
+            mtimes.append(entry.mtime)
+            names.append(entry.name)
+        root_id = intern(root)
+        root_rows += _ROOT.pack(root_id, first, len(dir_ids) - first, indexed_at)
+
+        for extension, bucket in sorted(buckets.items()):
+            bucket.sort(reverse=True)
+            extension_table += _EXTENSION.pack(root_id, intern(extension), len(extension_rows), len(bucket))
+            extension_rows.extend(row for _, row in bucket)
+
+    string_blob, string_offsets = _blob(strings)
+    name_blob, name_offsets = _blob(names)
+    lower_blob, lower_offsets = _blob(name.lower() for name in names)
+
+    # Rows are visited in order, so every posting list comes out ascending
+    postings: Dict[int, array] = {}
+    for row in range(len(names)):
+        lower = lower_blob[lower_offsets[row]:lower_offsets[row + 1] - 1]
+        for key in trigram_keys(lower):
+            posting = postings.get(key)
+            if posting is None:
+                posting = postings[key] = array("I")
+            posting.append(row)
+    keys = array("I", sorted(postings))
+    trigram_offsets = array("Q")
+    trigram_rows = array("I")
+    for key in keys:
+        trigram_offsets.append(len(trigram_rows))
+        trigram_rows.extend(postings[key])
+    trigram_offsets.append(len(trigram_rows))
+
+    # Word starts keyed by their first WORD_KEY_LENGTH bytes, sorted in one
+    # numpy pass rather than as millions of Python objects
+    word_keys = bytearray()
+    word_rows = array("I")
+    word_offsets = array("I")
+    for row in range(len(names)):
+        lower = lower_blob[lower_offsets[row]:lower_offsets[row + 1] - 1]
+        for start in word_starts(lower):
+            word_keys += lower[start:start + WORD_KEY_LENGTH].ljust(WORD_KEY_LENGTH, _SEPARATOR)
+            word_rows.append(row)
+            word_offsets.append(start)
+    if word_rows:
+        order = np.frombuffer(bytes(word_keys), dtype=f"S{WORD_KEY_LENGTH}").argsort(kind="stable")
+        word_rows = np.frombuffer(word_rows, dtype=np.uint32)[order]
+        word_offsets = np.frombuffer(word_offsets, dtype=np.uint32)[order]
+
+    sections = {
+        "string_offsets": string_offsets.tobytes(),
+        "strings": string_blob,
+        "roots": bytes(root_rows),
+        "dir_ids": dir_ids.tobytes(),
+        "sizes": sizes.tobytes(),
+        "mtimes": mtimes.tobytes(),
+        "name_offsets": name_offsets.tobytes(),
+        "names": name_blob,
+        "lower_offsets": lower_offsets.tobytes(),
+        "lower_names": lower_blob,
+        "extensions": bytes(extension_table),
+        "extension_rows": extension_rows.tobytes(),
+        "trigram_keys": keys.tobytes(),
+        "trigram_offsets": trigram_offsets.tobytes(),
+        "trigram_rows": trigram_rows.tobytes(),
+        "word_rows": word_rows.tobytes(),
+        "word_offsets": word_offsets.tobytes(),
+    }
+
+    offsets = []
+    position = _HEADER.size + (-_HEADER.size % 8)
+    for name in _SECTIONS:
+        offsets.append(position)
+        position += len(_align(sections[name]))
+
+    snapshot_id = time.time_ns()
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, BYTE_ORDER, snapshot_id,
+                          len(dir_ids), len(roots), len(strings), len(keys), len(word_rows), *offsets)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_align(header))
+        for name in _SECTIONS:
+            f.write(_align(sections[name]))
+    os.replace(tmp_path, path)
+    return snapshot_id
+
+
+class CompactIndex:
+    """
+    Memory-mapped reader for a snapshot written by write_compact_index
+
+    Columns are exposed as memoryview casts over the mapping, so opening
+    is O(roots) and lookups touch only the pages they read.
+    """
+
+    def __init__(self, path: str):
+        self.file_path = path
+        try:
+            self._file = open(path, "rb")
+        except OSError as e:
+            raise CompactIndexError(str(e))
+
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError) as e:
+            self._file.close()
+            raise CompactIndexError(f"Cannot map {path}: {e}")
+
+        self._views = []
+        try:
+            self._open()
+        except Exception:
+            self.close()
+            raise
+
+    def _open(self):
+        if len(self._mmap) < _HEADER.size:
+            raise CompactIndexError("Truncated index header")
+        magic, version, byte_order, snapshot_id, rows, root_count, string_count, trigram_count, word_count, \
+            *offsets = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or byte_order != BYTE_ORDER:
+            raise CompactIndexError(f"Unsupported index format (version {version})")
+
+        self.snapshot_id = snapshot_id
+        self.row_count = rows
+        self._buffer = memoryview(self._mmap)
+        self._views.append(self._buffer)
+        sections = dict(zip(_SECTIONS, offsets))
+        ends = dict(zip(_SECTIONS, offsets[1:] + [len(self._mmap)]))
+
+        def column(name: str, fmt: str, count: int) -> memoryview:
+            start = sections[name]
+            size = struct.calcsize(fmt) * count
+            if start + size > ends[name]:
+                raise CompactIndexError(f"Truncated section {name}")
+            view = self._buffer[start:start + size].cast(fmt)
+            self._views.append(view)
+            return view
+
+        self._string_offsets = column("string_offsets", "Q", string_count + 1)
+        self._strings_at = sections["strings"]
+        self._dir_ids = column("dir_ids", "I", rows)
+        self._sizes = column("sizes", "Q", rows)
+        self._mtimes = column("mtimes", "d", rows)
+        self._name_offsets = column("name_offsets", "Q", rows + 1)
+        self._names_at = sections["names"]
+        self._lower_offsets = column("lower_offsets", "Q", rows + 1)
+        self._lower_at = sections["lower_names"]
+
+        # root -> (first row, row count, indexed_at); the only eager read
+        self.roots: Dict[str, Tuple[int, int, float]] = {}
+        for i in range(root_count):
+            string_id, first, count, indexed_at = _ROOT.unpack_from(self._mmap, sections["roots"] + i * _ROOT.size)
+            self.roots[self._string(string_id)] = (first, count, indexed_at)
+
+        # root -> extension -> (first slot, slot count) in the extension rows
+        self.extensions: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        slots = 0
+        extension_count = (ends["extensions"] - sections["extensions"]) // _EXTENSION.size
+        for i in range(extension_count):
+            root_id, extension_id, first, count = _EXTENSION.unpack_from(
+                self._mmap, sections["extensions"] + i * _EXTENSION.size)
+            root = self._string(root_id)
+            self.extensions.setdefault(root, {})[self._string(extension_id)] = (first, count)
+            slots = max(slots, first + count)
+        self._extension_rows = column("extension_rows", "I", slots)
+
+        self._trigram_keys = column("trigram_keys", "I", trigram_count)
+        self._trigram_offsets = column("trigram_offsets", "Q", trigram_count + 1)
+        self._trigram_rows = column("trigram_rows", "I", self._trigram_offsets[trigram_count])
+
+        self._word_rows = column("word_rows", "I", word_count)
+        self._word_offsets = column("word_offsets", "I", word_count)
+
+    def close(self):
+        """Release the mapping; no other method may be called afterwards"""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    # ------------------------------------------------------------------
+    # Row access
+    # ------------------------------------------------------------------
+
+    def _decode(self, base: int, offsets: memoryview, i: int) -> str:
+        start = base + offsets[i]
+        end = base + offsets[i + 1] - 1  # drop the separator
+        return self._buffer[start:end].tobytes().decode("utf-8", "surrogateescape")
+
+    def _string(self, string_id: int) -> str:
+        return self._decode(self._strings_at, self._string_offsets, string_id)
+
+    def name(self, row: int) -> str:
+        return self._decode(self._names_at, self._name_offsets, row)
+
+    def path(self, row: int) -> str:
+        return os.path.join(self._string(self._dir_ids[row]), self.name(row))
+
+    def entry(self, root: str, row: int) -> FileEntry:
+        name = self.name(row)
+        path = os.path.join(self._string(self._dir_ids[row]), name)
+        return FileEntry(root, path, name, self._sizes[row], self._mtimes[row])
+
+    def rows(self, root: str) -> range:
+        """All rows of a root"""
+        first, count, _ = self.roots.get(root, (0, 0, 0.0))
+        return range(first, first + count)
+
+    def root_of(self, row: int) -> Optional[str]:
+        """Root whose row range holds row"""
+        for root, (first, count, _) in self.roots.items():
+            if first <= row < first + count:
+                return root
+        return None
+
+    def lower_names(self) -> List[str]:
+        """Every row's lowercased name, decoded from the blob in one pass"""
+        end = self._lower_at + self._lower_offsets[self.row_count]
+        blob = self._buffer[self._lower_at:end].tobytes().decode("utf-8", "surrogateescape")
+        return blob.split("\0")[:-1]
+
+    def extension_rows(self, root: str, extension: str) -> memoryview:
+        """Rows of a root with this extension (lowercase, with dot), newest first"""
+        first, count = self.extensions.get(root, {}).get(extension, (0, 0))
+        return self._extension_rows[first:first + count]
+
+    def _bisect_path(self, rows: range, path: str) -> int:
+        lo, hi = rows.start, rows.stop
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.path(mid) < path:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find_path(self, root: str, path: str) -> Optional[int]:
+        """Row of an exact path, by binary search"""
+        rows = self.rows(root)
+        row = self._bisect_path(rows, path)
+        if row < rows.stop and self.path(row) == path:
+            return row
+        return None
+
+    def prefix_rows(self, root: str, prefix: str) -> range:
+        """Rows whose path starts with prefix (a directory subtree is contiguous)"""
+        rows = self.rows(root)
+        start = self._bisect_path(rows, prefix)
+        # Smallest string greater than every string with this prefix
+        stop = self._bisect_path(range(start, rows.stop), prefix + "\U0010ffff")
+        return range(start, stop)
+
+    def _postings(self, key: int) -> Optional[memoryview]:
+        """Ascending rows whose lower name contains a trigram, or None"""
+        i = bisect_left(self._trigram_keys, key)
+        if i == len(self._trigram_keys) or self._trigram_keys[i] != key:
+            return None
+        return self._trigram_rows[self._trigram_offsets[i]:self._trigram_offsets[i + 1]]
+
+    def find_substring(self, root: str, substring: str) -> Iterator[int]:
+        """
+        Rows of a root whose lowercased name contains substring
+
+        Substrings of three or more bytes take the shortest posting list
+        among their trigrams and confirm each candidate row against its
+        mapped name. Shorter substrings, which have no trigram, scan the
+        lowercase name blob in place with mmap.find.
+        """
+        rows = self.rows(root)
+        if not rows:
+            return
+        needle = substring.lower().encode("utf-8", "surrogateescape")
+        if not needle or _SEPARATOR in needle:
+            yield from rows
+            return
+
+        offsets = self._lower_offsets
+        base = self._lower_at
+        if len(needle) >= 3:
+            shortest = None
+            for key in trigram_keys(needle):
+                postings = self._postings(key)
+                if postings is None:
+                    return
+                if shortest is None or len(postings) < len(shortest):
+                    shortest = postings
+            start = bisect_left(shortest, rows.start)
+            stop = bisect_left(shortest, rows.stop, start)
+            for row in shortest[start:stop]:
+                if self._mmap.find(needle, base + offsets[row], base + offsets[row + 1]) >= 0:
+                    yield row
+            return
+
+        position = base + offsets[rows.start]
+        end = base + offsets[rows.stop]
+        while True:
+            hit = self._mmap.find(needle, position, end)
+            if hit < 0:
+                return
+            row = bisect_right(offsets, hit - base, rows.start, rows.stop) - 1
+            yield row
+            # Continue after this name so each row is reported once
+            position = base + offsets[row + 1]
+
+    def _word_key(self, i: int, length: int) -> bytes:
+        """Up to length bytes of a lower name, read from its i-th sorted word start"""
+        row = self._word_rows[i]
+        start = self._lower_at + self._lower_offsets[row] + self._word_offsets[i]
+        end = self._lower_at + self._lower_offsets[row + 1] - 1
+        return self._mmap[start:min(end, start + length)]
+
+    def word_prefix_rows(self, prefix: str) -> np.ndarray:
+        """
+        Rows whose lowercased name, or a word in it, starts with prefix,
+        newest first
+
+        Two binary searches over the sorted word starts bound the matches,
+        so only their rows and mtimes are read. Prefixes longer than
+        WORD_KEY_LENGTH are confirmed against each mapped name.
+        """
+        needle = prefix.lower().encode("utf-8", "surrogateescape")
+        count = len(self._word_rows)
+        if not needle or _SEPARATOR in needle or not count:
+            return np.zeros(0, dtype=np.uint32)
+        key = needle[:WORD_KEY_LENGTH]
+
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._word_key(mid, len(key)) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        first, hi = lo, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._word_key(mid, len(key)) <= key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        if len(needle) > WORD_KEY_LENGTH:
+            rows = np.array([self._word_rows[i] for i in range(first, lo)
+                             if self._word_key(i, len(needle)) == needle], dtype=np.uint32)
+        else:
+            rows = np.frombuffer(self._word_rows, dtype=np.uint32)[first:lo]
+        rows = np.unique(rows)
+        mtimes = np.frombuffer(self._mtimes, dtype=np.float64)[rows]
+        return rows[np.argsort(-mtimes, kind="stable")]
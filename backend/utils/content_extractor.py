@@ -0,0 +1,107 @@
+"""
+Document Text Extraction for AI Task Automation Assistant
+Turns txt/md/docx/pdf files into search terms and preview snippets. Kept
+free of module-level state so ProcessPoolExecutor workers can import it
+cheaply.
+"""
+
+import os
+import re
+import zipfile
+from typing import List, Optional, Set
+
+try:
+    from pypdf import PdfReader
+    PDF_AVAILABLE = True
+except ImportError:
+    PdfReader = None
+    PDF_AVAILABLE = False
+
+TEXT_EXTENSIONS = {'.txt', '.md'}
+CONTENT_EXTENSIONS = TEXT_EXTENSIONS | {'.docx'} | ({'.pdf'} if PDF_AVAILABLE else set())
+
+MAX_FILE_SIZE = 20 * 1024 * 1024  # bytes; larger documents are not extracted
+MAX_TEXT_CHARS = 2_000_000        # characters of text kept per document
+MAX_PDF_PAGES = 200
+
+TERM_PATTERN = re.compile(r"[a-z0-9]{2,}")
+XML_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+STOP_WORDS = {
+    "the", "and", "for", "are", "but", "not", "you", "all", "any", "can", "was", "our",
+    "out", "has", "have", "had", "this", "that", "with", "from", "they", "will", "would",
+    "there", "their", "what", "about", "which", "when", "where", "who", "into", "than",
+    "then", "them", "these", "those", "of", "to", "in", "on", "at", "by", "an", "or",
+    "is", "it", "as", "be", "if", "so", "we", "do", "me", "my", "file", "files", "find",
+    "search", "document", "documents"
+}
+
+
+def tokenize(text: str) -> Set[str]:
+    """Distinct lowercase search terms in text"""
+    return {term for term in TERM_PATTERN.findall(text.lower()) if term not in STOP_WORDS}
+
+
+def _extract_text(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension in TEXT_EXTENSIONS:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            return f.read(MAX_TEXT_CHARS)
+
+    if extension == '.docx':
+        # A .docx is a zip of XML parts; the body text lives in word/document.xml
+        with zipfile.ZipFile(path) as archive:
+            xml = archive.read('word/document.xml').decode('utf-8', errors='ignore')
+        xml = xml.replace('</w:p>', '\n')
+        return XML_TAG_PATTERN.sub(' ', xml)[:MAX_TEXT_CHARS]
+
+    if extension == '.pdf' and PDF_AVAILABLE:
+        reader = PdfReader(path)
+        parts = []
+        length = 0
+        for page in reader.pages[:MAX_PDF_PAGES]:
+            text = page.extract_text() or ''
+            parts.append(text)
+            length += len(text)
+            if length >= MAX_TEXT_CHARS:
+                break
+        return '\n'.join(parts)[:MAX_TEXT_CHARS]
+
+    return ''
+
+
+def extract_snippet(path: str, max_chars: int = 300) -> str:
+    """
+    The opening text of a document with whitespace collapsed, for previews
+
+    Only the first page of a PDF is read.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.pdf':
+        if not PDF_AVAILABLE:
+            return ''
+        reader = PdfReader(path)
+        text = (reader.pages[0].extract_text() or '') if reader.pages else ''
+    elif extension in TEXT_EXTENSIONS:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            text = f.read(max_chars * 4)
+    else:
+        text = _extract_text(path)
+
+    snippet = ' '.join(text.split())
+    if len(snippet) > max_chars:
+        snippet = snippet[:max_chars].rsplit(' ', 1)[0] + '…'
+    return snippet
+
+
+def extract_terms(path: str) -> Optional[List[str]]:
+    """
+    Search terms for one document (runs in a worker process)
+
+    Returns None if the document could not be read.
+    """
+    try:
+        return sorted(tokenize(_extract_text(path)))
+    except Exception:
+        return None
@@ -0,0 +1,317 @@
+"""
+Full-Text Content Index for AI Task Automation Assistant
+Extracts words from documents under the indexed search locations in a
+background process pool so FileSearch can match on what a file says,
+not only on its name
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple, Set, NamedTuple
+
+from config import config
+from utils.content_extractor import CONTENT_EXTENSIONS, MAX_FILE_SIZE, PDF_AVAILABLE, extract_terms, tokenize
+from utils.file_crawler import FileEntry
+
+CONTENT_INDEX_VERSION = 1
+
+# Seconds a refresh waits so a burst of file index changes is handled once
+REFRESH_DELAY = 2.0
+
+
+class ContentRecord(NamedTuple):
+    """An extracted document"""
+    root: str
+    size: int
+    mtime: float
+    terms: Tuple[str, ...]
+
+
+class ContentIndex:
+    """
+    Inverted index from document words to file paths
+    Documents are listed from the FileIndex and re-extracted only when
+    their mtime changes; queries never open a file. Refreshes are
+    debounced, and between snapshot rewrites they only look at the files
+    the FileIndex changed since its snapshot
+    """
+
+    def __init__(self, index_file: Optional[str] = None, max_workers: Optional[int] = None):
+        """
+        Initialize content index
+
+        Args:
+            index_file: Path to JSON index file (relative to backend directory)
+            max_workers: Extraction processes
+        """
+        backend_dir = Path(__file__).parent.parent
+        self.index_file = backend_dir / (index_file or config.CONTENT_INDEX_FILE)
+        self.max_workers = max_workers or config.CONTENT_INDEX_WORKERS
+
+        # path -> record; term -> paths containing it
+        self.documents: Dict[str, ContentRecord] = {}
+        self.postings: Dict[str, Set[str]] = {}
+        # Bumped on every change so callers can detect stale derived data
+        self.generation = 0
+
+        self._lock = threading.RLock()
+        self._file_index = None
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_requested = False
+        self._stopping = False
+        # Snapshot of the FileIndex the last full refresh listed
+        self._snapshot_id: Optional[int] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        """Load the persisted index, ignoring files from other versions"""
+        try:
+            if not self.index_file.exists():
+                return
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != CONTENT_INDEX_VERSION:
+                print(f"[INFO] ContentIndex: Ignoring index with version {data.get('version')}")
+                return
+
+            for path, (root, size, mtime, terms) in data.get("documents", {}).items():
+                self._add(path, ContentRecord(root, size, mtime, tuple(terms)))
+
+            print(f"[INFO] ContentIndex: Loaded {len(self.documents)} documents, {len(self.postings)} terms")
+        except Exception as e:
+            print(f"[ERROR] ContentIndex: Failed to load index: {e}")
+            self.documents = {}
+            self.postings = {}
+
+    def save(self):
+        """Write the index to disk atomically"""
+        with self._lock:
+            data = {
+                "version": CONTENT_INDEX_VERSION,
+                "documents": {
+                    path: [r.root, r.size, r.mtime, list(r.terms)]
+                    for path, r in self.documents.items()
+                }
+            }
+
+        try:
+            tmp_file = self.index_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_file, self.index_file)
+        except Exception as e:
+            print(f"[ERROR] ContentIndex: Failed to save index: {e}")
+
+    # ------------------------------------------------------------------
+    # Building and updating
+    # ------------------------------------------------------------------
+
+    def _add(self, path: str, record: ContentRecord):
+        with self._lock:
+            self._remove(path)
+            self.documents[path] = record
+            for term in record.terms:
+                self.postings.setdefault(term, set()).add(path)
+            self.generation += 1
+
+    def _remove(self, path: str):
+        with self._lock:
+            record = self.documents.pop(path, None)
+            if record is None:
+                return
+            for term in record.terms:
+                paths = self.postings.get(term)
+                if paths is not None:
+                    paths.discard(path)
+                    if not paths:
+                        del self.postings[term]
+            self.generation += 1
+
+    def start(self, file_index):
+        """
+        Follow a FileIndex: refresh now and whenever its files change
+
+        Safe to call more than once.
+        """
+        with self._lock:
+            if self._file_index is file_index:
+                return
+            self._file_index = file_index
+        file_index.add_listener(self.schedule_refresh)
+        self.schedule_refresh()
+
+    def schedule_refresh(self):
+        """Run a refresh in the background, coalescing overlapping requests"""
+        with self._lock:
+            if self._stopping:
+                return
+            self._refresh_requested = True
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self._refresh_loop, daemon=True)
+            self._refresh_thread.start()
+
+    def _refresh_loop(self):
+        while True:
+            # Let a burst of change notifications settle into one refresh
+            time.sleep(REFRESH_DELAY)
+            with self._lock:
+                if not self._refresh_requested or self._stopping:
+                    return
+                self._refresh_requested = False
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[ERROR] ContentIndex: Refresh failed: {e}")
+
+    def refresh(self):
+        """Bring the index in line with the FileIndex, extracting only new or modified documents"""
+        file_index = self._file_index
+        if file_index is None:
+            return
+
+        snapshot_id = file_index.snapshot_id
+        if snapshot_id is None or snapshot_id != self._snapshot_id:
+            self._refresh_all(file_index)
+            self._snapshot_id = snapshot_id
+        else:
+            self._refresh_changes(file_index)
+
+    @staticmethod
+    def _wanted(entry: FileEntry) -> bool:
+        return entry.extension in CONTENT_EXTENSIONS and entry.size <= MAX_FILE_SIZE
+
+    def _refresh_all(self, file_index):
+        """Compare every indexed document (after a crawl or snapshot rewrite)"""
+        wanted: Dict[str, FileEntry] = {}
+        for root in list(file_index.indexed_at):
+            for entry in file_index.files(root):
+                if self._wanted(entry):
+                    wanted[entry.path] = entry
+
+        with self._lock:
+            stale = [path for path in self.documents if path not in wanted]
+            for path in stale:
+                self._remove(path)
+            todo = [
+                entry for path, entry in wanted.items()
+                if path not in self.documents or self.documents[path].mtime != entry.mtime
+            ]
+        self._extract(todo, bool(stale))
+
+    def _refresh_changes(self, file_index):
+        """Compare only the files changed since the FileIndex snapshot"""
+        changed = {entry.path: entry for entry in file_index.overlay_entries()}
+        removed = file_index.removed_paths()
+
+        with self._lock:
+            stale = [
+                path for path in removed | set(changed)
+                if path in self.documents and (path not in changed or not self._wanted(changed[path]))
+            ]
+            for path in stale:
+                self._remove(path)
+            todo = [
+                entry for path, entry in changed.items()
+                if self._wanted(entry) and (path not in self.documents or self.documents[path].mtime != entry.mtime)
+            ]
+        self._extract(todo, bool(stale))
+
+    def _extract(self, todo: List[FileEntry], changed: bool):
+        """Extract documents in the process pool and persist the index"""
+        if not todo:
+            if changed:
+                self.save()
+            return
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            executor = self._executor
+
+        start = time.time()
+        extracted = 0
+        futures = {executor.submit(extract_terms, entry.path): entry for entry in todo}
+        for future in as_completed(futures):
+            if self._stopping:
+                for pending in futures:
+                    pending.cancel()
+                break
+            entry = futures[future]
+            terms = future.result()
+            if terms is not None:
+                extracted += 1
+            # Unreadable documents are recorded without terms so they are
+            # only retried once their mtime changes
+            self._add(entry.path, ContentRecord(entry.root, entry.size, entry.mtime, tuple(terms or ())))
+
+        print(f"[INFO] ContentIndex: Extracted {extracted} of {len(todo)} documents ({time.time() - start:.2f}s)")
+        self.save()
+
+    def stop(self):
+        """Stop background extraction and persist the index"""
+        with self._lock:
+            self._stopping = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.save()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, roots: Optional[List[str]] = None) -> List[Tuple[FileEntry, float]]:
+        """
+        Documents containing the query's words
+
+        Args:
+            query: Free text; stop words are ignored
+            roots: Only return documents under these search locations
+
+        Returns:
+            (entry, fraction of query terms found) pairs, best first
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for term in terms:
+                for path in self.postings.get(term, ()):
+                    counts[path] = counts.get(path, 0) + 1
+            matches = []
+            for path, count in counts.items():
+                record = self.documents[path]
+                if roots is not None and record.root not in roots:
+                    continue
+                entry = FileEntry(record.root, path, os.path.basename(path), record.size, record.mtime)
+                matches.append((entry, count / len(terms)))
+
+        matches.sort(key=lambda match: (match[1], match[0].mtime), reverse=True)
+        return matches
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index statistics for diagnostics"""
+        with self._lock:
+            return {
+                "documents": len(self.documents),
+                "terms": len(self.postings),
+                "pdf_support": PDF_AVAILABLE,
+                "refreshing": self._refresh_thread is not None and self._refresh_thread.is_alive()
+            }
+
+
+# Global content index instance
+content_index = ContentIndex()
@@ -0,0 +1,254 @@
+"""
+Parallel File Crawler for AI Task Automation Assistant
+Walks several search roots concurrently with os.scandir, reusing the
+stat information cached on each DirEntry
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from typing import Any, Dict, List, Iterator, NamedTuple, Optional, Tuple
+
+from utils.prune_rules import PruneRules, prune_rules
+
+
+class FileEntry(NamedTuple):
+    """A file found by the crawler"""
+    root: str
+    path: str
+    name: str
+    size: int
+    mtime: float
+
+    @property
+    def extension(self) -> str:
+        return os.path.splitext(self.name)[1].lower()
+
+
+def scan_tree(root: str, max_depth: Optional[int] = None,
+              stop: Optional[threading.Event] = None,
+              prune: Optional[PruneRules] = prune_rules) -> Iterator[FileEntry]:
+    """
+    Breadth-first scan of one root with os.scandir
+
+    Files directly in root are at depth 0; directories at max_depth or
+    deeper are not entered (same semantics as the old os.walk loops),
+    nor are directories matched by the prune rules.
+    """
+    pending = deque([(root, 0)])
+    while pending:
+        if stop is not None and stop.is_set():
+            return
+        directory, depth = pending.popleft()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if prune is not None and prune.should_prune(entry.path, entry.name):
+                                continue
+                            if max_depth is None or depth + 1 < max_depth:
+                                pending.append((entry.path, depth + 1))
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            yield FileEntry(root, entry.path, entry.name, stat.st_size, stat.st_mtime)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+class ParallelCrawler:
+    """
+    Crawls search roots in a thread pool
+    Roots on the same device share a semaphore so a slow disk or network
+    mount is never hit by more than per_device scans at once
+    """
+
+    def __init__(self, max_workers: int = 8, per_device: int = 2,
+                 prune: Optional[PruneRules] = prune_rules):
+        """
+        Initialize crawler
+
+        Args:
+            max_workers: Total crawler threads
+            per_device: Concurrent root scans allowed per device
+            prune: Directories never to descend into (None crawls everything)
+        """
+        self.max_workers = max_workers
+        self.per_device = per_device
+        self.prune = prune
+        self._device_locks: Dict[int, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def _device_semaphore(self, root: str) -> threading.Semaphore:
+        try:
+            device = os.stat(root).st_dev
+        except OSError:
+            device = -1
+        with self._lock:
+            if device not in self._device_locks:
+                self._device_locks[device] = threading.Semaphore(self.per_device)
+            return self._device_locks[device]
+
+    def iter_files(self, roots: List[str], max_depth: Optional[int] = None) -> Iterator[FileEntry]:
+        """
+        Yield files from all roots as they are found
+
+        Entries from different roots interleave. Stopping iteration early
+        cancels the remaining scans.
+        """
+        if not roots:
+            return
+
+        results: queue.Queue = queue.Queue(maxsize=10000)
+        stop = threading.Event()
+        done = object()
+
+        def put(item) -> bool:
+            # Bounded put that gives up once the consumer has gone away
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def worker(root: str):
+            try:
+                with self._device_semaphore(root):
+                    for entry in scan_tree(root, max_depth, stop, self.prune):
+                        if not put(entry):
+                            return
+            except Exception as e:
+                print(f"[DEBUG] FileCrawler: Error scanning {root}: {e}")
+            finally:
+                put(done)
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(roots)),
+                                      thread_name_prefix="file-crawler")
+        try:
+            for root in roots:
+                executor.submit(worker, root)
+
+            remaining = len(roots)
+            while remaining:
+                item = results.get()
+                if item is done:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            stop.set()
+            executor.shutdown(wait=False)
+
+    def _scan_directory(self, root: str, directory: str,
+                        semaphore: threading.Semaphore) -> Tuple[List[FileEntry], List[str]]:
+        """List one directory: (files, subdirectories)"""
+        files: List[FileEntry] = []
+        subdirs: List[str] = []
+        with semaphore:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if self.prune is None or not self.prune.should_prune(entry.path, entry.name):
+                                    subdirs.append(entry.path)
+                            elif entry.is_file():
+                                stat = entry.stat()
+                                files.append(FileEntry(root, entry.path, entry.name, stat.st_size, stat.st_mtime))
+                        except OSError:
+                            continue
+            except OSError:
+                pass
+        return files, subdirs
+
+    def iter_breadth_first(self, roots: List[str], deadline: Optional[float] = None,
+                           max_depth: Optional[int] = None,
+                           progress: Optional[Dict[str, Any]] = None) -> Iterator[FileEntry]:
+        """
+        Yield files from all roots one depth level at a time until a deadline
+
+        Every root's depth-0 files are listed before any root's depth-1
+        files, so when time runs out the shallow (most likely) parts of all
+        roots have been seen. Directories within a level are scanned in
+        parallel, bounded per device, and their files are yielded as each
+        directory finishes.
+
+        Args:
+            roots: Directories to crawl
+            deadline: time.monotonic() value to stop at, or None
+            max_depth: Number of levels to crawl, or None for no limit
+            progress: Optional dict; progress["exhaustive"] is set to True
+                only if every level was crawled, and progress["directories"]
+                lists every directory whose listing was read
+        """
+        if progress is None:
+            progress = {}
+        progress["exhaustive"] = False
+        visited = progress.setdefault("directories", [])
+
+        semaphores = {root: self._device_semaphore(root) for root in roots}
+        frontier = [(root, root) for root in roots]
+        depth = 0
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="file-crawler")
+        try:
+            while frontier:
+                if max_depth is not None and depth >= max_depth:
+                    return
+                if deadline is not None and time.monotonic() >= deadline:
+                    return
+
+                futures = {
+                    executor.submit(self._scan_directory, root, directory, semaphores[root]): (root, directory)
+                    for root, directory in frontier
+                }
+                next_frontier = []
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    for future in as_completed(futures, timeout=timeout):
+                        root, directory = futures[future]
+                        level_files, subdirs = future.result()
+                        visited.append(directory)
+                        next_frontier.extend((root, subdir) for subdir in subdirs)
+                        yield from level_files
+                except FutureTimeoutError:
+                    # Files from directories finished so far were already yielded
+                    return
+
+                frontier = next_frontier
+                depth += 1
+            progress["exhaustive"] = True
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def crawl_breadth_first(self, roots: List[str], deadline: Optional[float] = None,
+                            max_depth: Optional[int] = None) -> Tuple[Dict[str, List[FileEntry]], bool]:
+        """
+        Breadth-first crawl grouped by root
+
+        Returns:
+            (files grouped by root, True if the crawl finished every level)
+        """
+        files: Dict[str, List[FileEntry]] = {root: [] for root in roots}
+        progress: Dict[str, Any] = {}
+        for entry in self.iter_breadth_first(roots, deadline, max_depth, progress):
+            files[entry.root].append(entry)
+        return files, progress["exhaustive"]
+
+    def crawl(self, roots: List[str], max_depth: Optional[int] = None) -> Dict[str, List[FileEntry]]:
+        """Crawl roots concurrently and group the files by root"""
+        files: Dict[str, List[FileEntry]] = {root: [] for root in roots}
+        for entry in self.iter_files(roots, max_depth):
+            files[entry.root].append(entry)
+        return files
+
+
+# Global crawler instance
+file_crawler = ParallelCrawler()
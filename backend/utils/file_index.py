@@ -0,0 +1,589 @@
+"""
+Persistent File Index for AI Task Automation Assistant
+Keeps an on-disk index of files under the search locations so FileSearch
+queries do not have to re-walk the file system on every command
+"""
+
+import heapq
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set, Callable
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+from config import config
+from utils.compact_index import CompactIndex, CompactIndexError, word_starts, write_compact_index
+from utils.file_crawler import FileEntry, file_crawler, scan_tree
+from utils.prune_rules import prune_rules
+
+JOURNAL_VERSION = 1
+
+# Pending changes that trigger a rewrite of the snapshot instead of the journal
+COMPACT_THRESHOLD = 20000
+
+
+def make_record(root: str, path: str, size: int, mtime: float) -> FileEntry:
+    """Build an index record for a single file"""
+    return FileEntry(root, path, os.path.basename(path), size, mtime)
+
+
+class _RootEventHandler(FileSystemEventHandler):
+    """Applies watchdog events for one indexed root to the FileIndex"""
+
+    def __init__(self, file_index: "FileIndex", root: str):
+        super().__init__()
+        self.file_index = file_index
+        self.root = root
+
+    def _ignored(self, path: str, is_directory: bool) -> bool:
+        # Changes inside pruned trees (node_modules, .git, ...) are not indexed
+        if is_directory and prune_rules.should_prune(path):
+            return True
+        return prune_rules.excludes(path, self.root)
+
+    def on_created(self, event):
+        if self._ignored(event.src_path, event.is_directory):
+            return
+        if event.is_directory:
+            self.file_index.index_directory(self.root, event.src_path)
+        else:
+            self.file_index.update_file(self.root, event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory and not self._ignored(event.src_path, False):
+            self.file_index.update_file(self.root, event.src_path)
+
+    def on_deleted(self, event):
+        self.file_index.remove_path(self.root, event.src_path)
+
+    def on_moved(self, event):
+        self.file_index.remove_path(self.root, event.src_path)
+        if self._ignored(event.dest_path, event.is_directory):
+            return
+        if event.is_directory:
+            self.file_index.index_directory(self.root, event.dest_path)
+        else:
+            self.file_index.update_file(self.root, event.dest_path)
+
+
+class FileIndex:
+    """
+    Incremental file index keyed by search root
+    Roots are crawled once in the background into a memory-mapped snapshot
+    (see utils.compact_index) and then kept current through watchdog
+    events, which go to a small in-memory overlay persisted as a journal
+    until the next snapshot rewrite
+    """
+
+    def __init__(self, index_file: Optional[str] = None, save_delay: float = 5.0):
+        """
+        Initialize file index
+
+        Args:
+            index_file: Path to the snapshot file (relative to backend directory)
+            save_delay: Seconds to wait after a change before persisting
+        """
+        backend_dir = Path(__file__).parent.parent
+        self.index_file = backend_dir / (index_file or config.FILE_INDEX_FILE)
+        self.journal_file = self.index_file.with_suffix('.journal')
+        self.save_delay = save_delay
+
+        # Memory-mapped snapshot of every crawled root
+        self._base: Optional[CompactIndex] = None
+        # root -> time the last full crawl finished
+        self.indexed_at: Dict[str, float] = {}
+        # Changes since the snapshot: root -> {path -> record} for added or
+        # modified files, and paths whose snapshot rows are hidden
+        self._overlay: Dict[str, Dict[str, FileEntry]] = {}
+        self._removed: Set[str] = set()
+        # Bumped on every change so callers can detect stale derived data
+        self.generation = 0
+
+        self._lock = threading.RLock()
+        self._pending: set = set()
+        self._fresh: set = set()  # roots crawled during this session
+        self._save_timer: Optional[threading.Timer] = None
+        self._observer = None
+        self._watched: set = set()
+        self._listeners: List[Callable[[], None]] = []
+
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        """Map the snapshot and replay the journal written since it"""
+        if not self.index_file.exists():
+            return
+        try:
+            self._base = CompactIndex(str(self.index_file))
+            self.indexed_at = {root: indexed_at for root, (_, _, indexed_at) in self._base.roots.items()}
+        except CompactIndexError as e:
+            print(f"[INFO] FileIndex: Ignoring index file: {e}")
+            return
+
+        try:
+            if self.journal_file.exists():
+                with open(self.journal_file, 'r', encoding='utf-8') as f:
+                    journal = json.load(f)
+                if journal.get("version") == JOURNAL_VERSION and journal.get("snapshot") == self._base.snapshot_id:
+                    for root, path, size, mtime in journal.get("files", []):
+                        self._overlay.setdefault(root, {})[path] = make_record(root, path, size, mtime)
+                    self._removed.update(journal.get("removed", []))
+        except Exception as e:
+            print(f"[ERROR] FileIndex: Failed to load journal: {e}")
+            self._overlay = {}
+            self._removed = set()
+
+        print(f"[INFO] FileIndex: Mapped {self.file_count()} files in {len(self.indexed_at)} roots")
+
+    def _current_entries(self, root: str) -> List[FileEntry]:
+        """Snapshot rows merged with the overlay (caller holds the lock)"""
+        entries = []
+        if self._base is not None and root in self._base.roots:
+            removed = self._removed
+            for row in self._base.rows(root):
+                entry = self._base.entry(root, row)
+                if entry.path not in removed:
+                    entries.append(entry)
+        entries.extend(self._overlay.get(root, {}).values())
+        return entries
+
+    def _write_snapshot(self, replacements: Optional[Dict[str, List[FileEntry]]] = None):
+        """
+        Rewrite the snapshot with the overlay folded in
+
+        Args:
+            replacements: root -> freshly crawled entries that replace
+                whatever was indexed for that root
+        """
+        replacements = replacements or {}
+        with self._lock:
+            now = time.time()
+            roots = {}
+            for root in list(self.indexed_at) + [r for r in replacements if r not in self.indexed_at]:
+                if root in replacements:
+                    roots[root] = (now, replacements[root])
+                else:
+                    roots[root] = (self.indexed_at[root], self._current_entries(root))
+
+            # The old mapping must be closed before the file can be replaced on Windows
+            if self._base is not None:
+                self._base.close()
+                self._base = None
+            try:
+                write_compact_index(str(self.index_file), roots)
+                self._base = CompactIndex(str(self.index_file))
+            except Exception as e:
+                print(f"[ERROR] FileIndex: Failed to write index: {e}")
+                # Keep serving from memory until the next successful write
+                for root, (_, entries) in roots.items():
+                    self._overlay[root] = {entry.path: entry for entry in entries}
+                self._removed = set()
+                self.indexed_at.update({root: indexed_at for root, (indexed_at, _) in roots.items()})
+                self.generation += 1
+                return
+
+            self.indexed_at = {root: indexed_at for root, (indexed_at, _) in roots.items()}
+            self._overlay = {}
+            self._removed = set()
+            self.generation += 1
+            try:
+                self.journal_file.unlink()
+            except OSError:
+                pass
+
+    def save(self):
+        """Persist pending changes: a journal for small overlays, a new snapshot otherwise"""
+        with self._lock:
+            if self._base is None or self._pending_changes() >= COMPACT_THRESHOLD:
+                if self.indexed_at:
+                    self._write_snapshot()
+                return
+            journal = {
+                "version": JOURNAL_VERSION,
+                "snapshot": self._base.snapshot_id,
+                "files": [
+                    [r.root, r.path, r.size, r.mtime]
+                    for records in self._overlay.values() for r in records.values()
+                ],
+                "removed": list(self._removed)
+            }
+
+        try:
+            tmp_file = self.journal_file.with_suffix('.journal.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(journal, f)
+            os.replace(tmp_file, self.journal_file)
+        except Exception as e:
+            print(f"[ERROR] FileIndex: Failed to save journal: {e}")
+
+    def _pending_changes(self) -> int:
+        return len(self._removed) + sum(len(records) for records in self._overlay.values())
+
+    def _schedule_save(self):
+        """Debounce saves so bursts of file events cause a single write"""
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(self.save_delay, self._flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _flush(self):
+        with self._lock:
+            self._save_timer = None
+        self.save()
+        self._notify()
+
+    def add_listener(self, callback: Callable[[], None]):
+        """Call callback (without arguments) whenever indexed files change"""
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def _notify(self):
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[ERROR] FileIndex: Listener failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Building and updating
+    # ------------------------------------------------------------------
+
+    def is_indexed(self, root: str) -> bool:
+        """True once a full crawl of the root has completed"""
+        return root in self.indexed_at
+
+    def ensure_indexed(self, roots: List[str], background: bool = True):
+        """
+        Make sure every root is indexed and watched
+
+        Roots loaded from disk are re-crawled so changes made while the
+        assistant was not running are picked up; until a root's first
+        crawl finishes, callers should fall back to a live walk.
+        """
+        with self._lock:
+            todo = [root for root in roots if root not in self._pending and root not in self._fresh]
+            self._pending.update(todo)
+
+        if not todo:
+            return
+
+        if background:
+            thread = threading.Thread(target=self._index_roots, args=(todo,), daemon=True)
+            thread.start()
+        else:
+            self._index_roots(todo)
+
+    def _index_roots(self, roots: List[str]):
+        start = time.time()
+        try:
+            # All roots are crawled concurrently, bounded per device
+            crawled = file_crawler.crawl(roots)
+        except Exception as e:
+            print(f"[ERROR] FileIndex: Crawl failed: {e}")
+            crawled = {}
+
+        try:
+            if crawled:
+                self._install_roots(crawled)
+                for root, entries in crawled.items():
+                    print(f"[INFO] FileIndex: Indexed {len(entries)} files in {root} ({time.time() - start:.2f}s)")
+            for root in roots:
+                self._watch(root)
+        except Exception as e:
+            print(f"[ERROR] FileIndex: Failed to index {roots}: {e}")
+        finally:
+            with self._lock:
+                self._pending.difference_update(roots)
+        self._notify()
+
+    def index_root(self, root: str):
+        """Crawl a root from scratch and replace its records"""
+        self._install_roots({root: list(scan_tree(root))})
+
+    def _install_roots(self, crawled: Dict[str, List[FileEntry]]):
+        """Replace the records of freshly crawled roots and write a new snapshot"""
+        with self._lock:
+            # Changes under these roots are superseded by the crawl
+            for root in crawled:
+                self._overlay.pop(root, None)
+            self._write_snapshot(crawled)
+            self._fresh.update(crawled)
+
+    def index_directory(self, root: str, directory: str):
+        """Add every file below a newly created or moved-in directory"""
+        with self._lock:
+            records = self._overlay.setdefault(root, {})
+            for entry in scan_tree(directory):
+                records[entry.path] = entry._replace(root=root)
+                self._removed.add(entry.path)
+            self.generation += 1
+        self._schedule_save()
+
+    def update_file(self, root: str, path: str):
+        """Add or refresh the record for one file"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.remove_path(root, path)
+            return
+
+        with self._lock:
+            self._overlay.setdefault(root, {})[path] = make_record(root, path, stat.st_size, stat.st_mtime)
+            # Hide any snapshot row for the same path; the overlay copy wins
+            self._removed.add(path)
+            self.generation += 1
+        self._schedule_save()
+
+    def remove_path(self, root: str, path: str):
+        """Remove a file, or every file below a directory, from the index"""
+        with self._lock:
+            prefix = path.rstrip(os.sep) + os.sep
+            changed = False
+
+            records = self._overlay.get(root)
+            if records:
+                stale_paths = [p for p in records if p == path or p.startswith(prefix)]
+                for stale in stale_paths:
+                    del records[stale]
+                changed = bool(stale_paths)
+
+            if self._base is not None and root in self._base.roots:
+                if self._base.find_path(root, path) is not None:
+                    self._removed.add(path)
+                    changed = True
+                else:
+                    for row in self._base.prefix_rows(root, prefix):
+                        self._removed.add(self._base.path(row))
+                        changed = True
+
+            if changed:
+                self.generation += 1
+        self._schedule_save()
+
+    # ------------------------------------------------------------------
+    # Watching
+    # ------------------------------------------------------------------
+
+    def _watch(self, root: str):
+        """Start receiving change events for a root"""
+        if not WATCHDOG_AVAILABLE:
+            return
+
+        with self._lock:
+            if root in self._watched:
+                return
+            try:
+                if self._observer is None:
+                    self._observer = Observer()
+                    self._observer.daemon = True
+                    self._observer.start()
+                self._observer.schedule(_RootEventHandler(self, root), root, recursive=True)
+                self._watched.add(root)
+            except Exception as e:
+                print(f"[ERROR] FileIndex: Cannot watch {root}: {e}")
+
+    def stop(self):
+        """Stop watching and persist pending changes"""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+            self._watched.clear()
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+        self.save()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def files(self, root: str) -> List[FileEntry]:
+        """Snapshot of all records under an indexed root"""
+        with self._lock:
+            return self._current_entries(root)
+
+    def find(self, root: str, substrings: List[str]) -> Optional[List[FileEntry]]:
+        """
+        Records under root whose name contains any of the substrings
+
+        Snapshot rows come from the mapped trigram postings (see
+        CompactIndex.find_substring), so only candidate rows are read and
+        only matching rows are turned into records.
+        Returns None if the root is not indexed.
+        """
+        with self._lock:
+            if root not in self.indexed_at:
+                return None
+
+            matches: Dict[str, FileEntry] = {}
+            if self._base is not None and root in self._base.roots:
+                rows: Set[int] = set()
+                for substring in substrings:
+                    rows.update(self._base.find_substring(root, substring))
+                for row in rows:
+                    entry = self._base.entry(root, row)
+                    if entry.path not in self._removed:
+                        matches[entry.path] = entry
+
+            substrings_lower = [substring.lower() for substring in substrings]
+            for path, entry in self._overlay.get(root, {}).items():
+                name_lower = entry.name.lower()
+                if any(substring in name_lower for substring in substrings_lower):
+                    matches[path] = entry
+
+            return list(matches.values())
+
+    def recent_by_extension(self, root: str, extensions: List[str], limit: int) -> Optional[List[FileEntry]]:
+        """
+        The most recently modified records under root with any of the
+        extensions, newest first
+
+        Reads at most limit rows from each snapshot extension bucket.
+        Returns None if the root is not indexed.
+        """
+        extensions = {extension.lower() for extension in extensions}
+        with self._lock:
+            if root not in self.indexed_at:
+                return None
+
+            candidates: List[FileEntry] = []
+            if self._base is not None:
+                for extension in extensions:
+                    taken = 0
+                    for row in self._base.extension_rows(root, extension):
+                        if taken >= limit:
+                            break
+                        entry = self._base.entry(root, row)
+                        if entry.path not in self._removed:
+                            candidates.append(entry)
+                            taken += 1
+
+            candidates.extend(
+                entry for entry in self._overlay.get(root, {}).values()
+                if entry.extension in extensions
+            )
+            return heapq.nlargest(limit, candidates, key=lambda entry: entry.mtime)
+
+    def suggest(self, query: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """
+        Newest files whose name, or a word in it, starts with the query
+
+        The query's longest word (the last one on a tie, as it is usually
+        still being typed) is looked up in the snapshot's sorted word
+        starts (see CompactIndex.word_prefix_rows); the other words must
+        occur anywhere in the name. Overlay records are matched the same way.
+        """
+        words = query.lower().split()
+        if not words:
+            return []
+        prefix = max(reversed(words), key=len)
+        others = list(words)
+        others.remove(prefix)
+        needle = prefix.encode("utf-8", "surrogateescape")
+
+        def matches(name: str) -> bool:
+            name_lower = name.lower()
+            return all(word in name_lower for word in others)
+
+        with self._lock:
+            candidates: List[FileEntry] = []
+            if self._base is not None:
+                for row in self._base.word_prefix_rows(prefix):
+                    if len(candidates) >= limit:
+                        break
+                    row = int(row)
+                    if not matches(self._base.name(row)):
+                        continue
+                    root = self._base.root_of(row)
+                    if root not in self.indexed_at:
+                        continue
+                    entry = self._base.entry(root, row)
+                    if entry.path not in self._removed:
+                        candidates.append(entry)
+
+            for records in self._overlay.values():
+                for entry in records.values():
+                    lower = entry.name.lower().encode("utf-8", "surrogateescape")
+                    if matches(entry.name) and any(
+                            lower.startswith(needle, start) for start in word_starts(lower)):
+                        candidates.append(entry)
+
+        return [
+            {"name": entry.name, "path": entry.path, "size": entry.size, "mod_time": entry.mtime}
+            for entry in heapq.nlargest(limit, candidates, key=lambda entry: entry.mtime)
+        ]
+
+    @property
+    def snapshot_id(self) -> Optional[int]:
+        """Id of the mapped snapshot; changes whenever it is rewritten"""
+        with self._lock:
+            return self._base.snapshot_id if self._base is not None else None
+
+    def lower_names(self, snapshot: bool = True) -> List[str]:
+        """
+        Lowercased names of every record (may include hidden snapshot rows)
+
+        Args:
+            snapshot: False to list only changes made since the last snapshot
+        """
+        with self._lock:
+            names = self._base.lower_names() if snapshot and self._base is not None else []
+            for records in self._overlay.values():
+                names.extend(entry.name.lower() for entry in records.values())
+            return names
+
+    def overlay_entries(self) -> List[FileEntry]:
+        """Records added or modified since the last snapshot"""
+        with self._lock:
+            return [entry for records in self._overlay.values() for entry in records.values()]
+
+    def removed_paths(self) -> Set[str]:
+        """Paths whose snapshot rows are hidden (deleted, or superseded by the overlay)"""
+        with self._lock:
+            return set(self._removed)
+
+    def file_count(self) -> int:
+        with self._lock:
+            return sum(self._root_count(root) for root in self.indexed_at)
+
+    def _root_count(self, root: str) -> int:
+        base_rows = len(self._base.rows(root)) if self._base is not None else 0
+        # Approximate until the next snapshot: hidden snapshot rows still count
+        return base_rows + len(self._overlay.get(root, {}))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index statistics for diagnostics"""
+        with self._lock:
+            return {
+                "roots": {root: self._root_count(root) for root in self.indexed_at},
+                "indexed": list(self.indexed_at.keys()),
+                "pending": list(self._pending),
+                "pending_changes": self._pending_changes(),
+                "snapshot_bytes": os.path.getsize(self.index_file) if self._base is not None else 0,
+                "watching": WATCHDOG_AVAILABLE and bool(self._watched),
+                "total_files": sum(self._root_count(root) for root in self.indexed_at)
+            }
+
+
+# Global file index instance
+file_index = FileIndex()
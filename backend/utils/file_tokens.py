@@ -0,0 +1,82 @@
+"""
+Download Tokens for AI Task Automation Assistant
+Short-lived opaque tokens that let a client fetch one search result over
+HTTP without the server accepting arbitrary file paths
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from config import config
+
+# Live tokens kept at most; the oldest are dropped first
+MAX_TOKENS = 10000
+
+
+class FileTokenStore:
+    """
+    Maps random tokens to file paths until they expire
+
+    A path that already has a token with more than half its lifetime left
+    gets the same token again, so repeated searches do not mint new URLs.
+    Tokens live in memory only and die with the process.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_tokens: int = MAX_TOKENS):
+        """
+        Initialize token store
+
+        Args:
+            ttl: Seconds a token stays valid
+            max_tokens: Upper bound on live tokens
+        """
+        self.ttl = ttl or config.FILE_TOKEN_TTL
+        self.max_tokens = max_tokens
+        # token -> (path, expires at); insertion order is expiry order
+        self._tokens: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._by_path: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _purge(self, now: float):
+        while self._tokens:
+            token, (path, expires) = next(iter(self._tokens.items()))
+            if expires > now and len(self._tokens) <= self.max_tokens:
+                break
+            del self._tokens[token]
+            if self._by_path.get(path) == token:
+                del self._by_path[path]
+
+    def issue(self, path: str) -> str:
+        """Token granting access to path for the next ttl seconds"""
+        now = time.time()
+        with self._lock:
+            token = self._by_path.get(path)
+            if token is not None and self._tokens[token][1] - now > self.ttl / 2:
+                return token
+
+            token = secrets.token_urlsafe(18)
+            self._tokens[token] = (path, now + self.ttl)
+            self._by_path[path] = token
+            self._purge(now)
+            return token
+
+    def resolve(self, token: str) -> Optional[str]:
+        """Path for a live token, or None if it is unknown or expired"""
+        with self._lock:
+            record = self._tokens.get(token)
+        if record is None or record[1] <= time.time():
+            return None
+        return record[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "tokens": len(self._tokens),
+            "ttl": self.ttl
+        }
+
+
+# Global download token store
+file_tokens = FileTokenStore()
@@ -0,0 +1,144 @@
+"""
+Frecency Store for AI Task Automation Assistant
+Remembers which files the user actually opens or shares through the
+assistant, so file search can rank them first next time
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from config import config
+
+FRECENCY_STORE_VERSION = 1
+
+# How much one use counts, by action
+ACTION_WEIGHTS = {
+    "open": 1.0,
+    "share": 2.0,
+}
+
+
+class FrecencyStore:
+    """
+    Persistent frequency x recency score per file path
+
+    Every use adds its action weight to the file's score, and scores decay
+    exponentially with a configurable half-life. Each record keeps its
+    score as of its last use, so decaying costs nothing until it is read.
+    """
+
+    def __init__(self, store_file: Optional[str] = None, half_life_days: Optional[float] = None,
+                 max_entries: Optional[int] = None):
+        """
+        Initialize frecency store
+
+        Args:
+            store_file: Path to JSON store file (relative to backend directory)
+            half_life_days: Days after which a use counts half as much
+            max_entries: Files remembered; the lowest scores are forgotten first
+        """
+        backend_dir = Path(__file__).parent.parent
+        self.store_file = backend_dir / (store_file or config.FRECENCY_STORE_FILE)
+        self.half_life = (half_life_days or config.FRECENCY_HALF_LIFE_DAYS) * 86400
+        self.max_entries = max_entries or config.FRECENCY_MAX_ENTRIES
+
+        # path -> [score at last use, last use timestamp, use count]
+        self.entries: Dict[str, list] = {}
+        # Bumped on every use so cached search results can be invalidated
+        self.generation = 0
+
+        self._lock = threading.Lock()
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        """Load the persisted store, ignoring files from other versions"""
+        try:
+            if not self.store_file.exists():
+                return
+            with open(self.store_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != FRECENCY_STORE_VERSION:
+                print(f"[INFO] FrecencyStore: Ignoring store with version {data.get('version')}")
+                return
+            self.entries = {path: list(entry) for path, entry in data.get("files", {}).items()}
+            print(f"[INFO] FrecencyStore: Loaded {len(self.entries)} files")
+        except Exception as e:
+            print(f"[ERROR] FrecencyStore: Failed to load store: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Write the store to disk atomically"""
+        with self._lock:
+            data = {"version": FRECENCY_STORE_VERSION, "files": dict(self.entries)}
+
+        try:
+            tmp_file = self.store_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_file, self.store_file)
+        except Exception as e:
+            print(f"[ERROR] FrecencyStore: Failed to save store: {e}")
+
+    # ------------------------------------------------------------------
+    # Scores
+    # ------------------------------------------------------------------
+
+    def _decayed(self, entry: list, now: float) -> float:
+        score, last_used, _ = entry
+        return score * math.pow(0.5, max(0.0, now - last_used) / self.half_life)
+
+    def record(self, path: str, action: str = "open"):
+        """Count one use of a file (action "open" or "share") and persist it"""
+        if not path:
+            return
+        path = os.path.abspath(path)
+        now = time.time()
+        weight = ACTION_WEIGHTS.get(action, 1.0)
+
+        with self._lock:
+            entry = self.entries.get(path)
+            if entry is None:
+                self.entries[path] = [weight, now, 1]
+            else:
+                self.entries[path] = [self._decayed(entry, now) + weight, now, entry[2] + 1]
+
+            if len(self.entries) > self.max_entries:
+                ranked = sorted(self.entries, key=lambda p: self._decayed(self.entries[p], now))
+                for stale in ranked[:len(self.entries) - self.max_entries]:
+                    del self.entries[stale]
+            self.generation += 1
+
+        print(f"[DEBUG] FrecencyStore: Recorded {action} of {os.path.basename(path)}")
+        self.save()
+
+    def score(self, path: str) -> float:
+        """Current frecency of a file (0 if never used)"""
+        with self._lock:
+            entry = self.entries.get(path)
+            return self._decayed(entry, time.time()) if entry is not None else 0.0
+
+    def scores(self) -> Dict[str, float]:
+        """Current frecency of every remembered file"""
+        now = time.time()
+        with self._lock:
+            return {path: self._decayed(entry, now) for path, entry in self.entries.items()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "files": len(self.entries),
+            "half_life_days": self.half_life / 86400,
+            "store_file": str(self.store_file)
+        }
+
+
+# Global frecency store instance
+frecency_store = FrecencyStore()
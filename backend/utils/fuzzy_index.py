@@ -0,0 +1,224 @@
+"""
+Typo-Tolerant Filename Token Index for AI Task Automation Assistant
+BK-tree over the words that appear in indexed filenames, so a misheard
+query word ("quartly") resolves to the closest real token ("quarterly")
+without comparing it against every file
+"""
+
+import re
+import threading
+import time
+from typing import Dict, List, Any, Optional, Tuple, Iterable
+
+try:
+    from rapidfuzz.distance import Levenshtein as _RapidLevenshtein
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    _RapidLevenshtein = None
+    RAPIDFUZZ_AVAILABLE = False
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+MIN_TOKEN_LENGTH = 3
+MAX_TOKEN_LENGTH = 32
+
+
+def filename_tokens(name_lower: str) -> Iterable[str]:
+    """Words of a lowercased filename worth indexing"""
+    for token in TOKEN_PATTERN.findall(name_lower):
+        if MIN_TOKEN_LENGTH <= len(token) <= MAX_TOKEN_LENGTH and not token.isdigit():
+            yield token
+
+
+class _Pattern:
+    """
+    A word prepared for bit-parallel edit distance (Myers/Hyyro), which
+    costs a handful of integer operations per character of the other word
+    """
+    __slots__ = ("word", "length", "peq", "mask", "last")
+
+    def __init__(self, word: str):
+        self.word = word
+        self.length = len(word)
+        self.peq: Dict[str, int] = {}
+        for i, char in enumerate(word):
+            self.peq[char] = self.peq.get(char, 0) | (1 << i)
+        self.mask = (1 << self.length) - 1
+        self.last = 1 << (self.length - 1) if word else 0
+
+    def distance(self, other: str) -> int:
+        if RAPIDFUZZ_AVAILABLE:
+            return _RapidLevenshtein.distance(self.word, other)
+        if not self.length:
+            return len(other)
+        peq, mask, last = self.peq, self.mask, self.last
+        pv, mv, score = mask, 0, self.length
+        for char in other:
+            eq = peq.get(char, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & mask)
+            mh = pv & xh
+            if ph & last:
+                score += 1
+            elif mh & last:
+                score -= 1
+            ph = ((ph << 1) | 1) & mask
+            mh = (mh << 1) & mask
+            pv = mh | (~(xv | ph) & mask)
+            mv = ph & xv
+        return score
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over a metric (edit distance)
+
+    Each child edge is labelled with its distance to the parent, so by the
+    triangle inequality a search for words within k of the query only
+    follows edges labelled d - k .. d + k.
+    """
+
+    def __init__(self):
+        # node: [word, {distance: child node}]
+        self._root: Optional[list] = None
+        self.size = 0
+
+    def add(self, word: str):
+        if self._root is None:
+            self._root = [word, {}]
+            self.size = 1
+            return
+        pattern = _Pattern(word)
+        node = self._root
+        while True:
+            distance = pattern.distance(node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [word, {}]
+                self.size += 1
+                return
+            node = child
+
+    def search(self, word: str, max_distance: int) -> List[Tuple[int, str]]:
+        """(distance, word) pairs within max_distance, closest first"""
+        if self._root is None:
+            return []
+        pattern = _Pattern(word)
+        matches = []
+        stack = [self._root]
+        while stack:
+            node_word, children = stack.pop()
+            distance = pattern.distance(node_word)
+            if distance <= max_distance:
+                matches.append((distance, node_word))
+            low, high = distance - max_distance, distance + max_distance
+            for edge, child in children.items():
+                if low <= edge <= high:
+                    stack.append(child)
+        matches.sort()
+        return matches
+
+
+def typo_budget(word: str) -> int:
+    """Edits tolerated for a query word: none for short words, 2 for long ones"""
+    if len(word) < 4:
+        return 0
+    return 1 if len(word) <= 5 else 2
+
+
+class FilenameTokenIndex:
+    """
+    BK-tree of the tokens in every indexed filename
+    Rebuilt in the background when the FileIndex snapshot changes; tokens
+    from newer files are added incrementally
+    """
+
+    def __init__(self):
+        self._tree = BKTree()
+        self._lock = threading.Lock()
+        self._file_index = None
+        self._snapshot_id: Optional[int] = None
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_requested = False
+
+    def start(self, file_index):
+        """Follow a FileIndex: build now and refresh whenever its files change"""
+        with self._lock:
+            if self._file_index is file_index:
+                return
+            self._file_index = file_index
+        file_index.add_listener(self.schedule_refresh)
+        self.schedule_refresh()
+
+    def schedule_refresh(self):
+        """Run a refresh in the background, coalescing overlapping requests"""
+        with self._lock:
+            self._refresh_requested = True
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(target=self._refresh_loop, daemon=True)
+            self._refresh_thread.start()
+
+    def _refresh_loop(self):
+        while True:
+            with self._lock:
+                if not self._refresh_requested:
+                    return
+                self._refresh_requested = False
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[ERROR] FilenameTokenIndex: Refresh failed: {e}")
+
+    def refresh(self):
+        file_index = self._file_index
+        if file_index is None:
+            return
+
+        snapshot_id = file_index.snapshot_id
+        if snapshot_id != self._snapshot_id:
+            # New snapshot: build a fresh tree off to the side and swap it in
+            start = time.time()
+            tree = BKTree()
+            for token in self._tokens(file_index.lower_names()):
+                tree.add(token)
+            with self._lock:
+                self._tree = tree
+                self._snapshot_id = snapshot_id
+            print(f"[INFO] FilenameTokenIndex: Indexed {tree.size} tokens ({time.time() - start:.2f}s)")
+        else:
+            tokens = self._tokens(file_index.lower_names(snapshot=False))
+            with self._lock:
+                for token in tokens:
+                    self._tree.add(token)
+
+    def _tokens(self, names: Iterable[str]) -> List[str]:
+        tokens = set()
+        for name in names:
+            tokens.update(filename_tokens(name))
+        return sorted(tokens)
+
+    def closest(self, word: str, max_distance: Optional[int] = None) -> List[Tuple[int, str]]:
+        """
+        Indexed tokens within max_distance edits of word, closest first
+
+        Defaults to typo_budget(word); an exact token is returned with
+        distance 0.
+        """
+        word = word.lower()
+        if max_distance is None:
+            max_distance = typo_budget(word)
+        with self._lock:
+            return self._tree.search(word, max_distance)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "tokens": self._tree.size,
+            "rapidfuzz": RAPIDFUZZ_AVAILABLE
+        }
+
+
+# Global filename token index instance
+filename_token_index = FilenameTokenIndex()
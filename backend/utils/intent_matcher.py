@@ -0,0 +1,225 @@
+"""
+Compiled Intent Matcher for AI Task Automation Assistant
+Finds every routing keyword in a command in one regex pass instead of one
+substring scan per keyword list, and exposes the hits as a small scoring
+API for the routing rules
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Pattern, Set
+
+# Keyword lists used by AgentManager routing, MultiTaskOrchestrator and
+# ConversationAgent. Keywords match as whole words, including their plain
+# inflections ("emails", "calling"); phrases allow any whitespace between
+# their words.
+ROUTING_KEYWORDS: Dict[str, List[str]] = {
+    # Agent intents
+    "file": ["find", "search", "open", "ownership", "folder", "photo", "video", "pdf", "doc", "docx", "excel",
+             "presentation", "report"],
+    "whatsapp": ["whatsapp", "message", "send to", "text", "tell", "let know", "inform", "send whatsapp",
+                 "whatsapp to", "message to", "share"],
+    "email": ["email", "send email", "compose email", "draft email", "mail to"],
+    "calendar": ["calendar", "schedule", "meeting", "appointment", "event", "remind me at"],
+    "phone": ["call", "phone", "dial", "ring", "make a call"],
+    "payment": ["pay", "payment", "send money", "transfer", "paypal", "googlepay", "paytm", "phonepe"],
+    "app": ["open", "launch", "start", "run", "chrome", "browser", "notepad", "calculator"],
+    "websearch": ["google", "search for", "look up", "find on google", "youtube", "browse"],
+    "task": ["task", "todo", "remind me", "reminder", "add task", "create task", "list tasks"],
+    "screenshot": ["screenshot", "capture screen", "screen capture", "take screenshot", "capture",
+                   "take a screenshot"],
+    "system_control": ["volume", "mute", "unmute", "lock", "shutdown", "restart", "reboot", "sleep", "hibernate",
+                       "louder", "quieter", "volume up", "volume down", "increase volume", "decrease volume",
+                       "lock screen", "shut down", "turn off", "brightness", "brightness up", "brightness down",
+                       "brighter", "dimmer", "battery", "battery status", "battery level", "time", "what time",
+                       "current time", "what's the time"],
+
+    # Question and operation cues
+    "capability_question": ["can you", "are you able", "do you", "what can", "how do", "tell me about", "what is",
+                            "explain", "why", "how"],
+    "general_question": ["what", "how", "why", "when", "where", "who", "?"],
+    "file_operation": ["find", "search", "open", "locate", "show me"],
+    "whatsapp_command": ["send whatsapp", "whatsapp to", "message to", "text to"],
+    "operation_word": ["find", "search", "open", "send"],
+    "send": ["send"],
+
+    # Cues that a command needs the AI enhancement rewrite (PreRouter)
+    "vague_reference": ["thing", "things", "stuff", "something", "whatever", "whatsit", "that one", "the one"],
+    "shorthand": ["msg", "pls", "plz", "u", "ur", "thx", "tmrw", "tmr", "abt", "bcoz", "coz", "wanna", "gonna"],
+
+    # Agents MultiTaskOrchestrator counts to spot commands spanning several
+    "multi_task:filesearch": ["find", "search", "file", "document", "pdf", "photo"],
+    "multi_task:whatsapp": ["whatsapp", "message", "send message"],
+    "multi_task:email": ["email", "send email", "mail"],
+    "multi_task:screenshot": ["screenshot", "capture screen", "take screenshot"],
+    "multi_task:phone": ["call", "phone", "dial"],
+}
+
+# Regex rules matched against the lowercased command
+ROUTING_PATTERNS: Dict[str, List[str]] = {
+    # Commands that chain several agents
+    "multi_task": [
+        # File + Communication
+        r"(find|search|open|get).*(?:file|document|pdf|photo).*(?:send|share|email|whatsapp)",
+        r"(send|share|email|whatsapp).*(file|document|pdf|photo)",
+        # Screenshot + Communication
+        r"(take|capture).*screenshot.*(?:send|share|email|whatsapp)",
+        r"screenshot.*(?:and|then).*(?:send|share|email)",
+        # Sequential actions with "and then" or "and"
+        r".*\s+and\s+(then\s+)?(?:send|email|call|message|whatsapp)",
+        # Multiple actions explicitly stated
+        r"(first|then|after that|next)",
+    ],
+    # Task commands that are never small talk
+    "task_command": [
+        r"\b(send|message|text|whatsapp)\s+\w+\s+to\b",  # "send/message/text X to Y"
+        r"\b(send whatsapp|whatsapp to|message to|text to)\b",  # WhatsApp specific patterns
+        r"\b(find|search|open|locate)\s+\w+",  # File operations
+        r"\b(share|send)\s+\w+\s+(via|on|through)\s+whatsapp\b",  # Sharing patterns
+    ],
+    # Whole-command small talk
+    "conversational": [
+        r"^\s*(hi|hello|hey|good morning|good afternoon|good evening)\s*$",  # Pure greetings
+        r"^\s*(how are you|what's up|how's it going)\s*\??\s*$",  # Status questions
+        r"^\s*(who are you|what can you do|help|what are your capabilities)\s*\??\s*$",  # Help/intro
+        r"^\s*(thank you|thanks|appreciate)\s*$",  # Gratitude
+        r"^\s*(bye|goodbye|see you|exit|quit)\s*$",  # Farewells
+        r"^\s*vaani\s*$",  # Just saying the name
+    ],
+    # Email addresses dictated aloud
+    "spoken_email": [
+        r"\bat the rate\b", r"\bat sign\b", r"\bat symbol\b",
+        r"\b(?:dot|period)\s+(?:com|in|org|net|co|edu|io)\b",
+        r"\b(?:gmail|yahoo|outlook|hotmail)\s+(?:dot\s+)?com\b",
+    ],
+}
+
+MULTI_TASK_PREFIX = "multi_task:"
+
+
+class IntentHit(NamedTuple):
+    """One keyword or rule found in a command"""
+    label: str
+    keyword: str   # the keyword, or the rule label for regex rules
+    start: int
+    end: int
+
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+# Shortest stem an inflected word may be folded onto, so "us" never reads as "u"
+MIN_STEM_LENGTH = 3
+
+
+def _tokens(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _stems(token: str) -> List[str]:
+    """Base forms an -s, -es, -ed or -ing word may come from ("calling" -> "call")"""
+    stems = []
+    if token.endswith("s") and not token.endswith("ss"):
+        stems.append(token[:-1])
+        if token.endswith("es"):
+            stems.append(token[:-2])
+    if token.endswith("ed"):
+        stems.extend([token[:-2], token[:-1]])  # "emailed" -> "email", "shared" -> "share"
+    if token.endswith("ing"):
+        stem = token[:-3]
+        stems.extend([stem, stem + "e"])
+    return [stem for stem in stems if len(stem) >= MIN_STEM_LENGTH]
+
+
+class IntentMatches:
+    """
+    Every hit in one command, grouped by label
+
+    Scores count the words of the distinct keywords found for a label, so a
+    two-word phrase ("send email") outweighs a single word ("mail").
+    """
+
+    def __init__(self, text: str, hits: List[IntentHit]):
+        self.text = text
+        self.hits = hits
+        self._by_label: Dict[str, List[IntentHit]] = {}
+        for hit in hits:
+            self._by_label.setdefault(hit.label, []).append(hit)
+
+    def has(self, label: str) -> bool:
+        return label in self._by_label
+
+    def labels(self, prefix: str = "") -> Set[str]:
+        return {label for label in self._by_label if label.startswith(prefix)}
+
+    def score(self, label: str) -> float:
+        """Words of the distinct keywords found for label (0 when absent)"""
+        keywords = {hit.keyword for hit in self._by_label.get(label, [])}
+        return float(sum(len(keyword.split()) for keyword in keywords))
+
+
+class IntentMatcher:
+    """
+    All keyword lists compiled into one word trie
+
+    The command is tokenized once (words and punctuation marks) and the
+    trie is walked from every token, so keywords and phrases are matched
+    as whole words, overlapping and nested hits included ("send email"
+    also reports "send" and "email"), in a single pass whose cost does not
+    grow with the number of keywords. A word missing from the trie is
+    retried as its stems, so "take screenshots" and "calling mom" hit
+    "screenshot" and "call". Regex rules are compiled into one alternation
+    per label.
+    """
+
+    def __init__(self, keywords: Dict[str, List[str]], patterns: Optional[Dict[str, List[str]]] = None):
+        # Trie node: {token: child node}, with the key None holding
+        # (keyword, labels) when a keyword ends there
+        self._trie: Dict = {}
+        for label, words in keywords.items():
+            for keyword in words:
+                tokens = _tokens(keyword)
+                if not tokens:
+                    continue
+                node = self._trie
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                _, labels = node.setdefault(None, (" ".join(keyword.lower().split()), []))
+                if label not in labels:
+                    labels.append(label)
+
+        self._patterns: Dict[str, Pattern] = {
+            label: re.compile("|".join(f"(?:{pattern})" for pattern in rules))
+            for label, rules in (patterns or {}).items()
+        }
+
+    def match(self, text: str) -> IntentMatches:
+        """All keyword and rule hits in text (positions refer to the lowercased text)"""
+        text = text.lower()
+        tokens = [(m.group(), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(text)]
+        hits: List[IntentHit] = []
+
+        for i, (_, start, _) in enumerate(tokens):
+            node = self._trie
+            for token, _, end in tokens[i:]:
+                child = node.get(token)
+                if child is None:
+                    child = next((node[stem] for stem in _stems(token) if stem in node), None)
+                if child is None:
+                    break
+                node = child
+                terminal = node.get(None)
+                if terminal is not None:
+                    keyword, labels = terminal
+                    hits.extend(IntentHit(label, keyword, start, end) for label in labels)
+
+        for label, pattern in self._patterns.items():
+            found = pattern.search(text)
+            if found:
+                hits.append(IntentHit(label, label, found.start(), found.end()))
+
+        return IntentMatches(text, hits)
+
+
+def build_routing_matcher() -> IntentMatcher:
+    """Matcher over the routing keyword lists and rules"""
+    return IntentMatcher(ROUTING_KEYWORDS, ROUTING_PATTERNS)
@@ -0,0 +1,251 @@
+"""
+LLM Response Cache for AI Task Automation Assistant
+Shared cache for the agents' deterministic LLM calls (command enhancement,
+intent detection, parameter parsing), so a repeated command such as
+"call mom" is answered without a network round trip
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from langchain_core.caches import BaseCache
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from config import config
+
+LLM_CACHE_VERSION = 2
+
+# Evict down to this fraction of the bound so eviction does not run on every write
+EVICT_TO = 0.9
+
+
+def _message_parts(prompt: str) -> Optional[Tuple[str, List[str]]]:
+    """
+    (system prompts, other message texts) from LangChain's serialized prompt
+
+    Returns None for prompts that are not plain text messages, which are
+    then never cached.
+    """
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return None
+    if not isinstance(messages, list):
+        return None
+
+    system, others = [], []
+    for message in messages:
+        kwargs = message.get("kwargs", {}) if isinstance(message, dict) else {}
+        content = kwargs.get("content")
+        if not isinstance(content, str):
+            return None
+        if kwargs.get("type") == "system":
+            system.append(content)
+        else:
+            others.append(f"{kwargs.get('type')}:{content}")
+    return "\n".join(system), others
+
+
+class LLMResponseCache(BaseCache):
+    """
+    Two-tier LRU + TTL cache of chat model replies
+
+    Entries are keyed by the model settings (model name, temperature, token
+    limit), a hash of the system prompt and the exact text of the remaining
+    messages; replies often quote names and message bodies verbatim, so
+    prompts differing only in case do not share an entry (rephrasings are
+    the semantic command cache's job). A bounded in-memory LRU sits in front of one
+    <key>.json file per entry on disk, which survives restarts and is
+    evicted least recently used first. Only plain text replies are cached.
+
+    Pass it as ``cache=`` to a chat model whose replies should be reused;
+    creative models (higher temperature) should not get it.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, memory_entries: Optional[int] = None,
+                 max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Initialize LLM response cache
+
+        Args:
+            cache_dir: Disk tier directory (relative to backend directory)
+            memory_entries: Entries kept in memory
+            max_entries: Entries kept on disk
+            ttl: Seconds an entry stays valid
+        """
+        backend_dir = Path(__file__).parent.parent
+        self.cache_dir = backend_dir / (cache_dir or config.LLM_CACHE_DIR)
+        self.memory_entries = memory_entries or config.LLM_CACHE_MEMORY_ENTRIES
+        self.max_entries = max_entries or config.LLM_CACHE_MAX_ENTRIES
+        self.ttl = ttl or config.LLM_CACHE_TTL
+
+        # key -> (reply text, stored at wall-clock time)
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._disk_entries: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def cache_key(prompt: str, llm_string: str) -> Optional[str]:
+        parts = _message_parts(prompt)
+        if parts is None:
+            return None
+        system, others = parts
+        model_hash = hashlib.sha1(llm_string.encode("utf-8")).hexdigest()
+        system_hash = hashlib.sha1(system.encode("utf-8")).hexdigest()
+        identity = "\0".join([model_hash, system_hash, *others])
+        return hashlib.sha1(identity.encode("utf-8", "surrogateescape")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------------
+
+    def _read_disk(self, key: str) -> Optional[Tuple[str, float]]:
+        record_path = self.cache_dir / f"{key}.json"
+        try:
+            with open(record_path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+            if record.get("version") != LLM_CACHE_VERSION:
+                return None
+            os.utime(record_path)  # mark as recently used
+            return record["text"], record["stored_at"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_disk(self, key: str, text: str, stored_at: float):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            record_path = self.cache_dir / f"{key}.json"
+            existed = record_path.exists()
+            tmp_path = record_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": LLM_CACHE_VERSION, "text": text, "stored_at": stored_at}, f)
+            os.replace(tmp_path, record_path)
+        except OSError as e:
+            print(f"[ERROR] LLMResponseCache: Failed to store entry: {e}")
+            return
+
+        with self._lock:
+            if self._disk_entries is None:
+                self._disk_entries = sum(1 for name in os.listdir(self.cache_dir) if name.endswith(".json"))
+            elif not existed:
+                self._disk_entries += 1
+            if self._disk_entries > self.max_entries:
+                self._evict()
+
+    def _evict(self):
+        """Remove least recently used disk entries until the tier fits its bound"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".json"):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    pass
+        entries.sort()
+
+        excess = len(entries) - int(self.max_entries * EVICT_TO)
+        for _, path in entries[:max(0, excess)]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self._disk_entries = len(entries) - max(0, excess)
+
+    def _remember(self, key: str, text: str, stored_at: float):
+        with self._lock:
+            self._memory[key] = (text, stored_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # BaseCache interface
+    # ------------------------------------------------------------------
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[ChatGeneration]]:
+        """Cached reply for a prompt, or None on a miss"""
+        key = self.cache_key(prompt, llm_string)
+        if key is None:
+            return None
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        from_disk = entry is None
+        if from_disk:
+            entry = self._read_disk(key)
+
+        if entry is None or time.time() - entry[1] > self.ttl:
+            with self._lock:
+                self._memory.pop(key, None)
+                self.misses += 1
+            return None
+
+        if from_disk:
+            self._remember(key, *entry)
+        with self._lock:
+            self.hits += 1
+            if from_disk:
+                self.disk_hits += 1
+        print(f"[DEBUG] LLMResponseCache: Hit {key[:8]}{' (disk)' if from_disk else ''}")
+        return [ChatGeneration(message=AIMessage(content=entry[0]))]
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Any]):
+        """Store a fresh reply"""
+        if len(return_val) != 1:
+            return
+        message = getattr(return_val[0], "message", None)
+        if (not isinstance(message, AIMessage) or not isinstance(message.content, str)
+                or message.tool_calls or not message.content):
+            return
+        key = self.cache_key(prompt, llm_string)
+        if key is None:
+            return
+
+        stored_at = time.time()
+        self._remember(key, message.content, stored_at)
+        self._write_disk(key, message.content, stored_at)
+
+    def clear(self, **kwargs: Any):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            self._disk_entries = 0
+            if not self.cache_dir.is_dir():
+                return
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith((".json", ".tmp")):
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "disk_entries": self._disk_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "ttl": self.ttl
+            }
+
+
+# Global LLM response cache (None when disabled, which leaves models uncached)
+llm_cache = LLMResponseCache() if config.LLM_CACHE_ENABLED else None
@@ -0,0 +1,103 @@
+"""
+Deterministic Pre-Router for AI Task Automation Assistant
+Decides, without an LLM call, whether a command is clear enough to go
+straight to intent detection or should first be rewritten by the AI
+enhancement pass (spoken email addresses, vague references, shorthand)
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+from config import config
+from utils.intent_matcher import IntentMatcher, IntentMatches, build_routing_matcher
+
+# Routing matcher labels that name an agent's commands
+AGENT_LABELS: Dict[str, str] = {
+    "system_control": "system_control",
+    "screenshot": "screenshot",
+    "phone": "phone",
+    "payment": "payment",
+    "calendar": "calendar",
+    "email": "email",
+    "whatsapp": "whatsapp",
+    "task": "task",
+    "websearch": "websearch",
+    "app": "app_launcher",
+    "file": "filesearch",
+    "conversational": "conversation",
+    "capability_question": "conversation",
+}
+
+# Words that precede an email address without being part of it
+EMAIL_LEAD_WORDS = {"to", "is", "at", "email", "mail", "cc", "bcc", "and", "from", "address", "id", "me", "him", "her"}
+
+EMAIL_ADDRESS = re.compile(r"\S+@\S+\.\w+")
+
+
+class PreRoute(NamedTuple):
+    """Outcome of pre-routing one command"""
+    confidence: float            # 0..1, how sure we are the command needs no rewriting
+    intents: List[str]           # agents whose trigger words occur
+    reasons: List[str]           # why confidence was lowered
+    needs_enhancement: bool      # send through the AI enhancement pass
+
+
+class PreRouter:
+    """
+    Confidence-scored deterministic pre-router
+
+    A command starts fully confident and loses confidence for having no
+    recognisable intent, for mixing many intents, and for length. Spoken
+    email artifacts, vague references and chat shorthand always send it to
+    enhancement, as those are exactly what the LLM rewrite fixes.
+    """
+
+    def __init__(self, matcher: Optional[IntentMatcher] = None, threshold: Optional[float] = None):
+        self.matcher = matcher or build_routing_matcher()
+        self.threshold = config.PRE_ROUTER_THRESHOLD if threshold is None else threshold
+
+    def _split_email(self, text: str) -> bool:
+        """True if a word right before an email address looks like part of it"""
+        for match in EMAIL_ADDRESS.finditer(text):
+            before = text[:match.start()].split()
+            if before and before[-1] not in EMAIL_LEAD_WORDS and not before[-1].endswith(":"):
+                return True
+        return False
+
+    def route(self, text: str, matches: Optional[IntentMatches] = None) -> PreRoute:
+        if matches is None:
+            matches = self.matcher.match(text)
+        intents = sorted({AGENT_LABELS[label] for label in matches.labels() if label in AGENT_LABELS})
+        reasons: List[str] = []
+        forced = False
+
+        if matches.has("spoken_email") or self._split_email(matches.text):
+            reasons.append("spoken email address")
+            forced = True
+        if matches.has("vague_reference"):
+            reasons.append("vague reference")
+            forced = True
+        if matches.has("shorthand"):
+            reasons.append("shorthand")
+            forced = True
+
+        confidence = 1.0
+        if not intents:
+            reasons.append("no known intent")
+            confidence -= 0.6
+        elif len(intents) > 2:
+            reasons.append(f"{len(intents)} competing intents")
+            confidence -= 0.3
+
+        words = len(matches.text.split())
+        if words > 25:
+            reasons.append("long command")
+            confidence -= 0.4
+        elif words > 12:
+            reasons.append("long command")
+            confidence -= 0.2
+
+        if forced:
+            confidence = 0.0
+        confidence = max(0.0, confidence)
+        return PreRoute(confidence, intents, reasons, confidence < self.threshold)
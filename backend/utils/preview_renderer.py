@@ -0,0 +1,83 @@
+"""
+Preview Rendering for AI Task Automation Assistant
+Renders downscaled thumbnails of images and PDF first pages and reads text
+snippets of documents. Runs inside ProcessPoolExecutor workers, so like
+content_extractor it keeps no module-level state beyond optional imports.
+"""
+
+import os
+from typing import Dict, Any
+
+from utils.content_extractor import CONTENT_EXTENSIONS, MAX_FILE_SIZE, extract_snippet
+
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = ImageOps = None
+    PIL_AVAILABLE = False
+
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    pdfium = None
+    PDFIUM_AVAILABLE = False
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tif', '.tiff'}
+THUMBNAIL_QUALITY = 80
+MAX_IMAGE_PIXELS = 100_000_000  # decompression bomb guard
+
+
+def can_preview(extension: str) -> bool:
+    """True if files with this extension (lowercase, with dot) get a preview"""
+    return extension in IMAGE_EXTENSIONS or extension in CONTENT_EXTENSIONS
+
+
+def _save_thumbnail(image, thumbnail_path: str, max_size: int) -> Dict[str, Any]:
+    image.thumbnail((max_size, max_size))
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    tmp_path = thumbnail_path + ".tmp"
+    image.save(tmp_path, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+    os.replace(tmp_path, thumbnail_path)
+    return {"thumbnail": True, "width": image.width, "height": image.height}
+
+
+def render_preview(path: str, thumbnail_path: str, max_size: int) -> Dict[str, Any]:
+    """
+    Preview one file (runs in a worker process)
+
+    Writes a JPEG no larger than max_size x max_size to thumbnail_path when
+    the file is an image, or a PDF and pdfium is installed, and returns
+    {"kind", "thumbnail", "width", "height", "snippet", "error"}.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    preview = {"kind": "other", "thumbnail": False, "width": 0, "height": 0, "snippet": "", "error": None}
+
+    try:
+        if extension in IMAGE_EXTENSIONS:
+            preview["kind"] = "image"
+            if PIL_AVAILABLE:
+                Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+                with Image.open(path) as image:
+                    image.draft("RGB", (max_size, max_size))  # JPEG: decode at reduced scale
+                    preview.update(_save_thumbnail(ImageOps.exif_transpose(image), thumbnail_path, max_size))
+
+        elif extension in CONTENT_EXTENSIONS:
+            preview["kind"] = "pdf" if extension == '.pdf' else "document"
+            if os.path.getsize(path) <= MAX_FILE_SIZE:
+                preview["snippet"] = extract_snippet(path)
+            if extension == '.pdf' and PIL_AVAILABLE and PDFIUM_AVAILABLE:
+                document = pdfium.PdfDocument(path)
+                try:
+                    page = document[0]
+                    width, height = page.get_size()
+                    bitmap = page.render(scale=max_size / max(width, height, 1))
+                    preview.update(_save_thumbnail(bitmap.to_pil(), thumbnail_path, max_size))
+                finally:
+                    document.close()
+    except Exception as e:
+        preview["error"] = str(e)
+
+    return preview
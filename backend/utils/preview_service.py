@@ -0,0 +1,210 @@
+"""
+Preview Service for AI Task Automation Assistant
+Thumbnails and text snippets for search results, rendered in a background
+process pool and kept in a size-bounded disk cache keyed by path and mtime
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from config import config
+from utils.preview_renderer import PDFIUM_AVAILABLE, PIL_AVAILABLE, can_preview, render_preview
+
+# Seconds a request waits for a worker before giving up
+RENDER_TIMEOUT = 30.0
+
+# Evict down to this fraction of the bound so eviction does not run on every write
+EVICT_TO = 0.9
+
+
+class PreviewService:
+    """
+    Renders and caches file previews
+
+    Each preview is a <key>.json record plus an optional <key>.jpg
+    thumbnail, where the key hashes the path, mtime, size and thumbnail
+    size, so a modified file simply gets a new entry. Entries are evicted
+    least recently used first once the cache exceeds its byte bound.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None,
+                 max_workers: Optional[int] = None):
+        """
+        Initialize preview service
+
+        Args:
+            cache_dir: Cache directory (relative to backend directory)
+            max_bytes: Upper bound on the cache size
+            max_workers: Rendering processes
+        """
+        backend_dir = Path(__file__).parent.parent
+        self.cache_dir = backend_dir / (cache_dir or config.PREVIEW_CACHE_DIR)
+        self.max_bytes = max_bytes or config.PREVIEW_CACHE_MAX_MB * 1024 * 1024
+        self.max_workers = max_workers or config.PREVIEW_WORKERS
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # key -> future of a render in progress, so concurrent requests share it
+        self._rendering: Dict[str, Future] = {}
+        self._cache_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Cache layout
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def cache_key(path: str, stat: os.stat_result, max_size: int) -> str:
+        identity = f"{path}\0{stat.st_mtime_ns}\0{stat.st_size}\0{max_size}"
+        return hashlib.sha1(identity.encode("utf-8", "surrogateescape")).hexdigest()
+
+    def thumbnail_path(self, key: str) -> Optional[Path]:
+        """Cached thumbnail for a key, or None"""
+        if len(key) != 40 or not all(c in "0123456789abcdef" for c in key):
+            return None
+        path = self.cache_dir / f"{key}.jpg"
+        return path if path.is_file() else None
+
+    def _scan_cache_bytes(self) -> int:
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            try:
+                total += entry.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits its bound"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".json"):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.name[:-5]))
+                except OSError:
+                    pass
+        entries.sort()
+
+        target = self.max_bytes * EVICT_TO
+        for _, key in entries:
+            if self._cache_bytes <= target:
+                break
+            for suffix in (".json", ".jpg"):
+                path = self.cache_dir / f"{key}{suffix}"
+                try:
+                    size = path.stat().st_size
+                    path.unlink()
+                    self._cache_bytes -= size
+                except OSError:
+                    pass
+
+    def _store(self, key: str, preview: Dict[str, Any]):
+        record_path = self.cache_dir / f"{key}.json"
+        tmp_path = record_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(preview, f)
+        os.replace(tmp_path, record_path)
+
+        with self._lock:
+            if self._cache_bytes is None:
+                self._cache_bytes = self._scan_cache_bytes()
+            else:
+                self._cache_bytes += record_path.stat().st_size
+                thumbnail = self.cache_dir / f"{key}.jpg"
+                if preview.get("thumbnail") and thumbnail.is_file():
+                    self._cache_bytes += thumbnail.stat().st_size
+            if self._cache_bytes > self.max_bytes:
+                self._evict()
+
+    # ------------------------------------------------------------------
+    # Rendering
+    # ------------------------------------------------------------------
+
+    def _render(self, key: str, path: str, max_size: int) -> Dict[str, Any]:
+        with self._lock:
+            future = self._rendering.get(key)
+            owner = future is None
+            if owner:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                thumbnail = str(self.cache_dir / f"{key}.jpg")
+                future = self._executor.submit(render_preview, path, thumbnail, max_size)
+                self._rendering[key] = future
+
+        try:
+            preview = future.result(timeout=RENDER_TIMEOUT)
+            if owner and not preview.get("error"):
+                self._store(key, preview)
+            return preview
+        finally:
+            if owner:
+                with self._lock:
+                    self._rendering.pop(key, None)
+
+    def get_preview(self, path: str, max_size: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Preview of one file, rendering it on a cache miss
+
+        Returns None if the file does not exist or has no preview type;
+        otherwise the renderer's fields plus "key" (for thumbnail_path)
+        and "cached".
+        """
+        max_size = max_size or config.PREVIEW_THUMBNAIL_SIZE
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not can_preview(os.path.splitext(path)[1].lower()):
+            return None
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        key = self.cache_key(path, stat, max_size)
+        record_path = self.cache_dir / f"{key}.json"
+
+        preview = None
+        try:
+            with open(record_path, "r", encoding="utf-8") as f:
+                preview = json.load(f)
+            os.utime(record_path)  # mark as recently used
+            cached = True
+        except (OSError, ValueError):
+            cached = False
+
+        if preview is None:
+            preview = self._render(key, path, max_size)
+
+        with self._lock:
+            if cached:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        return {**preview, "key": key, "cached": cached}
+
+    def stop(self):
+        """Stop the rendering processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "cache_dir": str(self.cache_dir),
+            "cache_bytes": self._cache_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "pil": PIL_AVAILABLE,
+            "pdfium": PDFIUM_AVAILABLE
+        }
+
+
+# Global preview service instance
+preview_service = PreviewService()
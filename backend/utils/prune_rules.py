@@ -0,0 +1,141 @@
+"""
+Directory Prune Rules for AI Task Automation Assistant
+Gitignore-style list of directories the file crawlers never descend into
+(version control, dependency, cache and build trees)
+"""
+
+import fnmatch
+import os
+import re
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from config import config
+
+# Directories that hold many files and none of the user's documents
+DEFAULT_PRUNE_PATTERNS = [
+    # Version control
+    ".git", ".hg", ".svn",
+    # Python
+    "__pycache__", ".venv", "venv", "site-packages", ".tox", ".mypy_cache", ".pytest_cache", ".ipynb_checkpoints",
+    # JavaScript and other package managers
+    "node_modules", "bower_components", ".npm", ".yarn", ".pnpm-store", ".gradle", ".m2", ".cargo",
+    # Editors and generic caches
+    ".idea", ".vscode", ".cache", "Cache", "Code Cache", "GPUCache",
+    # Operating system
+    "$RECYCLE.BIN", "System Volume Information", ".Trash", ".Trashes", ".Spotlight-V100", ".fseventsd",
+    "AppData/Local/Temp", "AppData/Local/Packages", "AppData/Local/Microsoft", "AppData/Local/Google",
+    "AppData/Roaming/Microsoft", "Library/Caches",
+]
+
+
+def _compile(pattern: str) -> "re.Pattern":
+    return re.compile(fnmatch.translate(pattern), re.IGNORECASE if os.name == "nt" else 0)
+
+
+class PruneRules:
+    """
+    Ordered gitignore-style directory rules
+
+    - "name" matches a directory with that name (wildcards allowed) at any depth
+    - "a/b" matches directory b directly inside a directory a, at any depth
+    - a leading "!" re-includes directories matched by earlier rules
+    - blank lines and lines starting with "#" are ignored
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns: List[str] = []
+        # (negated, compiled components) in order; later rules win
+        self._rules: List[Tuple[bool, List["re.Pattern"]]] = []
+        # Fast path when nothing is negated: one alternation over the name
+        # rules plus the few path rules
+        self._names: Optional["re.Pattern"] = None
+        self._paths: Optional[List[List["re.Pattern"]]] = None
+
+        for line in patterns:
+            pattern = line.strip()
+            if not pattern or pattern.startswith("#"):
+                continue
+            negated = pattern.startswith("!")
+            pattern = pattern.lstrip("!").replace("\\", "/").strip("/")
+            if not pattern:
+                continue
+            self.patterns.append(("!" if negated else "") + pattern)
+            self._rules.append((negated, [_compile(part) for part in pattern.split("/")]))
+
+        if not any(negated for negated, _ in self._rules):
+            names = [parts[0].pattern for _, parts in self._rules if len(parts) == 1]
+            if names:
+                self._names = re.compile("|".join(names), re.IGNORECASE if os.name == "nt" else 0)
+            self._paths = [parts for _, parts in self._rules if len(parts) > 1]
+
+    def should_prune(self, path: str, name: Optional[str] = None) -> bool:
+        """True if the crawler should not descend into the directory at path"""
+        if not self._rules:
+            return False
+        name = name or os.path.basename(path)
+        components = None
+
+        def matches(parts: List["re.Pattern"]) -> bool:
+            nonlocal components
+            if len(parts) == 1:
+                return parts[0].match(name) is not None
+            if components is None:
+                components = path.replace("\\", "/").rstrip("/").split("/")
+            tail = components[-len(parts):]
+            return len(tail) == len(parts) and all(p.match(c) for p, c in zip(parts, tail))
+
+        if self._paths is not None:
+            if self._names is not None and self._names.match(name):
+                return True
+            return any(matches(parts) for parts in self._paths)
+
+        pruned = False
+        for negated, parts in self._rules:
+            if matches(parts):
+                pruned = not negated
+        return pruned
+
+    def excludes(self, path: str, root: str) -> bool:
+        """True if any directory between root and path is pruned"""
+        try:
+            relative = os.path.relpath(os.path.dirname(path), root)
+        except ValueError:
+            return False
+        if relative == "." or relative.startswith(".."):
+            return False
+
+        current = root
+        for part in relative.split(os.sep):
+            current = os.path.join(current, part)
+            if self.should_prune(current, part):
+                return True
+        return False
+
+
+def load_prune_rules() -> PruneRules:
+    """
+    Build the prune rules from configuration
+
+    Defaults (unless FILE_SEARCH_PRUNE_DEFAULTS is false), then patterns
+    from FILE_SEARCH_PRUNE (comma-separated), then lines of the
+    FILE_SEARCH_PRUNE_FILE ignore file if it exists.
+    """
+    patterns: List[str] = []
+    if config.FILE_SEARCH_PRUNE_DEFAULTS:
+        patterns.extend(DEFAULT_PRUNE_PATTERNS)
+    patterns.extend(config.FILE_SEARCH_PRUNE.split(","))
+
+    ignore_file = Path(__file__).parent.parent / config.FILE_SEARCH_PRUNE_FILE
+    try:
+        if ignore_file.is_file():
+            with open(ignore_file, 'r', encoding='utf-8') as f:
+                patterns.extend(f.read().splitlines())
+    except Exception as e:
+        print(f"[ERROR] PruneRules: Failed to read {ignore_file}: {e}")
+
+    return PruneRules(patterns)
+
+
+# Global prune rules shared by every crawler
+prune_rules = load_prune_rules()
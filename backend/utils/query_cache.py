@@ -0,0 +1,105 @@
+"""
+Query Result Cache for AI Task Automation Assistant
+LRU + TTL cache for file search results, invalidated when a directory the
+results depend on changes
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Iterable, Hashable, NamedTuple
+
+
+class _CacheEntry(NamedTuple):
+    value: Any
+    stored_at: float
+    directories: Dict[str, float]
+    version: Hashable
+
+
+def _directory_mtime(directory: str) -> Optional[float]:
+    try:
+        return os.stat(directory).st_mtime
+    except OSError:
+        return None
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache with expiry and directory-mtime validation
+
+    Each entry remembers the mtime of the directories it touched and an
+    opaque version (e.g. index generation counters). A lookup only hits if
+    the entry is younger than the TTL, every directory still has the same
+    mtime and the version is unchanged.
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: float = 300.0):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Entries kept before the least recently used is dropped
+            ttl: Seconds an entry stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: Hashable = None) -> Optional[Any]:
+        """Cached value for key, or None if missing or stale"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+        stale = (
+            time.monotonic() - entry.stored_at > self.ttl
+            or entry.version != version
+            or any(_directory_mtime(d) != mtime for d, mtime in entry.directories.items())
+        )
+
+        with self._lock:
+            if stale:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.hits += 1
+        # Callers get their own copy so cached results cannot be mutated
+        return copy.deepcopy(entry.value)
+
+    def put(self, key: Hashable, value: Any, directories: Iterable[str], version: Hashable = None):
+        """Store value along with the current mtime of each directory it depends on"""
+        entry = _CacheEntry(
+            copy.deepcopy(value),
+            time.monotonic(),
+            {d: _directory_mtime(d) for d in set(directories)},
+            version
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics for diagnostics"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses
+            }
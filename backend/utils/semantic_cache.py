@@ -0,0 +1,279 @@
+"""
+Semantic Command Cache for AI Task Automation Assistant
+Remembers how earlier commands were resolved (agent and cleaned-up
+command) and recognises rephrasings of them ("call my mom", "phone mom
+please") with a local hashing-vectorizer embedding, so repeats route
+without asking the LLM again
+"""
+
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, Any, Optional, NamedTuple
+
+import numpy as np
+
+from config import config
+
+SEMANTIC_CACHE_VERSION = 1
+
+# Embedding width; features are hashed into this many buckets
+DIMENSIONS = 1024
+
+WORD_PATTERN = re.compile(r"[a-z0-9@._+-]+|[^\sa-z0-9]")
+
+# Politeness and filler that never changes what a command does
+FILLER_WORDS = {
+    "please", "pls", "plz", "kindly", "just", "hey", "hi", "ok", "okay", "vaani",
+    "can", "could", "would", "will", "you", "my", "the", "a", "an", "now", "quickly",
+}
+
+# Words folded onto one spelling; each group always routes to the same agent
+SYNONYMS = {
+    "phone": "call", "dial": "call", "ring": "call",
+    "msg": "message", "txt": "message",
+    "e-mail": "email",
+    "launch": "open",
+    "screengrab": "screenshot",
+}
+
+
+class CachedRoute(NamedTuple):
+    """A stored resolution matching a new command"""
+    agent_name: str
+    command: str        # command the agent ran (after AI enhancement)
+    similarity: float
+    exact: bool         # same canonical command
+    slots: Dict[str, Any]  # planner slots, unless the words that differ occur in them
+    identical: bool     # same text (case and spacing aside), so the resolved command applies as is
+
+
+def canonical_words(text: str) -> List[str]:
+    """Lowercased words with filler removed and synonyms folded"""
+    words = []
+    for word in WORD_PATTERN.findall(text.lower().replace("'", "")):
+        word = SYNONYMS.get(word, word)
+        if word not in FILLER_WORDS and (word[0].isalnum() or word in "@?"):
+            words.append(word)
+    return words
+
+
+def normalize(text: str) -> str:
+    """Case and whitespace folded text, the only difference an identical command may have"""
+    return " ".join(text.lower().split())
+
+
+def _words(text: str) -> set:
+    return set(WORD_PATTERN.findall(text.lower().replace("'", "")))
+
+
+def _applicable_slots(text: str, stored_text: str, slots: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Stored slots, unless a word that differs between the two commands
+    (filler included) occurs in a slot value
+    """
+    if not slots:
+        return {}
+    differing = _words(text).symmetric_difference(_words(stored_text))
+    for value in slots.values():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for item in values:
+            if item is not None and differing & _words(str(item)):
+                return {}
+    return slots
+
+
+def _bucket(feature: str) -> int:
+    return zlib.crc32(feature.encode("utf-8")) % DIMENSIONS
+
+
+def embed(words: List[str]) -> np.ndarray:
+    """
+    Unit-length hashing-vectorizer embedding of canonical words
+
+    Words and word pairs carry the meaning; character trigrams make
+    inflections and small misspellings ("photos", "foto") land close.
+    """
+    vector = np.zeros(DIMENSIONS, dtype=np.float32)
+    for i, word in enumerate(words):
+        vector[_bucket("w:" + word)] += 1.0
+        if i:
+            vector[_bucket(f"b:{words[i - 1]} {word}")] += 1.0
+        padded = f"<{word}>"
+        for j in range(len(padded) - 2):
+            vector[_bucket("c:" + padded[j:j + 3])] += 0.25
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+class SemanticCommandCache:
+    """
+    Nearest-neighbour cache from commands to their resolved route
+
+    Entries are keyed by the canonical command (filler removed, synonyms
+    folded). A command with the same canonical form is an exact hit,
+    otherwise the most similar stored command above the threshold is a
+    near hit. Either lends its agent, and its slots only if none of the
+    words that differ between the two commands occurs in a slot value
+    ("call mom back" may reuse the slots of "call my mom", "call dad" may
+    not). The stored cleaned-up command is only marked reusable for the
+    identical command, since filler such as "you" or "now" can carry
+    meaning in a message. All embeddings sit in one matrix, so a lookup
+    is a single matrix-vector product.
+    """
+
+    def __init__(self, cache_file: Optional[str] = None, threshold: Optional[float] = None,
+                 max_entries: Optional[int] = None):
+        """
+        Initialize semantic command cache
+
+        Args:
+            cache_file: Path to JSON cache file (relative to backend directory)
+            threshold: Minimum cosine similarity for a near-duplicate hit
+            max_entries: Commands remembered; the least recently used are forgotten first
+        """
+        backend_dir = Path(__file__).parent.parent
+        self.cache_file = backend_dir / (cache_file or config.SEMANTIC_CACHE_FILE)
+        self.threshold = threshold or config.SEMANTIC_CACHE_THRESHOLD
+        self.max_entries = max_entries or config.SEMANTIC_CACHE_MAX_ENTRIES
+
+        # canonical command -> {"agent", "command", "slots", "text", "last_used"},
+        # text being the normalized wording the entry was stored for
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        # Row i of the matrix embeds self._keys[i]
+        self._keys: List[str] = []
+        self._matrix = np.zeros((0, DIMENSIONS), dtype=np.float32)
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        """Load the persisted cache, ignoring files from other versions"""
+        try:
+            if not self.cache_file.exists():
+                return
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != SEMANTIC_CACHE_VERSION:
+                print(f"[INFO] SemanticCommandCache: Ignoring cache with version {data.get('version')}")
+                return
+            self.entries = dict(data.get("commands", {}))
+            self._rebuild()
+            print(f"[INFO] SemanticCommandCache: Loaded {len(self.entries)} commands")
+        except Exception as e:
+            print(f"[ERROR] SemanticCommandCache: Failed to load cache: {e}")
+            self.entries = {}
+            self._rebuild()
+
+    def save(self):
+        """Write the cache to disk atomically"""
+        with self._lock:
+            data = {"version": SEMANTIC_CACHE_VERSION, "commands": dict(self.entries)}
+
+        try:
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            print(f"[ERROR] SemanticCommandCache: Failed to save cache: {e}")
+
+    def _rebuild(self):
+        self._keys = list(self.entries)
+        if self._keys:
+            self._matrix = np.stack([embed(key.split()) for key in self._keys])
+        else:
+            self._matrix = np.zeros((0, DIMENSIONS), dtype=np.float32)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def lookup(self, text: str, exact_only: bool = False) -> Optional[CachedRoute]:
+        """Stored route for the command or its nearest neighbour, or None"""
+        words = canonical_words(text)
+        if not words:
+            return None
+        key = " ".join(words)
+
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry["last_used"] = time.time()
+                self.hits += 1
+                stored_text = entry.get("text", key)
+                slots = _applicable_slots(text, stored_text, entry.get("slots") or {})
+                return CachedRoute(entry["agent"], entry["command"], 1.0, True, slots,
+                                   stored_text == normalize(text))
+
+            if exact_only or not self._keys:
+                self.misses += 1
+                return None
+
+            similarities = self._matrix @ embed(words)
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            entry = self.entries[self._keys[best]]
+            entry["last_used"] = time.time()
+            self.near_hits += 1
+            slots = _applicable_slots(text, entry.get("text", self._keys[best]), entry.get("slots") or {})
+            return CachedRoute(entry["agent"], entry["command"], similarity, False, slots, False)
+
+    def store(self, text: str, agent_name: str, command: str, slots: Optional[Dict[str, Any]] = None):
+        """Remember how a command was resolved and persist it"""
+        words = canonical_words(text)
+        if not words or not agent_name:
+            return
+        key = " ".join(words)
+
+        with self._lock:
+            entry = self.entries.get(key)
+            slots = slots or {}
+            text = normalize(text)
+            if (entry is not None and entry["agent"] == agent_name and entry["command"] == command
+                    and entry.get("slots", {}) == slots and entry.get("text") == text):
+                entry["last_used"] = time.time()
+                return
+
+            self.entries[key] = {"agent": agent_name, "command": command, "slots": slots, "text": text,
+                                 "last_used": time.time()}
+            if entry is None:
+                self._keys.append(key)
+                self._matrix = np.vstack([self._matrix, embed(words)[np.newaxis, :]])
+
+            if len(self.entries) > self.max_entries:
+                ranked = sorted(self.entries, key=lambda k: self.entries[k]["last_used"])
+                for stale in ranked[:len(self.entries) - self.max_entries]:
+                    del self.entries[stale]
+                self._rebuild()
+
+        self.save()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "commands": len(self.entries),
+                "hits": self.hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+                "threshold": self.threshold
+            }
+
+
+# Global semantic command cache
+semantic_cache = SemanticCommandCache()
@@ -0,0 +1,87 @@
+"""
+Streaming ZIP Writer for AI Task Automation Assistant
+Builds a ZIP archive of several files on the fly, yielding it chunk by
+chunk so a download can start before the archive is complete, with no
+temporary file and memory bounded by the chunk size
+"""
+
+import os
+import zipfile
+from typing import Iterable, Iterator, List, Tuple
+
+CHUNK_SIZE = 1024 * 1024  # bytes read from a file per step
+
+# Formats that are already compressed; deflating them again only costs CPU
+STORED_EXTENSIONS = {
+    '.zip', '.gz', '.bz2', '.xz', '.7z', '.rar',
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic',
+    '.mp3', '.m4a', '.aac', '.ogg', '.flac', '.mp4', '.mov', '.mkv', '.avi', '.webm',
+    '.pdf', '.docx', '.xlsx', '.pptx', '.odt', '.ods', '.odp', '.epub',
+}
+
+
+class _ChunkBuffer:
+    """Write-only, unseekable file object that collects what zipfile writes"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def unique_arcnames(paths: Iterable[str]) -> List[Tuple[str, str]]:
+    """(path, name inside the archive) pairs, numbering repeated basenames"""
+    used = set()
+    pairs = []
+    for path in paths:
+        stem, extension = os.path.splitext(os.path.basename(path))
+        arcname = stem + extension
+        counter = 2
+        while arcname.lower() in used:
+            arcname = f"{stem} ({counter}){extension}"
+            counter += 1
+        used.add(arcname.lower())
+        pairs.append((path, arcname))
+    return pairs
+
+
+def stream_zip(files: Iterable[Tuple[str, str]]) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive of (path, arcname) pairs
+
+    Because the output is not seekable, zipfile writes each entry's sizes
+    and CRC in a data descriptor after its data, so nothing is buffered
+    beyond one chunk. Files that disappear or cannot be read are skipped.
+    """
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, mode="w", allowZip64=True) as archive:
+        for path, arcname in files:
+            try:
+                info = zipfile.ZipInfo.from_file(path, arcname)
+                if os.path.splitext(arcname)[1].lower() in STORED_EXTENSIONS:
+                    info.compress_type = zipfile.ZIP_STORED
+                else:
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                with open(path, "rb") as source, archive.open(info, mode="w", force_zip64=True) as target:
+                    while True:
+                        chunk = source.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        target.write(chunk)
+                        yield buffer.take()
+            except OSError as e:
+                print(f"[ERROR] ZipStream: Skipping {path}: {e}")
+            data = buffer.take()
+            if data:
+                yield data
+    yield buffer.take()